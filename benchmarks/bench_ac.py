@@ -0,0 +1,87 @@
+"""
+Benchmark del barrido AC: frecuencias por segundo con lotes complejos
+(K, n, n) frente a una resolución por punto, con 1k, 10k y 100k
+frecuencias.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_ac
+    python -m benchmarks.bench_ac --points 1000 100000 --sections 5 20 --chunk 2048
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.domain.netlist import Netlist
+from src.domain.components.resistor import Resistor
+from src.domain.components.vsource import VSource
+from src.domain.components.capacitor import Capacitor
+from src.domain.components.inductor import Inductor
+from src.analysis.ac import ACAnalysis
+
+# La resolución por punto solo se mide hasta este número de frecuencias
+LOOP_MAX_POINTS = 10_000
+
+
+def rlc_ladder(m: int, seed: int = 0) -> Netlist:
+    """Escalera LC con pérdidas: m secciones serie R–L y C a tierra."""
+    rng = np.random.default_rng(seed)
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    nl.add_node("IN")
+    nl.add_component(VSource("V1", "IN", "GND", 1.0))
+    prev = "IN"
+    for i in range(m):
+        mid, out = f"M{i}", f"N{i}"
+        nl.add_node(mid)
+        nl.add_node(out)
+        nl.add_component(Resistor(f"R{i}", prev, mid, rng.uniform(1, 10)))
+        nl.add_component(Inductor(f"L{i}", mid, out, rng.uniform(1e-4, 1e-3)))
+        nl.add_component(Capacitor(f"C{i}", out, "GND", rng.uniform(1e-7, 1e-6)))
+        prev = out
+    nl.add_component(Resistor("RL", prev, "GND", 50.0))
+    return nl
+
+
+def per_point(analysis: ACAnalysis, w: np.ndarray) -> np.ndarray:
+    """Referencia: un np.linalg.solve por frecuencia."""
+    X = np.empty((len(w), analysis.n), dtype=complex)
+    for k, wk in enumerate(w):
+        X[k] = np.linalg.solve(analysis.G + 1j * wk * analysis.B, analysis.b)
+    return X
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--points", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    ap.add_argument("--sections", type=int, nargs="+", default=[5, 20])
+    ap.add_argument("--chunk", type=int, default=None,
+                    help="frecuencias por lote (por defecto, según AC_CHUNK_BYTES)")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    print(f"{'secciones':>10}{'n':>6}{'puntos':>10}{'lote pts/s':>14}{'por punto pts/s':>18}{'aceleración':>13}")
+    for m in args.sections:
+        analysis = ACAnalysis(rlc_ladder(m))
+        for p in args.points:
+            f = np.geomspace(1.0, 1e6, p)
+            best = min(_timed(lambda: analysis.run(f, chunk_size=args.chunk, sparse=False))
+                       for _ in range(args.repeat))
+            rate = p / best
+            line = f"{m:>10}{analysis.n:>6}{p:>10}{rate:>14.0f}"
+            if p <= LOOP_MAX_POINTS:
+                loop = _timed(lambda: per_point(analysis, 2 * np.pi * f))
+                line += f"{p / loop:>18.0f}{loop / best:>12.1f}x"
+            else:
+                line += f"{'-':>18}{'-':>13}"
+            print(line)
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    main()
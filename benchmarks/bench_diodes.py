@@ -0,0 +1,66 @@
+"""
+Benchmark del motor de diodos ideales: iteración de estados (pwl) frente a
+LCP (Lemke y Gauss–Seidel proyectado) con 10, 100 y 1000 diodos.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_diodes
+    python -m benchmarks.bench_diodes --sizes 10 100 --methods pwl lcp
+"""
+import argparse
+import time
+
+from src.domain.netlist import Netlist
+from src.analysis.tableau import build_system
+from src.analysis.diodes import DiodeStateSolver
+from .generators import bridge_array, clamp_ladder
+
+
+GENERATORS = {"clamp_ladder": clamp_ladder, "bridge_array": bridge_array}
+
+
+def run_once(nl: Netlist, method: str):
+    t0 = time.perf_counter()
+    A, b, meta = build_system(nl)
+    t1 = time.perf_counter()
+    engine = DiodeStateSolver(A, b, meta)
+    if method == "pwl":
+        _, states, iters = engine.solve()
+    else:
+        _, states, iters = engine.solve_lcp(method)
+    t2 = time.perf_counter()
+    n_on = sum(st == "ON" for st in states.values())
+    return t1 - t0, t2 - t1, iters, n_on
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    ap.add_argument("--methods", nargs="+", default=["pwl", "lcp", "pgs"],
+                    choices=["pwl", "lcp", "pgs"])
+    ap.add_argument("--circuits", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    print(f"{'circuito':<14}{'diodos':>8}{'método':>8}{'ensamble ms':>14}{'diodos ms':>12}{'iter':>6}{'ON':>6}")
+    for name in args.circuits:
+        for m in args.sizes:
+            nl = GENERATORS[name](m)
+            n_diodes = sum(c.kind == "D" for c in nl.components)
+            for method in args.methods:
+                best = None
+                for _ in range(args.repeat):
+                    try:
+                        r = run_once(nl, method)
+                    except ValueError as e:
+                        r = None
+                        print(f"{name:<14}{n_diodes:>8}{method:>8}  error: {e}")
+                        break
+                    best = r if best is None or r[1] < best[1] else best
+                if best is not None:
+                    t_build, t_diodes, iters, n_on = best
+                    print(f"{name:<14}{n_diodes:>8}{method:>8}{t_build * 1e3:>14.2f}"
+                          f"{t_diodes * 1e3:>12.2f}{iters:>6}{n_on:>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""
+Benchmark de la reducción serie/paralelo: incógnitas quitadas y tiempo de
+solución con y sin reducción (reducir + resolver + retro-sustituir frente
+a resolver el netlist completo), sin las verificaciones de Kirchhoff.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.bench_reduction
+    python -m benchmarks.bench_reduction --branches 10 100 --length 50
+"""
+import argparse
+import time
+
+import numpy as np
+
+from src.domain.netlist import Netlist
+from src.domain.components.resistor import Resistor
+from src.domain.components.vsource import VSource
+from src.domain.components.diode import ShockleyDiode
+from src.analysis.reduction import reduce_netlist
+from src.app.simulate import _solve_netlist
+
+
+def chain_bank(m: int, length: int, diodes: bool = False, seed: int = 0) -> Netlist:
+    """
+    m secciones en cascada: una cadena de length resistores en paralelo
+    con un banco de tres resistores entre nodos de unión, cada unión con
+    carga a GND y una rama colgante. Con diodes, cada unión tiene además
+    un diodo Shockley a GND (Newton refactoriza el sistema en cada
+    iteración, que es donde más rinde achicarlo).
+    """
+    rng = np.random.default_rng(seed)
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    nl.add_node("H0")
+    nl.add_component(VSource("V1", "H0", "GND", 10.0))
+    k = 0
+
+    def res(a, b, lo, hi):
+        nonlocal k
+        k += 1
+        nl.add_component(Resistor(f"R{k}", a, b, rng.uniform(lo, hi)))
+
+    for i in range(m):
+        hub, nxt = f"H{i}", f"H{i + 1}"
+        nl.add_node(nxt)
+        prev = hub
+        for j in range(length):
+            mid = f"C{i}_{j}"
+            nl.add_node(mid)
+            res(prev, mid, 1, 100)
+            prev = mid
+        res(prev, nxt, 1, 100)
+        for _ in range(3):
+            res(hub, nxt, 100, 1000)
+        res(nxt, "GND", 100, 1000)
+        stub = f"S{i}"
+        nl.add_node(stub)
+        res(nxt, stub, 1, 10)
+        if diodes:
+            nl.add_component(ShockleyDiode(f"D{i}", nxt, "GND"))
+    return nl
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--branches", type=int, nargs="+", default=[10, 100, 500])
+    ap.add_argument("--length", type=int, default=20)
+    ap.add_argument("--diodes", action="store_true", help="diodo Shockley en cada unión")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args(argv)
+
+    print(f"{'secciones':>10}{'nodos':>8}{'reducido':>10}{'completo ms':>14}{'reducido ms':>14}{'aceleración':>13}")
+    for m in args.branches:
+        nl = chain_bank(m, args.length, args.diodes)
+        full = min(_timed(lambda: _solve_netlist(nl)) for _ in range(args.repeat))
+
+        def reduced():
+            red = reduce_netlist(nl)
+            red.expand(_solve_netlist(red.netlist))
+            return red
+
+        red = reduced()
+        best = min(_timed(reduced) for _ in range(args.repeat))
+        print(f"{m:>10}{len(nl.nodes):>8}{len(red.netlist.nodes):>10}"
+              f"{full * 1e3:>14.1f}{best * 1e3:>14.1f}{full / best:>12.1f}x")
+
+
+def _timed(fn) -> float:
+    t0 = time.perf_counter()
+    fn()
+    return time.perf_counter() - t0
+
+
+if __name__ == "__main__":
+    main()
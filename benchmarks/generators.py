@@ -0,0 +1,178 @@
+"""
+Generadores procedurales de circuitos para los benchmarks.
+
+Cada generador de GENERATORS recibe el número aproximado de componentes
+(de 10 a 10⁶) y una semilla, y devuelve un Netlist válido: conexo a GND,
+sin lazos de fuentes y con valores aleatorios reproducibles.
+"""
+import math
+
+import numpy as np
+
+from src.domain.netlist import Netlist
+from src.domain.components.resistor import Resistor
+from src.domain.components.vsource import VSource
+from src.domain.components.diode import IdealDiode
+
+
+def _netlist(nodes) -> Netlist:
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    for nid in nodes:
+        nl.add_node(nid)
+    return nl
+
+
+def ladder(elements: int, seed: int = 0) -> Netlist:
+    """Escalera resistiva: por peldaño un resistor serie y uno a GND."""
+    rng = np.random.default_rng(seed)
+    m = max(1, (elements - 1) // 2)
+    nl = _netlist(["IN"] + [f"N{i}" for i in range(m)])
+    nl.add_component(VSource("V1", "IN", "GND", 10.0))
+    rs = rng.uniform(10, 1000, size=m)
+    rg = rng.uniform(100, 10000, size=m)
+    prev = "IN"
+    for i in range(m):
+        nl.add_component(Resistor(f"RS{i}", prev, f"N{i}", rs[i]))
+        nl.add_component(Resistor(f"RG{i}", f"N{i}", "GND", rg[i]))
+        prev = f"N{i}"
+    return nl
+
+
+def _lattice(shape, seed):
+    """Malla de resistores de forma shape (2-D o 3-D) alimentada en una esquina."""
+    rng = np.random.default_rng(seed)
+    names = ["N" + "_".join(map(str, idx)) for idx in np.ndindex(*shape)]
+    nl = _netlist(names)
+    nl.add_component(VSource("V1", names[0], "GND", 1.0))
+    index = np.arange(len(names)).reshape(shape)
+    k = 0
+    for axis in range(len(shape)):
+        a = np.moveaxis(index, axis, 0)
+        src, dst = a[:-1].ravel(), a[1:].ravel()
+        vals = rng.uniform(1, 100, size=len(src))
+        for i, j, r in zip(src.tolist(), dst.tolist(), vals.tolist()):
+            k += 1
+            nl.add_component(Resistor(f"R{k}", names[i], names[j], r))
+    nl.add_component(Resistor("RL", names[-1], "GND", 50.0))
+    return nl
+
+
+def grid2d(elements: int, seed: int = 0) -> Netlist:
+    """Malla cuadrada k×k (≈ 2k² resistores)."""
+    k = max(2, int(round(math.sqrt(elements / 2))))
+    return _lattice((k, k), seed)
+
+
+def grid3d(elements: int, seed: int = 0) -> Netlist:
+    """Malla cúbica k×k×k (≈ 3k³ resistores)."""
+    k = max(2, int(round((elements / 3) ** (1 / 3))))
+    return _lattice((k, k, k), seed)
+
+
+def random_sparse(elements: int, seed: int = 0, degree: float = 3.0) -> Netlist:
+    """
+    Grafo aleatorio disperso: un árbol aleatorio (garantiza conexión)
+    más aristas al azar hasta un grado medio ≈ degree, con algunos nodos
+    a GND y una fuente.
+    """
+    rng = np.random.default_rng(seed)
+    n = max(2, int(elements / (degree / 2 + 0.1)))
+    names = [f"N{i}" for i in range(n)]
+    nl = _netlist(names)
+    nl.add_component(VSource("V1", names[0], "GND", 5.0))
+    parent = (rng.random(n - 1) * np.arange(1, n)).astype(np.int64)
+    extra = max(0, int(n * degree / 2) - (n - 1))
+    a = rng.integers(0, n, size=extra)
+    b = rng.integers(0, n, size=extra)
+    keep = a != b
+    src = np.concatenate([np.arange(1, n), a[keep]])
+    dst = np.concatenate([parent, b[keep]])
+    vals = rng.uniform(1, 1000, size=len(src))
+    k = 0
+    for i, j, r in zip(src.tolist(), dst.tolist(), vals.tolist()):
+        k += 1
+        nl.add_component(Resistor(f"R{k}", names[i], names[j], r))
+    for i in rng.choice(n, size=max(1, n // 100), replace=False).tolist():
+        k += 1
+        nl.add_component(Resistor(f"R{k}", names[i], "GND", rng.uniform(100, 10000)))
+    return nl
+
+
+def clamp_ladder(m: int, seed: int = 0) -> Netlist:
+    """Escalera resistiva con un diodo de enclavamiento a una referencia por peldaño."""
+    rng = np.random.default_rng(seed)
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    nl.add_node("IN")
+    nl.add_component(VSource("V1", "IN", "GND", 10.0))
+    prev = "IN"
+    for i in range(m):
+        a, ref = f"A{i}", f"REF{i}"
+        nl.add_node(a)
+        nl.add_node(ref)
+        nl.add_component(Resistor(f"R{i}", prev, a, rng.uniform(100, 1000)))
+        nl.add_component(Resistor(f"RG{i}", a, "GND", rng.uniform(100, 1000)))
+        nl.add_component(VSource(f"VR{i}", ref, "GND", rng.uniform(0, 10)))
+        pol = "A_to_K" if rng.random() < 0.7 else "K_to_A"
+        nl.add_component(IdealDiode(f"D{i}", a, ref, pol))
+        prev = a
+    return nl
+
+
+def bridge_array(m: int, seed: int = 0) -> Netlist:
+    """m/4 puentes rectificadores con carga y fuentes de signo aleatorio."""
+    rng = np.random.default_rng(seed)
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    for k in range(max(1, m // 4)):
+        a, p, n = f"A{k}", f"P{k}", f"M{k}"
+        for nid in (a, p, n):
+            nl.add_node(nid)
+        nl.add_component(VSource(f"V{k}", a, "GND", rng.choice([-1, 1]) * rng.uniform(1, 20)))
+        nl.add_component(Resistor(f"RS{k}", a, f"S{k}", 1.0))
+        nl.add_node(f"S{k}")
+        nl.add_component(IdealDiode(f"D{k}a", f"S{k}", p))
+        nl.add_component(IdealDiode(f"D{k}b", "GND", p))
+        nl.add_component(IdealDiode(f"D{k}c", n, f"S{k}"))
+        nl.add_component(IdealDiode(f"D{k}d", n, "GND"))
+        nl.add_component(Resistor(f"RL{k}", p, n, rng.uniform(10, 1000)))
+    return nl
+
+
+def diode_array(elements: int, seed: int = 0) -> Netlist:
+    """Escalera de enclavamiento (clamp_ladder): 4 componentes por diodo."""
+    return clamp_ladder(max(1, elements // 4), seed)
+
+
+def multi_source(elements: int, seed: int = 0) -> Netlist:
+    """
+    Malla 2-D con muchas fuentes: una a GND cada ~25 nodos (pads de
+    alimentación) y fuentes flotantes entre vecinos (supernodos).
+    """
+    rng = np.random.default_rng(seed)
+    nl = grid2d(elements, seed)
+    names = [nid for nid in nl.nodes if nid != "GND"]
+    n = len(names)
+    pads = rng.choice(np.arange(1, n), size=max(1, n // 25), replace=False)
+    for k, i in enumerate(pads.tolist()):
+        nl.add_component(VSource(f"VP{k}", names[i], "GND", rng.uniform(0.9, 1.1)))
+    # Fuentes flotantes entre nodos que no son pads: sin lazos de fuentes
+    used = set(pads.tolist()) | {0}
+    free = [i for i in range(1, n - 1) if i not in used and i + 1 not in used]
+    for k, i in enumerate(rng.choice(free, size=min(len(free), max(1, n // 50)), replace=False).tolist()):
+        if i in used or i + 1 in used:
+            continue
+        used.update((i, i + 1))
+        nl.add_component(VSource(f"VF{k}", names[i], names[i + 1], rng.uniform(-0.1, 0.1)))
+    return nl
+
+
+GENERATORS = {
+    "ladder": ladder,
+    "grid2d": grid2d,
+    "grid3d": grid3d,
+    "random_sparse": random_sparse,
+    "diode_array": diode_array,
+    "multi_source": multi_source,
+}
@@ -0,0 +1,204 @@
+"""
+Suite de benchmarks de escalado: tiempo de cada etapa de la simulación
+para circuitos generados (ver benchmarks.generators) de 10 a 10⁶
+componentes.
+
+Etapas: load_json, validate, build_system, solve (LinearSolver.solve, o
+el motor de diodos si hay diodos), reconstruct_solution y run_checks.
+Imprime una tabla por generador con el exponente de escalado de cada
+etapa (pendiente log-log) y guarda todo en JSON para comparar corridas.
+
+Una etapa se salta cuando, extrapolando con su exponente observado,
+superaría --budget segundos; las siguientes del mismo tamaño también.
+
+Uso (desde la raíz del repositorio):
+    python -m benchmarks.run
+    python -m benchmarks.run --generators grid2d ladder --sizes 100 10000 -o res.json
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+try:
+    import scipy
+except ImportError:  # scipy es opcional
+    scipy = None
+
+from src.app.serialization import load_json, save_json
+from src.app.validation import validate
+from src.analysis.tableau import build_system
+from src.analysis.solver import LinearSolver
+from src.analysis.diodes import solve_ideal_diodes
+from src.analysis.checks import run_checks
+from .generators import GENERATORS
+
+STAGES = ("load_json", "validate", "build_system", "solve", "reconstruct_solution", "run_checks")
+# Encabezados cortos de la tabla
+_LABELS = ("load", "validate", "build", "solve", "reconstruct", "checks")
+DEFAULT_SIZES = [10, 100, 1_000, 10_000, 100_000, 1_000_000]
+
+
+def run_stages(path: str, budget: float = float("inf"), predicted=None) -> dict:
+    """
+    Corre las etapas sobre el netlist guardado en path. predicted (etapa
+    -> segundos estimados) permite saltar las que superarían budget.
+    """
+    predicted = predicted or {}
+    times = {}
+    state = {}
+
+    def load():
+        state["nl"] = load_json(path)
+
+    def build():
+        state["A"], state["b"], state["meta"] = build_system(state["nl"])
+
+    def solve():
+        meta = state["meta"]
+        if meta.diode_indices:
+            state["x"], state["states"], _ = solve_ideal_diodes(state["A"], state["b"], meta)
+        else:
+            state["x"] = LinearSolver().solve(state["A"], state["b"])
+            state["states"] = {}
+
+    def reconstruct():
+        state["sol"] = state["meta"].reconstruct_solution(state["x"], state["states"])
+
+    steps = {
+        "load_json": load,
+        "validate": lambda: validate(state["nl"]),
+        "build_system": build,
+        "solve": solve,
+        "reconstruct_solution": reconstruct,
+        "run_checks": lambda: run_checks(state["nl"], state["sol"]),
+    }
+    for stage in STAGES:
+        if predicted.get(stage, 0.0) > budget:
+            times[stage] = None
+            for rest in STAGES[STAGES.index(stage) + 1:]:
+                times[rest] = None
+            break
+        t0 = time.perf_counter()
+        steps[stage]()
+        times[stage] = time.perf_counter() - t0
+
+    info = {}
+    if "A" in state:
+        A = state["A"]
+        info["unknowns"] = int(A.shape[0])
+        info["nnz"] = int(A.nnz) if hasattr(A, "nnz") else int(np.count_nonzero(A))
+        info["sparse"] = hasattr(A, "nnz")
+    return {"stages": times, **info}
+
+
+def slope(sizes, times) -> float:
+    """Exponente p de t ≈ c·nᵖ por mínimos cuadrados en log-log (NaN si < 2 puntos)."""
+    pts = [(s, t) for s, t in zip(sizes, times) if t is not None and t > 0]
+    if len(pts) < 2:
+        return float("nan")
+    x = np.log([p[0] for p in pts])
+    y = np.log([p[1] for p in pts])
+    return float(np.polyfit(x, y, 1)[0])
+
+
+def _predict(history, stage, elements):
+    """Tiempo estimado de stage para elements según las corridas previas."""
+    pts = [(h["elements"], h["stages"][stage]) for h in history if h["stages"].get(stage)]
+    if not pts:
+        return 0.0
+    p = slope([e for e, _ in pts], [t for _, t in pts]) if len(pts) >= 2 else 1.0
+    e0, t0 = pts[-1]
+    return t0 * (elements / e0) ** max(1.0, p if np.isfinite(p) else 1.0)
+
+
+def run_generator(name: str, sizes, budget: float, seed: int = 0, verbose: bool = True):
+    history = []
+    gen = GENERATORS[name]
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes:
+            predicted = {s: _predict(history, s, size) for s in STAGES}
+            if predicted["load_json"] > budget:
+                break
+            t0 = time.perf_counter()
+            nl = gen(size, seed)
+            t_gen = time.perf_counter() - t0
+            path = os.path.join(tmp, f"{name}_{size}.json")
+            save_json(nl, path)
+            elements = len(nl.components)
+            # Tamaño real del circuito (el pedido es aproximado)
+            predicted = {s: _predict(history, s, elements) for s in STAGES}
+            rec = {"generator": name, "size": size, "elements": elements,
+                   "nodes": len(nl.nodes), "generate_s": t_gen}
+            del nl
+            rec.update(run_stages(path, budget, predicted))
+            history.append(rec)
+            if verbose:
+                _print_row(rec)
+    return history
+
+
+def _fmt(t):
+    return f"{'—':>12}" if t is None else f"{t * 1e3:>12.2f}"
+
+
+def _print_header(name):
+    print(f"\n== {name} ==")
+    print(f"{'componentes':>12}{'incógnitas':>11}" + "".join(f"{s:>12}" for s in _LABELS) + "   (ms)")
+
+
+def _print_row(rec):
+    print(f"{rec['elements']:>12}{rec.get('unknowns', 0):>11}"
+          + "".join(_fmt(rec["stages"][s]) for s in STAGES))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--generators", nargs="+", default=list(GENERATORS), choices=list(GENERATORS))
+    ap.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                    help="número aproximado de componentes")
+    ap.add_argument("--budget", type=float, default=60.0,
+                    help="segundos máximos estimados por etapa antes de saltarla")
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("-o", "--output", default="benchmarks/results.json",
+                    help="archivo JSON de resultados")
+    args = ap.parse_args(argv)
+
+    results, scaling = [], {}
+    for name in args.generators:
+        _print_header(name)
+        history = run_generator(name, sorted(args.sizes), args.budget, args.seed)
+        results.extend(history)
+        elements = [h["elements"] for h in history]
+        scaling[name] = {s: slope(elements, [h["stages"][s] for h in history]) for s in STAGES}
+        print(f"{'exponente':>23}" + "".join(
+            f"{'—':>12}" if np.isnan(p) else f"{p:>12.2f}" for p in scaling[name].values()))
+
+    out = {
+        "meta": {
+            "date": datetime.datetime.now().isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "numpy": np.__version__,
+            "scipy": scipy.__version__ if scipy is not None else None,
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "budget_s": args.budget,
+        },
+        "results": results,
+        # Exponente p de t ≈ c·nᵖ por generador y etapa (NaN = sin datos)
+        "scaling": {g: {s: (None if np.isnan(p) else p) for s, p in d.items()}
+                    for g, d in scaling.items()},
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
+    print(f"\nResultados en {args.output}")
+
+
+if __name__ == "__main__":
+    main()
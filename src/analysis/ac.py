@@ -0,0 +1,160 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..domain.netlist import Netlist
+from .diodes import DiodeStateSolver
+from .newton import NewtonSolver
+from .results import ACResult
+from .tableau import EPSILON, build_system, reactive_connected
+
+try:
+    import scipy.sparse as sp
+    import scipy.sparse.linalg as spla
+except ImportError:  # scipy es opcional: solo se usa en el modo disperso
+    sp = None
+    spla = None
+
+# Memoria máxima de un lote de matrices complejas (K·n²·16 bytes)
+AC_CHUNK_BYTES = 64 * 2**20
+
+
+class ACAnalysis:
+    """
+    Análisis AC de pequeña señal: Y(ω)·x = b_ac con Y(ω) = G + jω·B.
+
+    G es la matriz MNA linealizada en el punto de operación (diodos ideales
+    en su estado DC, diodos Shockley con su conductancia g_d) y B reúne los
+    capacitores (+C en las posiciones nodales) y los inductores (-L en la
+    diagonal de su fila, V - jωL·i = 0). Ambas se arman una sola vez; cada
+    lote de K frecuencias es una pila (K, n, n) (copia de G más jω·B en las
+    pocas entradas no nulas de B) resuelta con un único np.linalg.solve
+    complejo.
+    """
+    def __init__(self, nl: Netlist, sources: Optional[Dict[str, complex]] = None):
+        A, b, meta = build_system(nl)
+        self.meta = meta
+        self.n = A.shape[0]
+        node = meta.node_index
+
+        # Punto de operación y linealización
+        if meta.diode_indices and meta.shockley:
+            raise ValueError(
+                "No se pueden combinar diodos ideales y diodos Shockley en el mismo circuito."
+            )
+        if meta.shockley:
+            newton = NewtonSolver(A, b, meta)
+            A = newton.jacobian_at(newton.solve())
+        elif meta.diode_indices:
+            engine = DiodeStateSolver(A, b, meta)
+            _, states, _ = engine.solve_auto()
+            A = engine.state_matrix(states)
+        # G y B quedan dispersas si build_system eligió CSR (sistemas grandes)
+        self.sparse = not isinstance(A, np.ndarray)
+
+        rows, cols, vals = [], [], []
+        for i in reactive_connected(nl, meta):
+            rows.append(i)
+            cols.append(i)
+            vals.append(-EPSILON)
+        self.G = A + self._matrix(rows, cols, vals)
+
+        rows, cols, vals = [], [], []
+        for c in nl.components:
+            if c.kind == "C":
+                i, j = node.get(c.n1), node.get(c.n2)
+                for r, s in ((i, 1.0), (j, -1.0)):
+                    for cc, s2 in ((i, 1.0), (j, -1.0)):
+                        if r is not None and cc is not None:
+                            rows.append(r)
+                            cols.append(cc)
+                            vals.append(s * s2 * c.C)
+            elif c.kind == "L":
+                row = meta.inductor_indices[c.id]
+                rows.append(row)
+                cols.append(row)
+                vals.append(-c.L)
+        self.B = self._matrix(rows, cols, vals)
+        # Posiciones no nulas de B (sin repetidos): en cada lote solo esas
+        # entradas cambian con ω, el resto de Y es una copia de G
+        Bc = sp.coo_matrix(self.B) if self.sparse else None
+        if Bc is not None:
+            Bc.sum_duplicates()
+            self._b_pos = (Bc.row, Bc.col, Bc.data)
+        else:
+            bi, bj = np.nonzero(self.B)
+            self._b_pos = (bi, bj, self.B[bi, bj])
+        self._G_dense = None
+
+        # Excitación: fasores de las fuentes indicadas (las demás en corto).
+        # Sin sources, cada fuente usa su valor DC como amplitud.
+        if sources is None:
+            sources = {c.id: c.V for c in nl.components if c.kind == "V"}
+        self.b = np.zeros(self.n, dtype=complex)
+        for vid, amp in sources.items():
+            if vid not in meta.vsource_indices:
+                raise KeyError(f"{vid}: no es una fuente de voltaje del circuito")
+            self.b[meta.vsource_indices[vid]] = amp
+
+    def _matrix(self, rows, cols, vals):
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=float)
+        if self.sparse:
+            return sp.csc_matrix((vals, (rows, cols)), shape=(self.n, self.n))
+        M = np.zeros((self.n, self.n))
+        np.add.at(M, (rows, cols), vals)
+        return M
+
+    def chunk_size(self, max_bytes: int = AC_CHUNK_BYTES) -> int:
+        """Frecuencias por lote para no superar max_bytes de matrices."""
+        return max(1, int(max_bytes // (16 * self.n * self.n)))
+
+    def solve_chunk(self, w: np.ndarray) -> np.ndarray:
+        """X (K, n) para las frecuencias angulares w (K,), en un solo lote."""
+        if self._G_dense is None:
+            self._G_dense = self.G.toarray() if self.sparse else self.G
+        bi, bj, bv = self._b_pos
+        Y = np.empty((len(w), self.n, self.n), dtype=complex)
+        Y[:] = self._G_dense
+        Y[:, bi, bj] += (1j * w)[:, None] * bv[None, :]
+        rhs = np.broadcast_to(self.b, (len(w), self.n))[..., None]
+        try:
+            return np.linalg.solve(Y, rhs)[..., 0]
+        except np.linalg.LinAlgError as e:
+            raise ValueError(f"El sistema AC es singular en alguna frecuencia del lote: {e}")
+
+    def _solve_sparse(self, w: np.ndarray) -> np.ndarray:
+        """Un LU disperso complejo por frecuencia (sistemas grandes)."""
+        G, B = sp.csc_matrix(self.G), sp.csc_matrix(self.B)
+        X = np.empty((len(w), self.n), dtype=complex)
+        for k, wk in enumerate(w):
+            try:
+                X[k] = spla.splu((G + 1j * wk * B).tocsc()).solve(self.b)
+            except RuntimeError as e:
+                raise ValueError(f"El sistema AC es singular en f = {wk / (2 * np.pi):.6g} Hz: {e}")
+        return X
+
+    def run(self, frequencies: np.ndarray, chunk_size: Optional[int] = None,
+            sparse: Optional[bool] = None) -> ACResult:
+        """
+        Resuelve todas las frecuencias (Hz) en lotes de chunk_size.
+
+        sparse: True usa un LU disperso por frecuencia en lugar de lotes
+        densos (K, n, n), que no caben en memoria para sistemas grandes;
+        None sigue la elección de build_system (CSR desde SPARSE_MIN_SIZE).
+        """
+        f = np.asarray(frequencies, dtype=float)
+        w = 2.0 * np.pi * f
+        if sparse is None:
+            sparse = self.sparse
+        n_nodes = len(self.meta.node_index)
+        V = np.empty((len(f), n_nodes), dtype=complex)
+        if sparse:
+            V[:] = self._solve_sparse(w)[:, :n_nodes]
+        else:
+            step = chunk_size or self.chunk_size()
+            for start in range(0, len(f), step):
+                sl = slice(start, start + step)
+                V[sl] = self.solve_chunk(w[sl])[:, :n_nodes]
+        return ACResult(frequencies=f, node_ids=list(self.meta.node_index), node_voltages=V)
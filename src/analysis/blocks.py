@@ -0,0 +1,188 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..domain.components.vsource import VSource
+from ..domain.netlist import Netlist
+from .results import ArrayMap, Solution, branch_terminals
+from .topology import UnionFind
+
+# Sufijo de las fuentes sintéticas que fijan, dentro de un bloque, el
+# voltaje de un nodo compartido
+FIXED_SUFFIX = "#fijo"
+
+
+@dataclass
+class Block:
+    """Subcircuito independiente: su netlist y las fuentes sintéticas por nodo fijo."""
+    netlist: Netlist
+    fixed: Dict[str, str] = field(default_factory=dict)  # nodo fijo -> id de la fuente
+
+
+@dataclass
+class Decomposition:
+    """
+    Partición de un netlist en bloques que solo comparten nodos de voltaje
+    conocido: GND y los nodos fijados por fuentes de voltaje a tierra.
+
+    fixed_voltages: voltaje de cada nodo fijo (GND incluido, en 0).
+    tree: (fuente, nodo hijo, nodo padre) en orden BFS desde GND.
+    shared: resistores y capacitores entre dos nodos fijos (no pertenecen
+        a ningún bloque; su corriente es directa).
+    """
+    blocks: List[Block]
+    fixed_voltages: Dict[str, float]
+    tree: list
+    shared: list
+
+
+def decompose(nl: Netlist) -> Optional[Decomposition]:
+    """
+    Separa nl en bloques independientes.
+
+    1. Las fuentes de voltaje alcanzables desde GND (por un árbol de
+       fuentes) fijan el voltaje de sus nodos: esos nodos son vértices de
+       corte y, como GND, se quitan del grafo.
+    2. Las componentes conexas que quedan son los bloques; cada uno se
+       arma con sus nodos, GND y una fuente sintética por nodo fijo que toca.
+
+    Devuelve None si hay menos de dos bloques o si la topología no se
+    presta (lazos de fuentes o inductores/diodos entre nodos fijos): en
+    ese caso se resuelve el sistema completo, que reporta el error.
+    """
+    gnd = nl.ground_id()
+
+    vadj = defaultdict(list)
+    for c in nl.components:
+        if c.kind == "V":
+            vadj[c.n1].append((c.n2, c))
+            vadj[c.n2].append((c.n1, c))
+
+    fixed = {gnd: 0.0}
+    tree = []
+    used = set()
+    q = deque([gnd])
+    while q:
+        u = q.popleft()
+        for v, c in vadj[u]:
+            if c.id in used:
+                continue
+            if v in fixed:
+                return None  # lazo de fuentes
+            used.add(c.id)
+            # V_n1 - V_n2 = V
+            fixed[v] = fixed[u] + c.V if v == c.n1 else fixed[u] - c.V
+            tree.append((c, v, u))
+            q.append(v)
+
+    uf = UnionFind()
+    shared = []
+    for c in nl.components:
+        if c.id in used:
+            continue
+        f1, f2 = c.n1 in fixed, c.n2 in fixed
+        if f1 and f2:
+            if c.kind not in ("R", "C"):
+                return None
+            shared.append(c)
+        elif not f1 and not f2:
+            uf.union(c.n1, c.n2)
+        else:
+            uf.find(c.n2 if f1 else c.n1)
+
+    groups: Dict[str, List[str]] = defaultdict(list)
+    for nid in nl.nodes:
+        if nid not in fixed:
+            groups[uf.find(nid)].append(nid)
+    if len(groups) < 2:
+        return None
+
+    root_of = {nid: root for root, members in groups.items() for nid in members}
+    comps_of = defaultdict(list)
+    for c in nl.components:
+        if c.id in used or (c.n1 in fixed and c.n2 in fixed):
+            continue
+        comps_of[root_of[c.n2 if c.n1 in fixed else c.n1]].append(c)
+
+    blocks = []
+    for root, members in groups.items():
+        sub = Netlist()
+        sub.add_node(gnd, is_ground=True)
+        for nid in members:
+            sub.add_node(nid)
+        block = Block(netlist=sub)
+        for c in comps_of[root]:
+            for nid in (c.n1, c.n2):
+                if nid in fixed and nid != gnd and nid not in block.fixed:
+                    sid = f"{nid}{FIXED_SUFFIX}"
+                    sub.add_node(nid)
+                    sub.add_component(VSource(sid, nid, gnd, fixed[nid]))
+                    block.fixed[nid] = sid
+            sub.add_component(c)
+        blocks.append(block)
+
+    return Decomposition(blocks=blocks, fixed_voltages=fixed, tree=tree, shared=shared)
+
+
+def merge_solutions(nl: Netlist, dec: Decomposition, solutions: List[Solution]) -> Solution:
+    """
+    Une las soluciones de los bloques en una sola Solution de nl.
+
+    Las corrientes de las fuentes reales salen de KCL en los nodos fijos:
+    lo que cada bloque toma de su fuente sintética más las ramas
+    compartidas, acumulado de las hojas del árbol de fuentes hacia GND.
+    """
+    node_ids = [nid for nid, n in nl.nodes.items() if not n.is_ground]
+    node_pos = {nid: i for i, nid in enumerate(node_ids)}
+    branch_pos = {c.id: k for k, c in enumerate(nl.components)}
+    V = np.zeros(len(node_ids))
+    I = np.zeros(len(nl.components))
+    states: Dict[str, str] = {}
+    newton = {"iterations": 0, "iteration_times": [], "factorizations": 0,
+              "source_steps": 0, "converged": True}
+    any_newton = False
+
+    # Corriente que sale de cada nodo fijo hacia ramas que no son del árbol
+    out = defaultdict(float)
+    for block, sol in zip(dec.blocks, solutions):
+        V[[node_pos[nid] for nid in sol.node_ids]] = sol.voltages
+        synthetic = set(block.fixed.values())
+        for nid, sid in block.fixed.items():
+            out[nid] -= sol.branch_currents[sid]
+        keep = [k for k, cid in enumerate(sol.branch_ids) if cid not in synthetic]
+        I[[branch_pos[sol.branch_ids[k]] for k in keep]] = sol.currents[keep]
+        states.update(sol.diode_states)
+        if sol.newton:
+            any_newton = True
+            for key in ("iterations", "factorizations", "source_steps"):
+                newton[key] += sol.newton[key]
+            newton["iteration_times"].extend(sol.newton["iteration_times"])
+            newton["converged"] = newton["converged"] and sol.newton["converged"]
+
+    fv = dec.fixed_voltages
+    for c in dec.shared:
+        i = (fv[c.n1] - fv[c.n2]) / c.R if c.kind == "R" else 0.0
+        I[branch_pos[c.id]] = i
+        out[c.n1] += i
+        out[c.n2] -= i
+
+    # De las hojas a la raíz: KCL en el hijo da la corriente de su fuente
+    for c, child, parent in reversed(dec.tree):
+        sign = 1.0 if child == c.n1 else -1.0
+        i = -out[child] / sign
+        I[branch_pos[c.id]] = i
+        out[parent] += -sign * i
+
+    for nid, v in fv.items():
+        if nid in node_pos:
+            V[node_pos[nid]] = v
+    return Solution(
+        node_voltages=ArrayMap(node_ids, V, node_pos),
+        branch_currents=ArrayMap([c.id for c in nl.components], I, branch_pos),
+        diode_states={c.id: states[c.id] for c in nl.components if c.id in states},
+        checks={},
+        newton=newton if any_newton else {},
+        terminals=branch_terminals(nl.components, node_pos),
+    )
@@ -1,20 +1,174 @@
-def run_checks(nl, sol, rtol=1e-6, atol=1e-9):
-    V = sol.node_voltages
-    def v(n): return V.get(n, 0.0)
-    kcl = {}
-    for nid, node in nl.nodes.items():
-        if node.is_ground: continue
-        s = 0.0
-        for c in nl.components:
-            if getattr(c, "kind", "") == "R":
-                if c.n1 == nid:
-                    s += (v(c.n1)-v(c.n2))/c.R
-                elif c.n2 == nid:
-                    s -= (v(c.n1)-v(c.n2))/c.R
-        kcl[nid] = {"sum_A": s, "ok": abs(s) <= max(atol, rtol*max(1.0, abs(s)))}
-    kvl = {}
-    for c in nl.components:
-        if getattr(c, "kind", "") == "V":
-            err = (v(c.n1) - v(c.n2)) - c.V
-            kvl[f"KVL_{c.id}"] = {"sum_V": err, "ok": abs(err) <= 1e-6}
-    return {"KCL": kcl, "KVL": kvl}
+from collections.abc import Mapping
+
+import numpy as np
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy es opcional: sin él, np.bincount hace el producto
+    sp = None
+
+from ..domain.compact import CompactNetlist, KIND_CODE
+from .results import branch_terminals
+
+# Componentes que fijan el voltaje entre sus terminales en DC:
+# fuente (V), inductor (0 V) y diodo ideal conduciendo (0 V)
+_KVL_KINDS = ("V", "L", "D")
+
+
+class Incidence:
+    """
+    Matriz de incidencia nodo–rama de un netlist (sin las filas de GND).
+
+    M[i, k] = +1 si la rama k sale del nodo i y -1 si entra, con el
+    sentido de su corriente en Solution: n1 → n2, o ánodo → cátodo en
+    los diodos. Así M·I da la suma de corrientes que salen de cada nodo
+    (KCL) y Mᵀ·V el voltaje de cada rama (KVL).
+    """
+    def __init__(self, nl):
+        self.compact = nl if isinstance(nl, CompactNetlist) else None
+        self.components = nl.components
+        if self.compact is not None:
+            cn = self.compact
+            free = np.flatnonzero(~cn.is_ground)
+            self.node_ids = [cn.node_names[i] for i in free.tolist()]
+            self.branch_ids = cn.ids
+            pos = np.full(len(cn.node_names), -1, dtype=np.int64)
+            pos[free] = np.arange(len(free))
+            T = pos[cn.terminals()]
+        else:
+            self.node_ids = [nid for nid, n in nl.nodes.items() if not n.is_ground]
+            index = {nid: i for i, nid in enumerate(self.node_ids)}
+            self.branch_ids = [c.id for c in nl.components]
+            T = branch_terminals(nl.components, index)
+        src, dst = T[:, 0], T[:, 1]
+        self.shape = (len(self.node_ids), len(self.branch_ids))
+        # Entradas COO: las terminales en GND no tienen fila
+        ks = np.flatnonzero(src >= 0)
+        kd = np.flatnonzero(dst >= 0)
+        self._rows = np.concatenate([src[ks], dst[kd]])
+        self._cols = np.concatenate([ks, kd])
+        self._data = np.concatenate([np.ones(len(ks)), -np.ones(len(kd))])
+        self.M = None
+        if sp is not None:
+            self.M = sp.csr_matrix((self._data, (self._rows, self._cols)), shape=self.shape)
+
+    def node_sums(self, I: np.ndarray) -> np.ndarray:
+        """M·I: corriente neta que sale de cada nodo."""
+        if self.M is not None:
+            return self.M @ I
+        return np.bincount(self._rows, weights=self._data * I[self._cols],
+                           minlength=self.shape[0])
+
+    def node_abs_sums(self, I: np.ndarray) -> np.ndarray:
+        """|M|·|I|: escala de las corrientes en cada nodo (para la tolerancia)."""
+        if self.M is not None:
+            return abs(self.M) @ np.abs(I)
+        return np.bincount(self._rows, weights=np.abs(I[self._cols]), minlength=self.shape[0])
+
+    def branch_voltages(self, V: np.ndarray) -> np.ndarray:
+        """Mᵀ·V: voltaje de cada rama en el sentido de su corriente."""
+        if self.M is not None:
+            return self.M.T @ V
+        return np.bincount(self._cols, weights=self._data * V[self._rows],
+                           minlength=self.shape[1])
+
+
+class KirchhoffChecks(Mapping):
+    """
+    Resultado de run_checks como arreglos.
+
+    kcl_sum[i]: corriente neta que sale de node_ids[i]; kvl_err[k]: error
+    de voltaje de kvl_ids[k]. Se comporta como el dict de siempre,
+    {"KCL": {nodo: {"sum_A", "ok"}}, "KVL": {"KVL_<id>": {"sum_V", "ok"}}},
+    pero cada parte se arma solo cuando se pide.
+    """
+    def __init__(self, node_ids, kcl_sum, kcl_ok, kvl_ids, kvl_err, kvl_ok):
+        self.node_ids = node_ids
+        self.kcl_sum = kcl_sum
+        self.kcl_ok = kcl_ok
+        self.kvl_ids = kvl_ids
+        self.kvl_err = kvl_err
+        self.kvl_ok = kvl_ok
+        self._views = {}
+
+    @property
+    def ok(self) -> bool:
+        """True si se cumplen todas las ecuaciones."""
+        return bool(self.kcl_ok.all() and self.kvl_ok.all())
+
+    def __getitem__(self, key):
+        if key not in ("KCL", "KVL"):
+            raise KeyError(key)
+        if key not in self._views:
+            if key == "KCL":
+                ids, vals, oks, name = self.node_ids, self.kcl_sum, self.kcl_ok, "sum_A"
+            else:
+                ids, vals, oks, name = self.kvl_ids, self.kvl_err, self.kvl_ok, "sum_V"
+            self._views[key] = {k: {name: v, "ok": o}
+                                for k, v, o in zip(ids, vals.tolist(), oks.tolist())}
+        return self._views[key]
+
+    def __iter__(self):
+        return iter(("KCL", "KVL"))
+
+    def __len__(self) -> int:
+        return 2
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def run_checks(nl, sol, rtol=1e-6, atol=1e-9, kvl_atol=1e-6, incidence=None):
+    """
+    Verifica KCL en cada nodo y KVL en cada rama de voltaje fijo con dos
+    productos por la matriz de incidencia (ver Incidence), para todos los
+    tipos de componente: fuentes, diodos e inductores incluidos.
+
+    Un nodo cumple KCL si |ΣI| <= max(atol, rtol·max(1, Σ|I|)). incidence
+    permite reutilizar la matriz entre soluciones del mismo netlist.
+    """
+    inc = incidence if incidence is not None else Incidence(nl)
+    # Los arreglos de la Solution se usan tal cual si están en el mismo orden
+    if sol.node_ids == inc.node_ids:
+        V = sol.voltages
+    else:
+        Vd = sol.node_voltages
+        V = np.array([Vd.get(nid, 0.0) for nid in inc.node_ids], dtype=float)
+    vb = inc.branch_voltages(V)
+
+    comps = inc.components
+    cn = inc.compact
+    if sol.branch_ids == inc.branch_ids:
+        I = np.array(sol.currents, dtype=float)
+    else:
+        Id = sol.branch_currents
+        I = np.array([Id.get(cid, np.nan) for cid in inc.branch_ids], dtype=float)
+    missing = np.isnan(I)
+    if missing.any():
+        # Resistores sin corriente en la solución: ley de Ohm; el resto, 0
+        if cn is not None:
+            R = np.where(cn.kind == KIND_CODE["R"], cn.value, np.inf)
+        else:
+            R = np.array([c.R if c.kind == "R" else np.inf for c in comps])
+        I[missing] = (vb / R)[missing]
+
+    s = inc.node_sums(I)
+    scale = np.maximum(1.0, inc.node_abs_sums(I))
+    kcl_ok = np.abs(s) <= np.maximum(atol, rtol * scale)
+
+    states = sol.diode_states
+    if cn is not None:
+        fixed = cn.mask("V", "L")
+        fixed[[cn.id_index[d] for d, st in states.items() if st == "ON"]] = True
+        kvl = np.flatnonzero(fixed)
+        target = np.where(cn.kind[kvl] == KIND_CODE["V"], cn.value[kvl], 0.0)
+    else:
+        kvl = [k for k, c in enumerate(comps)
+               if c.kind in _KVL_KINDS and (c.kind != "D" or states.get(c.id) == "ON")]
+        target = np.array([comps[k].V if comps[k].kind == "V" else 0.0 for k in kvl])
+    err = vb[kvl] - target if len(kvl) else np.zeros(0)
+    return KirchhoffChecks(
+        node_ids=inc.node_ids, kcl_sum=s, kcl_ok=kcl_ok,
+        kvl_ids=[f"KVL_{inc.branch_ids[k]}" for k in kvl], kvl_err=err,
+        kvl_ok=np.abs(err) <= kvl_atol,
+    )
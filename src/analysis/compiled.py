@@ -0,0 +1,300 @@
+import copy
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..domain.netlist import Netlist
+from ..domain.compact import CompactNetlist
+from .checks import Incidence, run_checks
+from .diodes import DiodeStateSolver
+from .newton import solve_newton
+from .results import Solution
+from .solver import LinearSolver
+from .tableau import build_system
+
+# Modo incremental: correcciones de rango bajo acumuladas (resistores
+# distintos modificados) antes de refactorizar, y residuo relativo máximo
+# ‖A·x - b‖∞ / ‖b‖∞ aceptado antes de descartar la corrección
+MAX_LOW_RANK_UPDATES = 16
+LOW_RANK_DRIFT_TOL = 1e-9
+
+# Memoria máxima de la pila de matrices de un lote de solve_batch (K·n²·8 bytes)
+BATCH_CHUNK_BYTES = 64 * 2**20
+
+
+class CompiledCircuit:
+    """
+    Circuito "compilado": topología fija, valores editables.
+
+    Se construye una vez desde un Netlist y conserva los mapas de índices,
+    las posiciones de estampado (StampPattern), la estructura CSR y el
+    ordenamiento de columnas de la factorización. update_values() solo
+    reescribe los parámetros numéricos; solve() re-ensambla las entradas,
+    refactoriza si cambió la matriz (un cambio de V solo toca b) y resuelve.
+
+    Con incremental=True (circuitos lineales) un cambio de resistor no
+    refactoriza: la factorización de A0 se conserva y el cambio de
+    conductancia Δg entre los nodos i, j se aplica como la corrección de
+    rango 1 Δg·u·uᵀ (u = e_i - e_j). Con k resistores modificados,
+    A = A0 + U·D·Uᵀ y por Sherman–Morrison–Woodbury
+
+        x = y - Z·(I + D·Uᵀ·Z)⁻¹·D·Uᵀ·y,   y = A0⁻¹·b,   Z = A0⁻¹·U,
+
+    con una sustitución por columna nueva de Z y un sistema k×k. Se
+    refactoriza al superar max_updates correcciones o si el residuo con
+    la matriz actual supera drift_tol.
+
+    diagnosis (el Diagnosis que devuelve validate) evita volver a recorrer
+    el grafo del circuito al compilarlo.
+
+    Uso:
+        cc = CompiledCircuit(nl)
+        cc.update_values({"R1": 2200.0, "V1": 9.0})
+        sol = cc.solve()
+    """
+    def __init__(self, nl: Netlist, sparse: Optional[bool] = None, incremental: bool = False,
+                 max_updates: int = MAX_LOW_RANK_UPDATES, drift_tol: float = LOW_RANK_DRIFT_TOL,
+                 diagnosis=None):
+        if isinstance(nl, CompactNetlist):
+            nl = nl.to_netlist()  # los valores se editan en objetos propios
+        # Copias propias de los componentes: los valores editados no tocan
+        # el netlist original pero sí la reconstrucción de corrientes
+        components = [copy.copy(c) for c in nl.components]
+        self.netlist = Netlist(nodes=dict(nl.nodes), components=components)
+        self._incidence = None
+        self._by_id = {c.id: c for c in components}
+
+        A, b, meta = build_system(self.netlist, sparse=sparse, diagnosis=diagnosis)
+        self.meta = meta
+        self.pattern = meta.pattern
+        self.sparse = not isinstance(A, np.ndarray)
+        self.values = self.pattern.values.copy()
+        self._labels = meta.unknown_labels()
+        self._solver = LinearSolver()
+
+        self._A = A
+        self._b = b
+        self._factor = None
+        self._column_order = None
+        self._diodes = None
+        self.diode_states = {}
+        self.newton_info = {}
+        self.newton_options = {}
+        if self.meta.diode_indices and self.meta.shockley:
+            raise ValueError(
+                "No se pueden combinar diodos ideales y diodos Shockley en el mismo circuito."
+            )
+
+        # Estado del modo incremental (solo circuitos lineales)
+        self.incremental = incremental and not (self.meta.diode_indices or self.meta.shockley)
+        self.max_updates = max_updates
+        self.drift_tol = drift_tol
+        self._A0 = None            # matriz de la factorización vigente
+        self._base_values = None   # parámetros con los que se factorizó
+        self._Z = {}               # slot -> A0⁻¹·u
+        self.incremental_info = {"factorizations": 0, "low_rank_solves": 0,
+                                 "rank": 0, "residual": 0.0}
+
+    def component(self, cid: str):
+        """Copia del componente cid con sus valores actuales."""
+        return self._by_id[cid]
+
+    def update_values(self, values: Dict[str, float]) -> None:
+        """
+        Cambia valores de componentes: {"R1": ohmios, "V1": voltios}.
+        Los ids deben existir en el circuito compilado.
+        """
+        matrix_changed = False
+        resistances = {}
+        for cid, value in values.items():
+            if cid not in self.pattern.slot_of:
+                raise KeyError(f"{cid}: no es un resistor ni una fuente del circuito compilado")
+            k = self.pattern.slot_of[cid]
+            self.values[k] = self.pattern.param_value(cid, value)
+            c = self._by_id[cid]
+            if c.kind == "R":
+                c.R = resistances[cid] = float(value)
+                matrix_changed = True
+            else:
+                c.V = float(value)
+        # Los R de la reconstrucción viven en un arreglo del Meta
+        self.meta.set_resistances(resistances)
+
+        self._b = None
+        self._diodes = None
+        if matrix_changed:
+            self._A = None
+            if not self.incremental:
+                self._factor = None
+
+    def matrix(self):
+        """Matriz A con los valores actuales (re-ensamblada solo si cambió)."""
+        if self._A is None:
+            vals = self.pattern.entry_values(self.values)
+            self._A = self.pattern.assemble(vals, self.sparse)
+        return self._A
+
+    def rhs(self) -> np.ndarray:
+        if self._b is None:
+            self._b = self.pattern.rhs(self.values)
+        return self._b
+
+    def factorization(self):
+        """Factorización vigente; reutiliza el orden de columnas anterior."""
+        if self._factor is None:
+            self._factor = self._solver.factorize(
+                self.matrix(), labels=self._labels, column_order=self._column_order
+            )
+            self._column_order = self._factor.column_order
+            self._A0 = self.matrix()
+            self._base_values = self.values.copy()
+            self._Z = {}
+            self.incremental_info["factorizations"] += 1
+        return self._factor
+
+    def refactor(self) -> None:
+        """Descarta la factorización (y las correcciones acumuladas)."""
+        self._factor = None
+
+    def _changed_resistors(self) -> np.ndarray:
+        """Slots de resistores cuyo valor difiere del de la factorización."""
+        changed = self.pattern.is_resistor & (self.values != self._base_values)
+        return np.flatnonzero(changed)
+
+    def _low_rank_solve(self, slots: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Solución con A = A0 + U·D·Uᵀ sin refactorizar (Woodbury). Devuelve
+        None si el sistema k×k es singular o el residuo supera drift_tol.
+        """
+        factor = self._factor
+        n = self.pattern.n
+        U = np.zeros((n, len(slots)))
+        for col, k in enumerate(slots):
+            i, j = self.pattern.n1_idx[k], self.pattern.n2_idx[k]
+            if i >= 0:
+                U[i, col] = 1.0
+            if j >= 0:
+                U[j, col] = -1.0
+        new = [col for col, k in enumerate(slots) if k not in self._Z]
+        if new:
+            Znew = np.asarray(factor.solve(U[:, new])).reshape(n, len(new))
+            for c, col in enumerate(new):
+                self._Z[slots[col]] = Znew[:, c]
+        Z = np.column_stack([self._Z[k] for k in slots])
+        d = self.values[slots] - self._base_values[slots]  # Δg de cada resistor
+
+        b = self.rhs()
+        y = factor.solve(b)
+        S = np.eye(len(slots)) + d[:, None] * (U.T @ Z)
+        try:
+            x = y - Z @ np.linalg.solve(S, d * (U.T @ y))
+        except np.linalg.LinAlgError:
+            return None
+
+        # Deriva numérica: residuo con la matriz actual, A0·x + U·D·Uᵀ·x - b
+        r = self._A0 @ x + U @ (d * (U.T @ x)) - b
+        scale = max(float(np.abs(b).max()) if len(b) else 0.0, np.finfo(float).tiny)
+        residual = float(np.abs(r).max()) / scale
+        self.incremental_info["residual"] = residual
+        if not np.isfinite(residual) or residual > self.drift_tol:
+            return None
+        return x
+
+    def solve_vector(self) -> np.ndarray:
+        """Vector solución x = [voltajes de nodos, corrientes de fuentes y diodos]."""
+        if self.meta.diode_indices:
+            return self._solve_diodes()
+        if self.meta.shockley:
+            # La parte lineal se re-ensambla solo si cambió un valor
+            x, self.newton_info = solve_newton(
+                self.matrix(), self.rhs(), self.meta, **self.newton_options
+            )
+            return x
+        try:
+            if self.incremental and self._factor is not None:
+                slots = self._changed_resistors()
+                self.incremental_info["rank"] = len(slots)
+                if len(slots) == 0:
+                    return self._factor.solve(self.rhs())
+                if len(slots) <= self.max_updates:
+                    x = self._low_rank_solve(slots)
+                    if x is not None:
+                        self.incremental_info["low_rank_solves"] += 1
+                        return x
+                # Demasiadas correcciones o deriva: se refactoriza con A actual
+                self._factor = None
+                self.incremental_info["rank"] = 0
+            return self.factorization().solve(self.rhs())
+        except np.linalg.LinAlgError:
+            # Mismo camino de respaldo (mínimos cuadrados) que simulate()
+            return self._solver.solve(self.matrix(), self.rhs(), labels=self._labels)
+
+    def _solve_diodes(self) -> np.ndarray:
+        """
+        Estados de los diodos ideales, arrancando desde los de la solución
+        anterior: tras editar un valor suelen bastar una o dos iteraciones.
+        """
+        if self._diodes is None:
+            self._diodes = DiodeStateSolver(
+                self.matrix(), self.rhs(), self.meta, factor=self.factorization()
+            )
+        on = [d for d, st in self.diode_states.items() if st == "ON"]
+        x, self.diode_states, _ = self._diodes.solve_auto(initial_on=on)
+        return x
+
+    def solve(self, checks: bool = False) -> Solution:
+        """Resuelve con los valores actuales y reconstruye la solución."""
+        x = self.solve_vector()
+        sol = self.meta.reconstruct_solution(x, self.diode_states)
+        sol.newton = self.newton_info
+        if checks:
+            # La incidencia solo depende de la topología: se arma una vez
+            if self._incidence is None:
+                self._incidence = Incidence(self.netlist)
+            sol.checks = run_checks(self.netlist, sol, incidence=self._incidence)
+        return sol
+
+    def batch_parameters(self, values: Dict[str, np.ndarray]) -> np.ndarray:
+        """
+        Matriz de parámetros (K, m): una fila por variante, partiendo de los
+        valores actuales. Los arreglos de values deben tener la misma
+        longitud K (los escalares se repiten).
+        """
+        arrays = {cid: np.asarray(v, dtype=float) for cid, v in values.items()}
+        try:
+            shape = np.broadcast_shapes(*(a.shape for a in arrays.values()))
+        except ValueError:
+            raise ValueError("Todos los arreglos del barrido deben tener la misma longitud")
+        if len(shape) > 1:
+            raise ValueError("Los valores del barrido deben ser arreglos 1-D")
+        K = shape[0] if shape else 1
+
+        P = np.tile(self.values, (K, 1))
+        for cid, a in arrays.items():
+            if cid not in self.pattern.slot_of:
+                raise KeyError(f"{cid}: no es un resistor ni una fuente del circuito compilado")
+            P[:, self.pattern.slot_of[cid]] = self.pattern.param_value(cid, a)
+        return P
+
+    def batch_size(self, max_bytes: int = BATCH_CHUNK_BYTES) -> int:
+        """Variantes por lote de solve_batch para no superar max_bytes de matrices."""
+        n = self.pattern.n
+        return max(1, int(max_bytes // (8 * n * n)))
+
+    def solve_batch(self, P: np.ndarray) -> np.ndarray:
+        """
+        Resuelve K variantes de una vez: apila las matrices en (K, n, n) y
+        llama a un único np.linalg.solve por lote. P viene de
+        batch_parameters(); devuelve X con forma (K, n).
+        """
+        if self.meta.diode_indices or self.meta.shockley:
+            raise ValueError(
+                "La resolución por lotes no admite diodos: "
+                "use update_values() y solve() por variante."
+            )
+        A = self.pattern.assemble_batch(self.pattern.entry_values(P))
+        B = self.pattern.rhs(P)
+        try:
+            return np.linalg.solve(A, B[..., None])[..., 0]
+        except np.linalg.LinAlgError as e:
+            raise ValueError(f"Alguna variante del lote tiene un sistema singular: {e}")
@@ -0,0 +1,275 @@
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from .lcp import LCPError, lemke, projected_gauss_seidel
+from .solver import LinearSolver
+from .tableau import GMIN, Meta
+
+# Tolerancias para decidir un cambio de estado
+V_TOL = 1e-9   # V_ak por encima de esto: un diodo OFF debería conducir
+I_TOL = 1e-12  # i_d por debajo de -I_TOL: un diodo ON debería cortarse
+
+# Pasos de refinamiento iterativo tras Woodbury: A0 está mal condicionada
+# por GMIN y la fórmula pierde dígitos por cancelación
+REFINE_STEPS = 3
+
+# Métodos del motor de diodos: "pwl" itera estados, "lcp" plantea un problema
+# de complementariedad (Lemke) y "pgs" lo resuelve con Gauss–Seidel proyectado.
+# "auto" itera estados y recurre a LCP si la iteración no converge o es singular.
+DIODE_METHODS = ("auto", "pwl", "lcp", "pgs")
+
+
+class DiodeConvergenceError(ValueError):
+    """La iteración de estados ON/OFF no convergió."""
+
+
+class DiodeSingularError(ValueError):
+    """El sistema es singular con el conjunto de diodos en ON (p. ej. diodos en paralelo)."""
+
+
+class DiodeStateSolver:
+    """
+    Motor lineal por tramos para diodos ideales.
+
+    build_system estampa todos los diodos en OFF (fila i_d = GMIN·V_ak), y
+    esa matriz A0 se factoriza una sola vez. Poner un diodo en ON cambia
+    solo su fila por V_a - V_k = 0, es decir A = A0 + e_d·w_dᵀ: una
+    actualización de rango 1. Para un conjunto S de diodos en ON se aplica
+    Woodbury:
+
+        x = z - Z·(I + WᵀZ)⁻¹·Wᵀz,   z = A0⁻¹b,  Z = A0⁻¹[e_d]
+
+    Cada columna de Z cuesta una sustitución triangular y se guarda, así
+    que cambiar de estado nunca refactoriza A0. Como A0 está mal
+    condicionada (GMIN), el resultado se pule con refinamiento iterativo
+    sobre el residuo de la matriz real A0 + E·Wᵀ.
+    """
+    def __init__(self, A, b, meta: Meta, factor=None, solver: Optional[LinearSolver] = None):
+        self.meta = meta
+        self.A = A
+        self.n = A.shape[0]
+        solver = solver or LinearSolver()
+        self.factor = factor or solver.factorize(A, labels=meta.unknown_labels())
+        self.b = b
+        self.z = self.factor.solve(b)
+
+        # Por diodo: columna de su corriente, índices de ánodo y cátodo
+        # (-1 = GND) y la fila Wᵀ (ON - OFF) en forma dispersa
+        self.ids = list(meta.diode_indices)
+        by_id = {c.id: c for c in meta.components}
+        self.col = np.array([meta.diode_indices[d] for d in self.ids], dtype=np.int64)
+        self.anode = np.array(
+            [meta.node_index.get(by_id[d].anode, -1) for d in self.ids], dtype=np.int64)
+        self.cathode = np.array(
+            [meta.node_index.get(by_id[d].cathode, -1) for d in self.ids], dtype=np.int64)
+        self._w = [self._delta_row(k) for k in range(len(self.ids))]
+        self._Z: Dict[int, np.ndarray] = {}
+        # Motor que produjo la última solución: "pwl", "lcp" o "pgs"
+        self.method_used: Optional[str] = None
+
+    def _delta_row(self, k: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Fila ON menos fila OFF del diodo k: (índices, valores)."""
+        idx, val = [self.col[k]], [-1.0]
+        if self.anode[k] >= 0:
+            idx.append(self.anode[k])
+            val.append(1.0 + GMIN)
+        if self.cathode[k] >= 0:
+            idx.append(self.cathode[k])
+            val.append(-(1.0 + GMIN))
+        return np.array(idx, dtype=np.int64), np.array(val)
+
+    def _column(self, k: int) -> np.ndarray:
+        """Z[:, k] = A0⁻¹·e_d (se calcula una vez por diodo)."""
+        if k not in self._Z:
+            e = np.zeros(self.n)
+            e[self.col[k]] = 1.0
+            self._Z[k] = self.factor.solve(e)
+        return self._Z[k]
+
+    def _columns(self) -> np.ndarray:
+        """Z completa (n, m): todas las columnas en una sola sustitución."""
+        missing = [k for k in range(len(self.ids)) if k not in self._Z]
+        if missing:
+            E = np.zeros((self.n, len(missing)))
+            E[self.col[missing], np.arange(len(missing))] = 1.0
+            Zm = self.factor.solve(E)
+            for j, k in enumerate(missing):
+                self._Z[k] = Zm[:, j]
+        return np.column_stack([self._Z[k] for k in range(len(self.ids))])
+
+    def _apply_w(self, on, v) -> np.ndarray:
+        """Wᵀ·v para los diodos `on`; v puede ser vector o matriz (n, s)."""
+        return np.array([self._w[k][1] @ v[self._w[k][0]] for k in on])
+
+    def solve_state(self, on: Iterable[int]) -> np.ndarray:
+        """Solución x con los diodos de posiciones `on` conduciendo."""
+        on = sorted(on)
+        if not on:
+            return self.z
+        Z = np.column_stack([self._column(k) for k in on])
+        C = np.eye(len(on)) + self._apply_w(on, Z)
+        try:
+            x = self.z - Z @ np.linalg.solve(C, self._apply_w(on, self.z))
+        except np.linalg.LinAlgError:
+            names = ", ".join(self.ids[k] for k in on)
+            raise DiodeSingularError(
+                "El sistema de ecuaciones es singular con los diodos en conducción "
+                f"({names}): posible diodo en cortocircuito con una fuente de voltaje."
+            )
+
+        # Refinamiento iterativo: r = b - (A0 + E·Wᵀ)·x
+        scale = np.linalg.norm(self.b) + 1.0
+        for _ in range(REFINE_STEPS):
+            r = self.b - self.A @ x
+            r[self.col[on]] -= self._apply_w(on, x)
+            if np.linalg.norm(r) <= 1e-13 * scale:
+                break
+            dz = self.factor.solve(r)
+            x = x + dz - Z @ np.linalg.solve(C, self._apply_w(on, dz))
+        return x
+
+    def state_matrix(self, states: Dict[str, str]):
+        """A (densa o CSR, como la original) con las filas de los diodos en ON."""
+        rows, cols, vals = [], [], []
+        for k, d in enumerate(self.ids):
+            if states.get(d) == "ON":
+                idx, val = self._delta_row(k)
+                rows.extend([self.col[k]] * len(idx))
+                cols.extend(idx)
+                vals.extend(val)
+        if hasattr(self.A, "toarray"):
+            return (self.A + type(self.A)((vals, (rows, cols)), shape=self.A.shape)).tocsr()
+        A = np.array(self.A, dtype=float)
+        np.add.at(A, (np.asarray(rows, dtype=np.int64), np.asarray(cols, dtype=np.int64)), vals)
+        return A
+
+    def port_voltages(self, x: np.ndarray) -> np.ndarray:
+        """V_ak de cada diodo (GND = 0)."""
+        xz = np.append(x, 0.0)  # el índice -1 (GND) apunta al cero agregado
+        return xz[self.anode] - xz[self.cathode]
+
+    def violations(self, x: np.ndarray, on: set) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Diodos cuyo estado contradice la solución: OFF con V_ak > 0 y ON con
+        corriente negativa. Devuelve (posiciones, magnitud de la violación).
+        """
+        is_on = np.zeros(len(self.ids), dtype=bool)
+        is_on[list(on)] = True
+        vak = self.port_voltages(x)
+        i_d = x[self.col]
+        bad_off = ~is_on & (vak > V_TOL)
+        bad_on = is_on & (i_d < -I_TOL)
+        score = np.where(bad_off, vak, 0.0) + np.where(bad_on, -i_d, 0.0)
+        pos = np.flatnonzero(bad_off | bad_on)
+        return pos, score[pos]
+
+    def port_matrix(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Complemento de Schur de la red vista desde los diodos.
+
+        Si cada diodo se trata como una fuente de corriente s_d (ánodo→
+        cátodo) sobre A0, entonces x = z + Z·s y los voltajes de puerto son
+        V_ak = v0 + P·s con P = Uᵀ·Z. El diodo ideal exige s ≥ 0,
+        -V_ak ≥ 0 y s·V_ak = 0: un LCP con M = -P (PSD) y q = -v0.
+        """
+        Z = self._columns()
+        Zz = np.vstack([Z, np.zeros((1, Z.shape[1]))])  # fila -1 = GND
+        P = Zz[self.anode] - Zz[self.cathode]
+        return -P, -self.port_voltages(self.z)
+
+    def solve_lcp(self, method: str = "lcp"):
+        """
+        Resuelve los estados como LCP (Lemke o Gauss–Seidel proyectado) y
+        pule la solución con el motor de estados desde ese punto, lo que
+        corrige los diodos en el límite numérico ON/OFF.
+
+        Returns:
+            (x, {"D1": "ON"/"OFF", ...}, iteraciones del pulido)
+        """
+        M, q = self.port_matrix()
+        s = None
+        if method == "pgs":
+            try:
+                s = projected_gauss_seidel(M, q)
+            except LCPError:
+                pass  # M singular o mal condicionada: Lemke sí termina
+        used = "pgs" if s is not None else "lcp"
+        if s is None:
+            s = lemke(M, q)
+        on = [d for d, sd in zip(self.ids, s) if sd > I_TOL]
+        out = self.solve(initial_on=on)
+        self.method_used = used
+        return out
+
+    def solve(self, initial_on: Iterable[str] = (), max_iter: Optional[int] = None):
+        """
+        Itera estados ON/OFF hasta que todos sean consistentes.
+
+        En cada paso cambia todos los diodos que violan su estado; si eso
+        lleva a un estado ya visitado (ciclo), cambia solo el peor. Con
+        initial_on se arranca desde un estado conocido (p. ej. la solución
+        anterior al editar un valor).
+
+        Returns:
+            (x, {"D1": "ON"/"OFF", ...}, iteraciones)
+        """
+        pos_of = {d: k for k, d in enumerate(self.ids)}
+        on = {pos_of[d] for d in initial_on if d in pos_of}
+        max_iter = max_iter or 4 * len(self.ids) + 20
+        seen = set()
+        for it in range(1, max_iter + 1):
+            x = self.solve_state(on)
+            pos, score = self.violations(x, on)
+            if not len(pos):
+                states = {d: ("ON" if k in on else "OFF") for k, d in enumerate(self.ids)}
+                return x, states, it
+            seen.add(frozenset(on))
+            nxt = on ^ set(pos.tolist())
+            if frozenset(nxt) in seen:
+                nxt = on ^ {int(pos[np.argmax(score)])}
+            on = nxt
+        raise DiodeConvergenceError(
+            f"Los estados de los diodos no convergieron en {max_iter} iteraciones. "
+            "Revisa el circuito o usa el método LCP."
+        )
+
+    def solve_auto(self, initial_on: Iterable[str] = ()):
+        """
+        solve() y, si no converge o algún conjunto ON es singular (diodos
+        ideales en paralelo), solve_lcp(). Devuelve lo mismo que solve().
+        """
+        try:
+            out = self.solve(initial_on)
+        except (DiodeConvergenceError, DiodeSingularError, np.linalg.LinAlgError):
+            return self.solve_lcp()
+        self.method_used = "pwl"
+        return out
+
+
+def solve_ideal_diodes(A, b, meta: Meta, factor=None, initial_on: Iterable[str] = (),
+                       method: str = "auto", engine: Optional[DiodeStateSolver] = None):
+    """
+    Resuelve A·x = b con los diodos ideales de meta en su estado correcto.
+
+    method: "pwl" (iteración de estados), "lcp" (Lemke), "pgs" (Gauss–Seidel
+    proyectado) o "auto" (estados; LCP si la iteración no converge o si
+    algún conjunto ON es singular, como con diodos ideales en paralelo).
+    engine permite pasar un DiodeStateSolver ya armado sobre A y b (p. ej.
+    para pedirle después state_matrix()).
+
+    Returns:
+        (x, diode_states, motor que produjo x: "pwl", "lcp" o "pgs")
+    """
+    if method not in DIODE_METHODS:
+        raise ValueError(f"Método de diodos inválido: {method}")
+    if engine is None:
+        engine = DiodeStateSolver(A, b, meta, factor=factor)
+    if method == "auto":
+        x, states, _ = engine.solve_auto(initial_on)
+    elif method == "pwl":
+        x, states, _ = engine.solve(initial_on)
+        engine.method_used = "pwl"
+    else:
+        x, states, _ = engine.solve_lcp(method)
+    return x, states, engine.method_used
@@ -0,0 +1,214 @@
+from collections import defaultdict, deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+
+from .solver import LinearSolver
+
+try:
+    import scipy.linalg as sla
+    import scipy.sparse as sp
+    import scipy.sparse.linalg as spla
+except ImportError:  # scipy es opcional: sin él se usa LinearSolver
+    sla = None
+    sp = None
+    spla = None
+
+
+@dataclass
+class SourceElimination:
+    """
+    Sistema MNA sin las incógnitas de fuentes de voltaje e inductores.
+
+    Las fuentes (e inductores, fuentes de 0 V en DC) forman un bosque
+    sobre los nodos. En la componente que contiene GND cada voltaje es
+    conocido; en las demás (supernodos) todos los voltajes son el del
+    representante más un desplazamiento fijo. Con V = T·y + c (T agrupa
+    cada nodo en su incógnita reducida) el sistema nodal queda
+
+        K·y = Tᵀ·(b - G·c),   K = Tᵀ·G·T,
+
+    simétrico y, con solo resistores, definido positivo: se resuelve con
+    Cholesky (denso), LU disperso en modo simétrico o CG. Las
+    corrientes de las fuentes salen después de KCL en el bosque, de las
+    hojas a la raíz.
+
+    node_map[i]: incógnita reducida del nodo de fila i (-1 = voltaje fijo).
+    offset[i]: c_i, desplazamiento respecto del representante (o voltaje).
+    tree: (columna de la fuente, nodo hijo, nodo padre) en orden BFS,
+        con -1 como GND.
+    method_used, condition: método con que se resolvió K·y = rhs
+        ("cholesky", "splu" o el de LinearSolver) y κ₁(K) estimado.
+    """
+    n: int
+    node_map: np.ndarray
+    offset: np.ndarray
+    K: object
+    rhs: np.ndarray
+    tree: list
+    _G: object
+    _B: dict
+    _b_nodes: np.ndarray
+    method_used: Optional[str] = field(default=None, init=False)
+    condition: Optional[float] = field(default=None, init=False)
+
+    @property
+    def size(self) -> int:
+        """Incógnitas del sistema reducido."""
+        return self.rhs.shape[0]
+
+    def solve(self, solver: Optional[LinearSolver] = None) -> np.ndarray:
+        """Resuelve K·y = rhs y devuelve el vector x completo del MNA."""
+        y = self._solve_reduced(solver)
+        return self.expand(y)
+
+    def _solve_reduced(self, solver) -> np.ndarray:
+        if self.size == 0:
+            return np.zeros(0)
+        estimate = None if solver is None else solver.estimate_condition
+        if solver is None or solver.method == "direct":
+            try:
+                if isinstance(self.K, np.ndarray) and sla is not None:
+                    c, lower = sla.cho_factor(self.K, check_finite=False)
+                    y = sla.cho_solve((c, lower), self.rhs, check_finite=False)
+                    self.method_used = "cholesky"
+                    if estimate is not False:
+                        pocon = sla.get_lapack_funcs("pocon", (c,))
+                        rcond, info = pocon(c, float(np.abs(self.K).sum(axis=0).max()),
+                                            uplo="L" if lower else "U")
+                        self.condition = float(1.0 / rcond) if info == 0 and rcond > 0 else float("inf")
+                    return y
+                if sp is not None and sp.issparse(self.K):
+                    # Sin Cholesky dispersa en scipy: LU en modo simétrico
+                    # (orden de mínimo grado sobre K, pivotes en la diagonal)
+                    K = self.K.tocsc()
+                    lu = spla.splu(K, permc_spec="MMD_AT_PLUS_A",
+                                   diag_pivot_thresh=0.0, options=dict(SymmetricMode=True))
+                    y = lu.solve(self.rhs)
+                    if np.all(np.isfinite(y)):
+                        self.method_used = "splu"
+                        if estimate:
+                            # K simétrica: K⁻ᵀ = K⁻¹
+                            op = spla.LinearOperator(K.shape, matvec=lu.solve, rmatvec=lu.solve,
+                                                     dtype=float)
+                            self.condition = float(spla.norm(K, 1) * spla.onenormest(op, t=1))
+                        return y
+            except (np.linalg.LinAlgError, RuntimeError):
+                pass  # no es definida positiva o es singular: LinearSolver
+        solver = solver or LinearSolver()
+        y = solver.solve(self.K, self.rhs)
+        self.method_used = solver.method_used
+        self.condition = solver.condition
+        return y
+
+    def expand(self, y: np.ndarray) -> np.ndarray:
+        """x = [voltajes | corrientes] a partir de la solución reducida y."""
+        x = np.zeros(self.n)
+        nn = len(self.node_map)
+        mapped = self.node_map >= 0
+        V = self.offset.copy()
+        V[mapped] += y[self.node_map[mapped]]
+        x[:nn] = V
+
+        # KCL en cada nodo: G·V + B·I = b  =>  B·I = b - G·V
+        acc = self._b_nodes - self._G @ V
+        for col, child, parent in reversed(self.tree):
+            i = acc[child] / self._B[col, child]
+            x[col] = i
+            if parent >= 0:
+                acc[parent] -= self._B[col, parent] * i
+        return x
+
+
+def eliminate_sources(A, b, meta) -> Optional[SourceElimination]:
+    """
+    Elimina por sustitución las fuentes de voltaje (a tierra y en
+    supernodos) y los inductores de un sistema MNA lineal.
+
+    Devuelve None si no hay nada que eliminar o si el circuito tiene
+    diodos (sus filas no son nodales y cambian con el estado).
+    """
+    if meta.diode_indices or meta.shockley:
+        return None
+    branches = {**meta.vsource_indices, **meta.inductor_indices}
+    if not branches:
+        return None
+
+    node = meta.node_index
+    nn = len(node)
+    n = A.shape[0]
+    by_id = {c.id: c for c in meta.components}
+
+    # Bosque de fuentes: adyacencia por fila de nodo (-1 = GND)
+    adj = defaultdict(list)
+    B = {}
+    for cid, col in branches.items():
+        c = by_id[cid]
+        i, j = node.get(c.n1, -1), node.get(c.n2, -1)
+        volts = c.V if c.kind == "V" else 0.0
+        adj[i].append((j, col, volts))
+        adj[j].append((i, col, -volts))
+        # Coeficientes de la corriente en las filas KCL (ver StampPattern)
+        B[col, i] = 1.0
+        B[col, j] = -1.0
+
+    node_map = np.full(nn, -1, dtype=np.int64)
+    offset = np.zeros(nn)
+    fixed = np.zeros(nn, dtype=bool)
+    tree = []
+    seen = set()
+
+    def bfs(root):
+        # V_hijo = V_padre + (V_n1 - V_n2 visto desde el padre)
+        seen.add(root)
+        q = deque([root])
+        members = []
+        while q:
+            u = q.popleft()
+            for v, col, volts in adj[u]:
+                if v in seen:
+                    continue
+                seen.add(v)
+                if v >= 0:
+                    offset[v] = (offset[u] if u >= 0 else 0.0) - volts
+                    members.append(v)
+                tree.append((col, v, u))
+                q.append(v)
+        return members
+
+    for v in bfs(-1):
+        fixed[v] = True
+    supernode = {}  # representante -> miembros
+    for root in sorted(k for k in adj if k >= 0):
+        if root not in seen:
+            supernode[root] = bfs(root)
+
+    # Incógnitas reducidas en el orden de filas: conserva el ordenamiento
+    # de nodos (p. ej. RCM) del sistema original
+    rep_of = np.arange(nn)
+    for root, members in supernode.items():
+        rep_of[members] = root
+    free = np.flatnonzero(~fixed)
+    reps = np.unique(rep_of[free])
+    red = np.full(nn, -1, dtype=np.int64)
+    red[reps] = np.arange(len(reps))
+    node_map[free] = red[rep_of[free]]
+
+    b_nodes = np.asarray(b[:nn], dtype=float)
+    is_sparse = sp is not None and sp.issparse(A)
+    if is_sparse:
+        G = sp.csr_matrix(A)[:nn, :nn]
+        T = sp.csr_matrix((np.ones(len(free)), (free, node_map[free])), shape=(nn, len(reps)))
+        K = (T.T @ G @ T).tocsr()
+        rhs = T.T @ (b_nodes - G @ offset)
+    else:
+        G = np.asarray(A)[:nn, :nn]
+        K = np.zeros((len(reps), len(reps)))
+        mf = node_map[free]
+        np.add.at(K, (mf[:, None], mf[None, :]), G[np.ix_(free, free)])
+        rhs = np.zeros(len(reps))
+        np.add.at(rhs, mf, (b_nodes - G @ offset)[free])
+
+    return SourceElimination(n=n, node_map=node_map, offset=offset, K=K, rhs=rhs,
+                             tree=tree, _G=G, _B=B, _b_nodes=b_nodes)
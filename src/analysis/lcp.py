@@ -0,0 +1,99 @@
+from typing import Optional
+
+import numpy as np
+
+# Tolerancia de pivoteo / factibilidad
+LCP_TOL = 1e-12
+
+
+class LCPError(ValueError):
+    """El problema de complementariedad no tiene solución o no convergió."""
+
+
+def lemke(M: np.ndarray, q: np.ndarray, max_iter: Optional[int] = None) -> np.ndarray:
+    """
+    Resuelve el LCP  w = M·z + q,  w ≥ 0,  z ≥ 0,  wᵀz = 0  con el método
+    de pivoteo complementario de Lemke (vector de cobertura e = 1).
+
+    Termina en a lo sumo unos pocos m pivotes para matrices PSD como la
+    impedancia de puertos de una red resistiva; cada pivote es O(m²).
+    """
+    q = np.asarray(q, dtype=float)
+    m = len(q)
+    if m == 0 or np.all(q >= 0):
+        return np.zeros(m)
+    max_iter = max_iter or 50 * m + 100
+
+    # Tablero [ I | -M | -e | q ]: columnas 0..m-1 = w, m..2m-1 = z, 2m = z0
+    z0 = 2 * m
+    T = np.hstack([np.eye(m), -np.asarray(M, dtype=float), -np.ones((m, 1)), q[:, None]])
+    basis = np.arange(m)
+
+    def pivot(r, c):
+        T[r] /= T[r, c]
+        col = T[:, c].copy()
+        col[r] = 0.0
+        # Solo filas y columnas no nulas: con bloques independientes (M
+        # diagonal por bloques) el tablero se mantiene disperso
+        rows = np.flatnonzero(col)
+        cols = np.flatnonzero(T[r])
+        if 4 * len(rows) * len(cols) > T.size:
+            T[:] -= np.outer(col, T[r])
+        elif len(rows) and len(cols):
+            T[np.ix_(rows, cols)] -= np.outer(col[rows], T[r, cols])
+        basis[r] = c
+
+    r = int(np.argmin(q))
+    leaving = basis[r]
+    pivot(r, z0)
+    entering = leaving + m  # complemento de w_r
+
+    for _ in range(max_iter):
+        col = T[:, entering]
+        rows = np.flatnonzero(col > LCP_TOL)
+        if not len(rows):
+            raise LCPError("LCP sin solución (terminación en rayo)")
+        ratios = T[rows, -1] / col[rows]
+        best = rows[ratios <= ratios.min() + LCP_TOL]
+        # Ante empate se prefiere sacar z0: termina el algoritmo
+        r = int(best[basis[best] == z0][0]) if np.any(basis[best] == z0) else int(best[0])
+        leaving = basis[r]
+        pivot(r, entering)
+        if leaving == z0:
+            z = np.zeros(m)
+            is_z = (basis >= m) & (basis < z0)
+            z[basis[is_z] - m] = T[is_z, -1]
+            return np.maximum(z, 0.0)
+        entering = leaving + m if leaving < m else leaving - m
+
+    raise LCPError(f"Lemke no terminó en {max_iter} pivotes")
+
+
+def projected_gauss_seidel(
+    M: np.ndarray,
+    q: np.ndarray,
+    tol: float = 1e-10,
+    max_iter: int = 500,
+    z0: Optional[np.ndarray] = None,
+) -> np.ndarray:
+    """
+    Resuelve el mismo LCP con Gauss–Seidel proyectado:
+    z_i ← max(0, z_i - (M_i·z + q_i)/M_ii). Converge para M simétrica
+    definida positiva; requiere M_ii > 0. Se detiene cuando el residuo de
+    complementariedad max|min(z_i·M_ii, w_i)| cae bajo tol·max|q|.
+    """
+    M = np.asarray(M, dtype=float)
+    q = np.asarray(q, dtype=float)
+    m = len(q)
+    diag = np.diag(M).copy()
+    if np.any(diag <= 0):
+        raise LCPError("Gauss–Seidel proyectado requiere M_ii > 0; use Lemke")
+    z = np.zeros(m) if z0 is None else np.maximum(np.asarray(z0, dtype=float), 0.0)
+    scale = np.abs(q).max() + 1.0
+    for _ in range(max_iter):
+        for i in range(m):
+            z[i] = max(0.0, z[i] - (M[i] @ z + q[i]) / diag[i])
+        w = M @ z + q
+        if np.abs(np.minimum(z * diag, w)).max() <= tol * scale:
+            return z
+    raise LCPError(f"Gauss–Seidel proyectado no convergió en {max_iter} barridos")
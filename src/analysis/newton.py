@@ -0,0 +1,216 @@
+import math
+import time
+from typing import Optional
+
+import numpy as np
+
+from .solver import LinearSolver
+from .tableau import GMIN, Meta
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy es opcional: solo se usa en el modo disperso
+    sp = None
+
+# Más allá de este argumento la exponencial se continúa linealmente
+MAX_EXP_ARG = 80.0
+
+
+class NewtonSolver:
+    """
+    Newton–Raphson amortiguado para diodos Shockley sobre el sistema MNA.
+
+    La parte lineal A_lin·x = b_lin (de build_system) se ensambla una sola
+    vez; en cada iteración solo se re-estampan las 4 entradas de cada diodo
+    (conductancia g_d) y su corriente en el residuo:
+
+        F(x) = A_lin·x + Dᵀ·i(V_d) - λ·b_lin,   J = A_lin + Dᵀ·diag(g)·D
+
+    Robustez: limitación de voltaje de unión (pnjlim de SPICE) y, si Newton
+    no converge con las fuentes completas, homotopía de fuentes (λ: 0 → 1).
+    Velocidad: con jacobian_reuse = k > 1 la factorización de J se reutiliza
+    hasta k iteraciones (Newton modificado) mientras el residuo siga bajando.
+    """
+    def __init__(
+        self,
+        A_lin,
+        b_lin,
+        meta: Meta,
+        max_iter: int = 100,
+        reltol: float = 1e-6,
+        vntol: float = 1e-6,
+        abstol: float = 1e-12,
+        jacobian_reuse: int = 1,
+        solver: Optional[LinearSolver] = None,
+    ):
+        self.A = A_lin
+        self.b = b_lin
+        self.n = A_lin.shape[0]
+        self.sparse = not isinstance(A_lin, np.ndarray)
+        self.labels = meta.unknown_labels()
+        self.solver = solver or LinearSolver()
+        self.max_iter = max_iter
+        self.reltol = reltol
+        self.jacobian_reuse = max(1, int(jacobian_reuse))
+
+        # Tolerancia absoluta por incógnita: voltajes (vntol) y corrientes (abstol)
+        self.atol = np.full(self.n, abstol)
+        self.atol[:len(meta.node_index)] = vntol
+
+        diodes = meta.shockley
+        self.ids = [d.id for d in diodes]
+        self.anode = np.array([meta.node_index.get(d.anode, -1) for d in diodes], dtype=np.int64)
+        self.cathode = np.array([meta.node_index.get(d.cathode, -1) for d in diodes], dtype=np.int64)
+        self.Is = np.array([d.Is for d in diodes])
+        self.nvt = np.array([d.n * d.Vt for d in diodes])
+        # Voltaje crítico de pnjlim: donde la curvatura de la exponencial es máxima
+        self.vcrit = self.nvt * np.log(self.nvt / (math.sqrt(2.0) * self.Is))
+
+        # Posiciones fijas de las 4 entradas por diodo (sin filas/cols de GND)
+        rows, cols, sign, owner = [], [], [], []
+        for j, (a, k) in enumerate(zip(self.anode, self.cathode)):
+            for r, c, s in ((a, a, 1.0), (k, k, 1.0), (a, k, -1.0), (k, a, -1.0)):
+                if r >= 0 and c >= 0:
+                    rows.append(r)
+                    cols.append(c)
+                    sign.append(s)
+                    owner.append(j)
+        self._rows = np.asarray(rows, dtype=np.int64)
+        self._cols = np.asarray(cols, dtype=np.int64)
+        self._sign = np.asarray(sign)
+        self._owner = np.asarray(owner, dtype=np.int64)
+
+        self.info = {
+            "iterations": 0,
+            "iteration_times": [],
+            "factorizations": 0,
+            "source_steps": 0,
+            "converged": False,
+        }
+
+    # --- modelo del diodo ---
+    def _eval(self, vd):
+        """Corriente y conductancia de cada diodo (con fuga GMIN)."""
+        u = vd / self.nvt
+        e = np.exp(np.minimum(u, MAX_EXP_ARG))
+        lin = u > MAX_EXP_ARG
+        i = self.Is * (np.where(lin, e * (1.0 + u - MAX_EXP_ARG), e) - 1.0)
+        g = self.Is * e / self.nvt
+        return i + GMIN * vd, g + GMIN
+
+    def _limit(self, vnew, vold):
+        """pnjlim: evita saltos grandes en la zona exponencial."""
+        nvt = self.nvt
+        big = (vnew > self.vcrit) & (np.abs(vnew - vold) > 2.0 * nvt)
+        arg = 1.0 + (vnew - vold) / nvt
+        from_pos = np.where(arg > 0, vold + nvt * np.log(np.maximum(arg, 1e-300)), self.vcrit)
+        from_neg = nvt * np.log(np.maximum(vnew / nvt, 1e-300))
+        return np.where(big, np.where(vold > 0, from_pos, from_neg), vnew)
+
+    # --- estampado ---
+    def _ports(self, x):
+        xz = np.append(x, 0.0)  # el índice -1 (GND) apunta al cero agregado
+        return xz[self.anode] - xz[self.cathode]
+
+    def _scatter(self, i):
+        """Dᵀ·i: la corriente sale del ánodo y entra al cátodo."""
+        r = np.zeros(self.n)
+        a, k = self.anode >= 0, self.cathode >= 0
+        np.add.at(r, self.anode[a], i[a])
+        np.subtract.at(r, self.cathode[k], i[k])
+        return r
+
+    def _jacobian(self, g):
+        vals = self._sign * g[self._owner]
+        if self.sparse:
+            return self.A + sp.csr_matrix((vals, (self._rows, self._cols)), shape=self.A.shape)
+        J = self.A.copy()
+        np.add.at(J, (self._rows, self._cols), vals)
+        return J
+
+    def jacobian_at(self, x):
+        """Jacobiano en el punto x: modelo de pequeña señal (g_d) de cada diodo."""
+        _, g = self._eval(self._ports(x))
+        return self._jacobian(g)
+
+    def residual(self, x) -> float:
+        """‖A·x + Dᵀ·i(D·x) - b‖₂: residuo no lineal real en x."""
+        i, _ = self._eval(self._ports(x))
+        return float(np.linalg.norm(self.A @ x + self._scatter(i) - self.b))
+
+    # --- iteración ---
+    def _newton(self, lam, x, vd):
+        """Newton a nivel de fuentes λ desde (x, vd); devuelve (x, vd, convergió)."""
+        factor, age, limited, prev_norm = None, 0, True, np.inf
+        for _ in range(self.max_iter):
+            t0 = time.perf_counter()
+            i, g = self._eval(vd)
+            # Residuo linealizado en vd (coincide con el real si vd = D·x)
+            F = self.A @ x + self._scatter(i + g * (self._ports(x) - vd)) - lam * self.b
+            norm = np.abs(F).max()
+            # Newton modificado: el jacobiano viejo solo sirve mientras el
+            # residuo baje rápido y ningún diodo esté limitado
+            if factor is None or age >= self.jacobian_reuse or limited or norm > 0.5 * prev_norm:
+                factor = self.solver.factorize(self._jacobian(g), labels=self.labels)
+                self.info["factorizations"] += 1
+                age = 0
+            age += 1
+            prev_norm = norm
+            dx = -factor.solve(F)
+            x_new = x + dx
+            vd_raw = self._ports(x_new)
+            vd_new = self._limit(vd_raw, vd)
+            limited = not np.allclose(vd_raw, vd_new, rtol=0.0, atol=self.atol[0])
+            self.info["iterations"] += 1
+            self.info["iteration_times"].append(time.perf_counter() - t0)
+
+            converged = (
+                not limited
+                and np.all(np.abs(dx) <= self.reltol * np.maximum(np.abs(x), np.abs(x_new)) + self.atol)
+            )
+            x, vd = x_new, vd_new
+            if not np.all(np.isfinite(x)):
+                return x, vd, False
+            if converged:
+                return x, vd, True
+        return x, vd, False
+
+    def solve(self) -> np.ndarray:
+        """
+        Punto de operación: Newton directo y, si falla, homotopía de fuentes.
+        """
+        x0, vd0 = np.zeros(self.n), np.zeros(len(self.ids))
+        x, _, ok = self._newton(1.0, x0, vd0)
+        if not ok:
+            # Homotopía: escalar las fuentes por λ y avanzar desde λ = 0
+            # (solución trivial x = 0) con pasos adaptativos
+            lam, step, x, vd = 0.0, 0.1, x0, vd0
+            while lam < 1.0:
+                target = min(1.0, lam + step)
+                xt, vdt, ok = self._newton(target, x, vd)
+                if ok:
+                    lam, x, vd = target, xt, vdt
+                    self.info["source_steps"] += 1
+                    step = min(2.0 * step, 0.5)
+                else:
+                    step /= 4.0
+                    if step < 1e-6:
+                        raise ValueError(
+                            "Newton–Raphson no convergió ni con homotopía de fuentes "
+                            f"(λ = {lam:.4g})."
+                        )
+        self.info["converged"] = True
+        return x
+
+
+def solve_newton(A_lin, b_lin, meta: Meta, **options):
+    """
+    Resuelve el circuito con diodos Shockley.
+
+    Returns:
+        (x, info) con info = {"iterations", "iteration_times", "factorizations",
+        "source_steps", "converged"}
+    """
+    newton = NewtonSolver(A_lin, b_lin, meta, **options)
+    x = newton.solve()
+    return x, newton.info
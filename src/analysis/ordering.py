@@ -0,0 +1,228 @@
+from collections import deque
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from ..domain.netlist import Netlist
+from ..domain.compact import CompactNetlist
+
+try:
+    import scipy.sparse as sp
+    from scipy.sparse.csgraph import reverse_cuthill_mckee
+except ImportError:  # scipy es opcional: sin él se usa la versión en Python
+    sp = None
+    reverse_cuthill_mckee = None
+
+# Ordenamientos de nodos: "natural" (orden del netlist) o "rcm"
+# (Cuthill–McKee inverso, reduce el ancho de banda y la envolvente)
+ORDERINGS = ("natural", "rcm")
+
+# Tope de entradas al contar el relleno simbólico: con un mal ordenamiento
+# el conteo (O(nnz(L)) en Python) sería tan caro como la factorización
+MAX_FILL_COUNT = 5_000_000
+
+
+def node_graph(nl: Netlist, nodes: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Grafo de acoplamiento entre nodos (sin GND) como CSR (indptr, indices).
+
+    Dos nodos son vecinos si algún componente los une: resistores y
+    capacitores acoplan sus filas directamente; fuentes, inductores y
+    diodos a través de su fila de rama, que en la eliminación también los
+    une.
+    """
+    index = {nid: i for i, nid in enumerate(nodes)}
+    if isinstance(nl, CompactNetlist):
+        pos = np.full(len(nl.node_names), -1, dtype=np.int64)
+        for nid, i in index.items():
+            pos[nl.node_index[nid]] = i
+        i, j = pos[nl.n1], pos[nl.n2]
+        keep = (i >= 0) & (j >= 0) & (i != j)
+        a, b = i[keep], j[keep]
+        rows = np.concatenate([a, b])
+        cols = np.concatenate([b, a])
+    else:
+        a, b = [], []
+        for c in nl.components:
+            i, j = index.get(c.n1), index.get(c.n2)
+            if i is not None and j is not None and i != j:
+                a.append(i)
+                b.append(j)
+        rows = np.asarray(a + b, dtype=np.int64)
+        cols = np.asarray(b + a, dtype=np.int64)
+    n = len(nodes)
+    # Orden por fila y sin aristas repetidas
+    keys = np.unique(rows * n + cols) if n else np.empty(0, dtype=np.int64)
+    indptr = np.searchsorted(keys // max(n, 1), np.arange(n + 1))
+    return indptr, keys % max(n, 1)
+
+
+def _bfs_levels(adj, root):
+    """Niveles BFS desde root; adj ya tiene los vecinos por grado creciente."""
+    order = [root]
+    level = {root: 0}
+    q = deque([root])
+    while q:
+        u = q.popleft()
+        for v in adj[u]:
+            if v not in level:
+                level[v] = level[u] + 1
+                order.append(v)
+                q.append(v)
+    return order, level
+
+
+def rcm(indptr, indices) -> np.ndarray:
+    """
+    Cuthill–McKee inverso: BFS desde un nodo pseudo-periférico (George–Liu)
+    de cada componente conexa, visitando vecinos por grado creciente, y
+    luego se invierte el orden. Devuelve perm con perm[k] = nodo en la
+    posición k.
+
+    Con scipy se usa scipy.sparse.csgraph.reverse_cuthill_mckee (en C).
+    """
+    n = len(indptr) - 1
+    if reverse_cuthill_mckee is not None and n:
+        G = sp.csr_matrix((np.ones(len(indices), dtype=np.int8), indices, indptr), shape=(n, n))
+        return np.asarray(reverse_cuthill_mckee(G, symmetric_mode=True), dtype=np.int64)
+
+    deg = np.diff(indptr)
+    # Vecinos de cada nodo ordenados por grado, una sola vez
+    rows = np.repeat(np.arange(n), deg)
+    by_deg = np.lexsort((deg[indices], rows))
+    sorted_idx = indices[by_deg]
+    adj = [sorted_idx[indptr[u]:indptr[u + 1]].tolist() for u in range(n)]
+    seen = np.zeros(n, dtype=bool)
+    order: List[int] = []
+    for start in np.argsort(deg, kind="stable").tolist():
+        if seen[start]:
+            continue
+        # Nodo pseudo-periférico: repetir BFS desde el de menor grado del
+        # último nivel mientras crezca la excentricidad
+        root = start
+        comp, level = _bfs_levels(adj, root)
+        ecc = max(level.values())
+        while True:
+            last = [v for v in comp if level[v] == ecc]
+            cand = min(last, key=lambda v: deg[v])
+            comp2, level2 = _bfs_levels(adj, cand)
+            ecc2 = max(level2.values())
+            if ecc2 <= ecc:
+                break
+            root, comp, level, ecc = cand, comp2, level2, ecc2
+        seen[comp] = True
+        order.extend(comp)
+    return np.asarray(order[::-1], dtype=np.int64)
+
+
+def bandwidth_profile(indptr, indices, pos) -> Tuple[int, int]:
+    """
+    Ancho de banda max|pos_i - pos_j| y envolvente Σ_i (pos_i - min_j pos_j)
+    (j vecino con pos_j < pos_i) bajo la numeración pos[nodo].
+    """
+    n = len(indptr) - 1
+    if not len(indices):
+        return 0, 0
+    rows = np.repeat(np.arange(n), np.diff(indptr))
+    d = pos[rows] - pos[indices]
+    bandwidth = int(np.abs(d).max())
+    lower = np.zeros(n, dtype=np.int64)
+    np.maximum.at(lower, pos[rows], d)  # distancia al vecino más lejano por debajo
+    return bandwidth, int(lower.sum())
+
+
+def symbolic_fill(indptr, indices, perm, max_count: int = MAX_FILL_COUNT) -> Optional[int]:
+    """
+    nnz(L) de la factorización de Cholesky del patrón del grafo (incluye
+    la diagonal) con el ordenamiento perm, por árbol de eliminación y
+    subárboles de fila: O(nnz(L)). Devuelve None si supera max_count.
+    """
+    n = len(perm)
+    pos = np.empty(n, dtype=np.int64)
+    pos[perm] = np.arange(n)
+    parent = [-1] * n
+    ancestor = [-1] * n
+    mark = [-1] * n
+    count = n
+    for i in range(n):
+        u = int(perm[i])
+        lower = [int(pos[v]) for v in indices[indptr[u]:indptr[u + 1]] if pos[v] < i]
+        # Árbol de eliminación con compresión de caminos (Liu)
+        for j in lower:
+            r = j
+            while ancestor[r] != -1 and ancestor[r] != i:
+                nxt = ancestor[r]
+                ancestor[r] = i
+                r = nxt
+            if ancestor[r] == -1:
+                ancestor[r] = i
+                parent[r] = i
+        # Subárbol de la fila i: cada nodo recorrido es una entrada de L
+        mark[i] = i
+        for j in lower:
+            while mark[j] != i:
+                mark[j] = i
+                count += 1
+                if count > max_count:
+                    return None
+                j = parent[j]
+    return count
+
+
+@dataclass
+class NodeOrdering:
+    """
+    Ordenamiento de nodos aplicado antes de estampar.
+
+    perm[k] es la posición en el netlist (original) del nodo que ocupa la
+    fila k de la matriz; original lista los nodos (sin GND) en el orden del
+    netlist, para devolver los resultados en ese orden.
+    """
+    method: str
+    perm: np.ndarray
+    original: List[str]
+    bandwidth: Tuple[int, int]  # (antes, después)
+    profile: Tuple[int, int]    # envolvente (antes, después)
+    _graph: tuple = field(default=(), repr=False)
+
+    def fill(self, max_count: int = MAX_FILL_COUNT) -> Tuple[Optional[int], Optional[int]]:
+        """nnz(L) simbólico (antes, después); None si supera max_count."""
+        indptr, indices = self._graph
+        natural = np.arange(len(self.perm))
+        return (symbolic_fill(indptr, indices, natural, max_count),
+                symbolic_fill(indptr, indices, self.perm, max_count))
+
+    def report(self, with_fill: bool = True) -> dict:
+        """Ancho de banda, envolvente y (opcional) relleno, antes y después."""
+        out = {
+            "method": self.method,
+            "nodes": len(self.perm),
+            "bandwidth": {"before": self.bandwidth[0], "after": self.bandwidth[1]},
+            "profile": {"before": self.profile[0], "after": self.profile[1]},
+        }
+        if with_fill:
+            before, after = self.fill()
+            out["fill"] = {"before": before, "after": after}
+        return out
+
+
+def order_nodes(nl: Netlist, nodes: List[str], method: str = "rcm") -> NodeOrdering:
+    """Calcula el ordenamiento de los nodos (sin GND) de nl."""
+    if method not in ORDERINGS:
+        raise ValueError(f"Ordenamiento de nodos inválido: {method}")
+    indptr, indices = node_graph(nl, nodes)
+    n = len(nodes)
+    perm = rcm(indptr, indices) if method == "rcm" else np.arange(n, dtype=np.int64)
+    pos = np.empty(n, dtype=np.int64)
+    pos[perm] = np.arange(n)
+    bw0, pr0 = bandwidth_profile(indptr, indices, np.arange(n))
+    bw1, pr1 = bandwidth_profile(indptr, indices, pos)
+    return NodeOrdering(
+        method=method,
+        perm=perm,
+        original=list(nodes),
+        bandwidth=(bw0, bw1),
+        profile=(pr0, pr1),
+        _graph=(indptr, indices),
+    )
@@ -0,0 +1,238 @@
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from ..domain.components.resistor import Resistor
+from ..domain.netlist import Netlist
+from .results import ArrayMap, Solution, branch_terminals
+
+# Prefijo de los resistores equivalentes del netlist reducido
+EQUIVALENT_PREFIX = "#eq"
+
+
+class _Edge:
+    """
+    Resistor (original o equivalente) entre los nodos u y v.
+
+    kind: "R" (hoja: resistor original), "P" (paralelo de children) o
+    "S" (serie: children[0] entre u y mid, children[1] entre mid y v).
+    """
+    __slots__ = ("u", "v", "R", "kind", "children", "mid", "resistor", "alive")
+
+    def __init__(self, u, v, R, kind="R", children=(), mid=None, resistor=None):
+        self.u = u
+        self.v = v
+        self.R = R
+        self.kind = kind
+        self.children = list(children)
+        self.mid = mid
+        self.resistor = resistor
+        self.alive = True
+
+    def other(self, node):
+        return self.v if node == self.u else self.u
+
+
+@dataclass
+class Reduction:
+    """
+    Netlist reducido y lo necesario para recuperar el original.
+
+    edges: resistores del netlist reducido (id -> arista, original o
+        equivalente). dangling: (nodo quitado, vecino, arista) en orden de
+        eliminación; el nodo colgante queda al voltaje del vecino.
+    loops: resistores con ambos terminales en el mismo nodo (corriente 0).
+    """
+    original: Netlist
+    netlist: Netlist
+    edges: Dict[str, _Edge]
+    dangling: list
+    loops: List[str]
+    counts: Dict[str, int] = field(default_factory=dict)
+    timings: Dict[str, float] = field(default_factory=dict)
+
+    @property
+    def removed_nodes(self) -> int:
+        return len(self.original.nodes) - len(self.netlist.nodes)
+
+    def report(self) -> dict:
+        """Incógnitas quitadas, operaciones aplicadas y tiempos (s)."""
+        return {
+            "nodes_before": len(self.original.nodes),
+            "nodes_after": len(self.netlist.nodes),
+            "unknowns_removed": self.removed_nodes,
+            "resistors_before": sum(c.kind == "R" for c in self.original.components),
+            "resistors_after": sum(c.kind == "R" for c in self.netlist.components),
+            **self.counts,
+            **{f"{k}_s": v for k, v in self.timings.items()},
+        }
+
+    def expand(self, sol: Solution) -> Solution:
+        """
+        Solution del netlist original a partir de la del reducido:
+        voltajes de los nodos internos por divisor de tensión en cada serie
+        y corriente de cada resistor original por ley de Ohm.
+        """
+        t0 = time.perf_counter()
+        gnd = self.original.ground_id()
+        V = dict(sol.node_voltages)
+        V[gnd] = 0.0
+        I: Dict[str, float] = {}
+
+        def walk(root):
+            stack = [root]
+            while stack:
+                e = stack.pop()
+                if e.kind == "R":
+                    r = e.resistor
+                    I[r.id] = (V[r.n1] - V[r.n2]) / r.R
+                    continue
+                if e.kind == "S":
+                    a, b = e.children
+                    i = (V[e.u] - V[e.v]) / e.R
+                    V[e.mid] = V[e.u] - i * a.R
+                stack.extend(e.children)
+
+        for e in self.edges.values():
+            walk(e)
+        # De la última eliminación a la primera: el vecino ya tiene voltaje
+        for node, neighbor, e in reversed(self.dangling):
+            V[node] = V[neighbor]
+            walk(e)
+        for rid in self.loops:
+            I[rid] = 0.0
+
+        I.update({cid: i for cid, i in sol.branch_currents.items() if cid not in self.edges})
+        node_ids = [nid for nid, n in self.original.nodes.items() if not n.is_ground]
+        node_pos = {nid: i for i, nid in enumerate(node_ids)}
+        comps = self.original.components
+        out = Solution(
+            node_voltages=ArrayMap(node_ids, np.array([V[nid] for nid in node_ids]), node_pos),
+            branch_currents=ArrayMap([c.id for c in comps], np.array([I[c.id] for c in comps])),
+            diode_states=dict(sol.diode_states),
+            checks={},
+            newton=sol.newton,
+            terminals=branch_terminals(comps, node_pos),
+        )
+        self.timings["backsub"] = time.perf_counter() - t0
+        return out
+
+
+def reduce_netlist(nl: Netlist) -> Optional[Reduction]:
+    """
+    Reduce la red de resistores de nl antes de resolver:
+
+    - paralelo: resistores entre el mismo par de nodos se unen;
+    - serie: un nodo interno con exactamente dos resistores se elimina
+      (estrella–malla de grado 2, sin relleno);
+    - colgantes: un nodo interno con un solo resistor se elimina (su
+      voltaje es el del vecino y la corriente es 0).
+
+    Los nodos de GND y los que tocan componentes que no son resistores
+    (fuentes, diodos, capacitores, inductores) se conservan. Cada fusión
+    puede habilitar otra, así que se itera con una cola de nodos.
+
+    Devuelve None si no hay nada que reducir, o si no quedaría ninguna
+    incógnita (circuito sin fuentes: todo se reduce a GND y la solución
+    es cero); en ambos casos se resuelve el netlist original.
+    """
+    t0 = time.perf_counter()
+    gnd = nl.ground_id()
+    protected = {gnd}
+    for c in nl.components:
+        if c.kind != "R":
+            protected.add(c.n1)
+            protected.add(c.n2)
+
+    adj: Dict[str, set] = {nid: set() for nid in nl.nodes}
+    between: Dict[tuple, _Edge] = {}
+    counts = {"parallel": 0, "series": 0, "dangling": 0}
+    loops = []
+
+    def key(a, b):
+        return (a, b) if a <= b else (b, a)
+
+    def add_edge(e):
+        k = key(e.u, e.v)
+        old = between.get(k)
+        if old is None:
+            between[k] = e
+            adj[e.u].add(e)
+            adj[e.v].add(e)
+            return
+        # Paralelo con la arista existente
+        counts["parallel"] += 1
+        remove_edge(old)
+        R = 1.0 / (1.0 / old.R + 1.0 / e.R)
+        children = (old.children if old.kind == "P" else [old]) + [e]
+        add_edge(_Edge(old.u, old.v, R, "P", children))
+
+    def remove_edge(e):
+        e.alive = False
+        adj[e.u].discard(e)
+        adj[e.v].discard(e)
+        del between[key(e.u, e.v)]
+
+    for c in nl.components:
+        if c.kind != "R":
+            continue
+        if c.n1 == c.n2:
+            loops.append(c.id)
+        else:
+            add_edge(_Edge(c.n1, c.n2, c.R, resistor=c))
+
+    dangling = []
+    removed = set()
+    queue = deque(nid for nid in nl.nodes if nid not in protected)
+    while queue:
+        x = queue.popleft()
+        if x in removed or x in protected:
+            continue
+        deg = len(adj[x])
+        if deg == 1:
+            (e,) = adj[x]
+            y = e.other(x)
+            remove_edge(e)
+            removed.add(x)
+            dangling.append((x, y, e))
+            counts["dangling"] += 1
+            queue.append(y)
+        elif deg == 2:
+            e1, e2 = adj[x]
+            a, b = e1.other(x), e2.other(x)
+            remove_edge(e1)
+            remove_edge(e2)
+            removed.add(x)
+            counts["series"] += 1
+            add_edge(_Edge(a, b, e1.R + e2.R, "S", (e1, e2), mid=x))
+            queue.append(a)
+            queue.append(b)
+
+    if not removed and not counts["parallel"] and not loops:
+        return None
+    if len(removed) == len(nl.nodes) - 1:
+        return None
+
+    red = Netlist()
+    for nid, node in nl.nodes.items():
+        if nid not in removed:
+            red.add_node(nid, is_ground=node.is_ground)
+    edges: Dict[str, _Edge] = {}
+    k = 0
+    for e in between.values():
+        if e.kind == "R":
+            rid = e.resistor.id
+        else:
+            k += 1
+            rid = f"{EQUIVALENT_PREFIX}{k}"
+        edges[rid] = e
+        red.add_component(Resistor(rid, e.u, e.v, e.R))
+    for c in nl.components:
+        if c.kind != "R":
+            red.add_component(c)
+
+    return Reduction(original=nl, netlist=red, edges=edges, dangling=dangling, loops=loops,
+                     counts=counts, timings={"reduce": time.perf_counter() - t0})
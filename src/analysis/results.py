@@ -1,8 +1,349 @@
-from dataclasses import dataclass, field
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass, field
+from typing import Optional
+
+import numpy as np
+
+
+class ArrayMap(Mapping):
+    """
+    Vista de solo lectura id -> float sobre un arreglo, sin copiarlo.
+
+    ids y array van alineados; el índice id -> posición se arma la
+    primera vez que se busca por id (o se comparte si se pasa index).
+    """
+    __slots__ = ("ids", "array", "_index")
+
+    def __init__(self, ids, array, index=None):
+        self.ids = ids
+        self.array = array
+        self._index = index
+
+    @classmethod
+    def from_dict(cls, d) -> "ArrayMap":
+        return cls(list(d), np.fromiter(d.values(), dtype=float, count=len(d)))
+
+    @property
+    def index(self) -> dict:
+        if self._index is None:
+            self._index = {k: i for i, k in enumerate(self.ids)}
+        return self._index
+
+    def __getitem__(self, key):
+        return float(self.array[self.index[key]])
+
+    def __contains__(self, key):
+        return key in self.index
+
+    def __iter__(self):
+        return iter(self.ids)
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __repr__(self) -> str:
+        return repr(dict(self))
+
+
+def branch_terminals(components, node_pos) -> np.ndarray:
+    """
+    (m, 2): posición en node_pos de los terminales de cada componente en
+    el sentido de su corriente (n1 → n2; ánodo → cátodo en los diodos),
+    con -1 para GND.
+    """
+    get = node_pos.get
+    m = len(components)
+    T = np.empty((m, 2), dtype=np.int64)
+    diode = ("D", "DS")
+    T[:, 0] = np.fromiter((get(c.anode if c.kind in diode else c.n1, -1) for c in components),
+                          dtype=np.int64, count=m)
+    T[:, 1] = np.fromiter((get(c.cathode if c.kind in diode else c.n2, -1) for c in components),
+                          dtype=np.int64, count=m)
+    return T
+
+
+@dataclass
+class SolveStats:
+    """
+    Registro barato de una simulación DC.
+
+    stages: segundos por etapa ("validate", "reduce", "decompose", "build",
+        "solve", "reconstruct", "expand", "checks", "total").
+    n, nnz: dimensión y no ceros del sistema que se resolvió (el nodal
+        reducido si se eliminaron fuentes; la suma si hubo bloques).
+    method: método que dio la solución: "solve" (LU), "lstsq", "svd",
+        "splu", "lsqr", "cg", "cholesky", "newton" o "diodes-<método>";
+        con bloques, los distintos métodos unidos por "+".
+    residual: ‖A·x - b‖₂ del sistema lineal (None con diodos).
+    condition: estimación de κ(A) (None si no se calculó; ver
+        LinearSolver.estimate_condition).
+    regularized: nodos flotantes en DC que se regularizaron (vacío = no).
+    """
+    stages: dict[str, float] = field(default_factory=dict)
+    n: int = 0
+    nnz: int = 0
+    sparse: bool = False
+    method: Optional[str] = None
+    residual: Optional[float] = None
+    condition: Optional[float] = None
+    regularized: list[str] = field(default_factory=list)
+
+    @classmethod
+    def combine(cls, parts) -> "SolveStats":
+        """
+        Estadísticas de varios bloques resueltos por separado. condition es
+        el peor de los bloques, o None si a alguno le falta la estimación
+        (un máximo parcial podría ocultar el bloque mal condicionado).
+        """
+        out = cls()
+        methods = []
+        residuals = []
+        conditions = []
+        for st in parts:
+            if st is None:
+                conditions.append(None)
+                continue
+            for k, t in st.stages.items():
+                out.stages[k] = out.stages.get(k, 0.0) + t
+            out.n += st.n
+            out.nnz += st.nnz
+            out.sparse = out.sparse or st.sparse
+            if st.method and st.method not in methods:
+                methods.append(st.method)
+            if st.residual is not None:
+                residuals.append(st.residual)
+            conditions.append(st.condition)
+            out.regularized.extend(st.regularized)
+        out.method = "+".join(methods) or None
+        if conditions and None not in conditions:
+            out.condition = max(conditions)
+        if residuals:
+            out.residual = float(np.sqrt(np.sum(np.square(residuals))))
+        return out
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+    def summary(self) -> str:
+        """Una línea legible, p. ej. para un log."""
+        parts = [f"n={self.n}", f"nnz={self.nnz}", f"método={self.method}"]
+        if self.residual is not None:
+            parts.append(f"residuo={self.residual:.2e}")
+        if self.condition is not None:
+            parts.append(f"κ≈{self.condition:.2e}")
+        if self.regularized:
+            parts.append(f"regularizados={len(self.regularized)}")
+        parts.append(" ".join(f"{k}={t * 1e3:.2f}ms" for k, t in self.stages.items()))
+        return " ".join(parts)
+
 
 @dataclass
 class Solution:
-    node_voltages: dict[str, float] = field(default_factory=dict)
-    branch_currents: dict[str, float] = field(default_factory=dict)
+    """
+    Solución DC respaldada por arreglos.
+
+    node_voltages y branch_currents son vistas ArrayMap (id -> float) sobre
+    los arreglos voltages y currents; los dicts que se pasen se convierten.
+    x es el vector crudo del sistema (si lo hubo) y terminals (m, 2) la
+    posición en voltages de los terminales de cada rama (-1 = GND), con
+    la que se calcula power.
+    """
+    node_voltages: Mapping = field(default_factory=dict)
+    branch_currents: Mapping = field(default_factory=dict)
     diode_states: dict[str, str] = field(default_factory=dict)
     checks: dict[str, dict] = field(default_factory=dict)
+    # Estadísticas de Newton–Raphson (solo con diodos Shockley)
+    newton: dict = field(default_factory=dict)
+    # Reducción serie/paralelo previa (solo con simulate(reduce=True))
+    reduction: dict = field(default_factory=dict)
+    # Tiempos por etapa, tamaño, método y diagnóstico numérico (ver SolveStats)
+    stats: Optional[SolveStats] = None
+    x: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+    terminals: Optional[np.ndarray] = field(default=None, repr=False, compare=False)
+
+    def __post_init__(self):
+        if not isinstance(self.node_voltages, ArrayMap):
+            self.node_voltages = ArrayMap.from_dict(self.node_voltages)
+        if not isinstance(self.branch_currents, ArrayMap):
+            self.branch_currents = ArrayMap.from_dict(self.branch_currents)
+
+    def __setstate__(self, state):
+        # Pickles anteriores a los arreglos: dicts planos y sin stats/x/terminals
+        for name in ("stats", "x", "terminals"):
+            state.setdefault(name, None)
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    @property
+    def voltages(self) -> np.ndarray:
+        """Voltajes alineados con node_ids (sin copiar)."""
+        return self.node_voltages.array
+
+    @property
+    def currents(self) -> np.ndarray:
+        """Corrientes alineadas con branch_ids (sin copiar)."""
+        return self.branch_currents.array
+
+    @property
+    def node_ids(self) -> list:
+        return self.node_voltages.ids
+
+    @property
+    def branch_ids(self) -> list:
+        return self.branch_currents.ids
+
+    @property
+    def node_index(self) -> dict:
+        return self.node_voltages.index
+
+    @property
+    def branch_index(self) -> dict:
+        return self.branch_currents.index
+
+    @property
+    def branch_voltages(self) -> Optional[np.ndarray]:
+        """Voltaje de cada rama en el sentido de su corriente (None sin terminals)."""
+        if self.terminals is None:
+            return None
+        Vz = np.append(self.voltages, 0.0)  # la posición -1 (GND) vale 0
+        return Vz[self.terminals[:, 0]] - Vz[self.terminals[:, 1]]
+
+    @property
+    def power(self) -> Optional[ArrayMap]:
+        """
+        Potencia absorbida por cada componente, v·i (negativa en las
+        fuentes que entregan energía). None si no hay terminals.
+        """
+        vb = self.branch_voltages
+        if vb is None:
+            return None
+        return ArrayMap(self.branch_ids, vb * self.currents, self.branch_currents._index)
+
+
+@dataclass
+class SweepResult:
+    """
+    Resultados de un barrido de K variantes, como arreglos.
+
+    node_voltages[k, i] es el voltaje de node_ids[i] en la variante k y
+    branch_currents[k, j] la corriente de branch_ids[j].
+    """
+    parameters: dict[str, np.ndarray]
+    node_ids: list[str]
+    branch_ids: list[str]
+    node_voltages: np.ndarray
+    branch_currents: np.ndarray
+
+    def __len__(self) -> int:
+        return self.node_voltages.shape[0]
+
+    def voltage(self, nid: str) -> np.ndarray:
+        """Voltaje de un nodo en todas las variantes (GND = 0)."""
+        if nid not in self.node_ids:
+            return np.zeros(len(self))
+        return self.node_voltages[:, self.node_ids.index(nid)]
+
+    def current(self, cid: str) -> np.ndarray:
+        """Corriente de un componente en todas las variantes."""
+        return self.branch_currents[:, self.branch_ids.index(cid)]
+
+
+@dataclass
+class MonteCarloResult:
+    """
+    Estadísticas de un análisis Monte Carlo.
+
+    voltage_stats y current_stats tienen las claves "mean", "std", "min",
+    "max" y "p<q>" (percentiles), cada una con un arreglo alineado con
+    node_ids o branch_ids. pass_counts cuenta, por cada límite, las
+    muestras que lo cumplen; yield_fraction es la fracción que cumple todos.
+    """
+    n_samples: int
+    seed: int | None
+    node_ids: list[str]
+    branch_ids: list[str]
+    voltage_stats: dict[str, np.ndarray]
+    current_stats: dict[str, np.ndarray]
+    limits: dict[str, tuple] = field(default_factory=dict)
+    pass_counts: dict[str, int] = field(default_factory=dict)
+    yield_fraction: float = 1.0
+
+    def summary(self, name: str) -> dict[str, float]:
+        """Estadísticas de un nodo (voltaje) o componente (corriente)."""
+        if name in self.node_ids:
+            stats, i = self.voltage_stats, self.node_ids.index(name)
+        else:
+            stats, i = self.current_stats, self.branch_ids.index(name)
+        return {k: float(v[i]) for k, v in stats.items()}
+
+
+@dataclass
+class TransientResult:
+    """
+    Formas de onda de un análisis transitorio.
+
+    data[k] es el vector de incógnitas en time[k] (voltajes de nodos,
+    corrientes de fuentes e inductores) seguido de las corrientes de los
+    capacitores; columns da la columna de cada etiqueta ("V(N1)", "I(C1)").
+    data puede ser un np.memmap si se pidió salida a disco.
+    """
+    time: np.ndarray
+    node_ids: list[str]
+    data: np.ndarray
+    columns: dict[str, int]
+    resistors: dict[str, tuple] = field(default_factory=dict)  # id -> (n1, n2, R)
+    method: str = "trap"
+
+    def __len__(self) -> int:
+        return len(self.time)
+
+    @property
+    def node_voltages(self) -> np.ndarray:
+        """Voltajes (N, n_nodos) alineados con node_ids (vista, sin copiar)."""
+        return self.data[:, :len(self.node_ids)]
+
+    def voltage(self, nid: str) -> np.ndarray:
+        """Voltaje de un nodo en todos los instantes (GND = 0)."""
+        col = self.columns.get(f"V({nid})")
+        return np.zeros(len(self)) if col is None else self.data[:, col]
+
+    def current(self, cid: str) -> np.ndarray:
+        """Corriente n1→n2 de un componente en todos los instantes."""
+        if cid in self.resistors:
+            n1, n2, R = self.resistors[cid]
+            return (self.voltage(n1) - self.voltage(n2)) / R
+        return self.data[:, self.columns[f"I({cid})"]]
+
+
+@dataclass
+class ACResult:
+    """
+    Respuesta en frecuencia: node_voltages[k, i] es el fasor del nodo
+    node_ids[i] a frequencies[k] (Hz).
+    """
+    frequencies: np.ndarray
+    node_ids: list[str]
+    node_voltages: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.frequencies)
+
+    @property
+    def magnitude(self) -> np.ndarray:
+        """|V| por frecuencia y nodo, forma (F, n_nodos)."""
+        return np.abs(self.node_voltages)
+
+    @property
+    def phase(self) -> np.ndarray:
+        """Fase en grados por frecuencia y nodo, forma (F, n_nodos)."""
+        return np.degrees(np.angle(self.node_voltages))
+
+    def voltage(self, nid: str) -> np.ndarray:
+        """Fasor de un nodo en todas las frecuencias (GND = 0)."""
+        if nid not in self.node_ids:
+            return np.zeros(len(self), dtype=complex)
+        return self.node_voltages[:, self.node_ids.index(nid)]
+
+    def magnitude_db(self, nid: str) -> np.ndarray:
+        """20·log10|V| de un nodo."""
+        return 20.0 * np.log10(np.abs(self.voltage(nid)))
@@ -1,7 +1,316 @@
+import logging
+import warnings
+from typing import Optional
+
 import numpy as np
 
+try:
+    import scipy.linalg as sla
+    import scipy.sparse as sp
+    import scipy.sparse.linalg as spla
+except ImportError:  # scipy es opcional: solo se usa en el modo disperso
+    sla = None
+    sp = None
+    spla = None
+
+logger = logging.getLogger(__name__)
+
+# Un pivote |u_kk| <= PIVOT_RTOL·max|u_ii| se considera nulo
+PIVOT_RTOL = 1e-14
+
+# Métodos de LinearSolver: "direct" (LU) o "cg" (gradiente conjugado
+# precondicionado, solo para matrices simétricas definidas positivas)
+SOLVER_METHODS = ("direct", "cg")
+PRECONDITIONERS = ("ic", "jacobi", "none")
+
+# Tolerancia por defecto de CG: ‖b - A·x‖ <= CG_TOL·‖b‖
+CG_TOL = 1e-10
+
+
+def _check_pivots(diag, columns, labels):
+    """
+    Revisa la diagonal de U; columns[k] es la incógnita del pivote k.
+    Lanza LinAlgError (con atributo pivot_info) si algún pivote es nulo.
+    """
+    d = np.abs(diag)
+    if not d.size:
+        return
+    scale = d.max()
+    k = int(np.argmin(d))
+    if scale == 0.0 or d[k] <= PIVOT_RTOL * scale:
+        col = int(columns[k])
+        label = labels[col] if labels is not None else f"x[{col}]"
+        err = np.linalg.LinAlgError(f"Pivote nulo en {label}")
+        err.pivot_info = {"column": col, "label": label, "pivot": float(d[k])}
+        raise err
+
+
+class Factorization:
+    """
+    Factorización LU reutilizable de A: se factoriza una vez y se resuelve
+    para tantos vectores b como se necesite.
+
+    column_order permite reutilizar el ordenamiento de columnas de una
+    factorización dispersa anterior con la misma estructura, evitando
+    recalcular COLAMD al refactorizar con valores nuevos.
+    """
+    def __init__(self, A, labels=None, column_order=None):
+        self.shape = A.shape
+        self.column_order = None
+        self._q = None  # permutación de columnas aplicada antes de splu
+        self.sparse = sp is not None and sp.issparse(A)
+        if self.sparse:
+            A = A.tocsc()
+            try:
+                if column_order is None:
+                    lu = spla.splu(A)
+                    # U está en el orden de columnas permutado: perm_c[i] es
+                    # la posición de la columna i de A
+                    column_order = np.argsort(lu.perm_c)
+                else:
+                    lu = spla.splu(A[:, column_order], permc_spec="NATURAL")
+                    self._q = column_order
+            except RuntimeError as e:  # factor exactamente singular
+                raise np.linalg.LinAlgError(str(e))
+            _check_pivots(lu.U.diagonal(), column_order, labels)
+            self.column_order = column_order
+            self._lu = lu
+        elif sla is not None:
+            with warnings.catch_warnings():
+                # El pivote nulo se reporta abajo con el nombre de la incógnita
+                warnings.simplefilter("ignore", sla.LinAlgWarning)
+                self._lu = sla.lu_factor(A, check_finite=False)
+            _check_pivots(np.diag(self._lu[0]), np.arange(A.shape[0]), labels)
+            # getrs de LAPACK directo: lu_solve valida argumentos en cada
+            # llamada, lo que domina en sistemas chicos resueltos muchas veces
+            self._getrs = sla.get_lapack_funcs("getrs", (self._lu[0],))
+        else:
+            # Sin scipy no hay LU reutilizable: se guarda A y se resuelve cada vez
+            self._lu = None
+            self._A = A
+
+    def solve(self, b):
+        if self.sparse:
+            y = self._lu.solve(np.asarray(b, dtype=self._lu.U.dtype))
+            if self._q is None:
+                return y
+            x = np.empty_like(y)
+            x[self._q] = y
+            return x
+        if self._lu is not None:
+            x, info = self._getrs(self._lu[0], self._lu[1], b)
+            if info != 0:
+                raise ValueError(f"getrs: argumento inválido ({info})")
+            return x
+        return np.linalg.solve(self._A, b)
+
+    def solve_transposed(self, b):
+        """Resuelve Aᵀ·x = b con la misma factorización."""
+        if self.sparse:
+            # A[:, q] = L·U  =>  Aᵀ·x = b  <=>  (L·U)ᵀ·x = b[q]
+            b = np.asarray(b, dtype=self._lu.U.dtype)
+            return self._lu.solve(b if self._q is None else b[self._q], trans="T")
+        if self._lu is not None:
+            x, info = self._getrs(self._lu[0], self._lu[1], b, trans=1)
+            if info != 0:
+                raise ValueError(f"getrs: argumento inválido ({info})")
+            return x
+        return np.linalg.solve(self._A.T, b)
+
+    def condition(self, A) -> Optional[float]:
+        """
+        Estimación del número de condición κ₁(A) = ‖A‖₁·‖A⁻¹‖₁ sin invertir:
+        gecon de LAPACK sobre el LU denso (O(n²)) o onenormest de Higham
+        con unas pocas sustituciones en el disperso.
+        """
+        if self.sparse:
+            op = spla.LinearOperator(self.shape, matvec=self.solve, rmatvec=self.solve_transposed,
+                                     dtype=float)
+            return float(spla.norm(A, 1) * spla.onenormest(op, t=1))
+        if self._lu is not None:
+            anorm = float(np.abs(A).sum(axis=0).max()) if A.size else 0.0
+            gecon = sla.get_lapack_funcs("gecon", (self._lu[0],))
+            rcond, info = gecon(self._lu[0], anorm, norm="1")
+            return float(1.0 / rcond) if info == 0 and rcond > 0 else float("inf")
+        return None
+
+
+def is_spd_candidate(A, rtol: float = 1e-12) -> bool:
+    """
+    Condición necesaria (y barata) para usar CG: A simétrica con diagonal
+    positiva. Una red de resistores a tierra sin fuentes de voltaje (o con
+    ellas eliminadas) la cumple y es además definida positiva.
+    """
+    if A.shape[0] != A.shape[1]:
+        return False
+    if sp is not None and sp.issparse(A):
+        A = A.tocsr()
+        diag = A.diagonal()
+        asym = abs(A - A.T)
+        gap = asym.max() if asym.nnz else 0.0
+        scale = abs(A).max() if A.nnz else 0.0
+    else:
+        A = np.asarray(A)
+        diag = np.diag(A)
+        gap = np.abs(A - A.T).max() if A.size else 0.0
+        scale = np.abs(A).max() if A.size else 0.0
+    return bool(np.all(diag > 0) and gap <= rtol * scale)
+
+
+class Preconditioner:
+    """
+    M⁻¹ para CG (M simétrica definida positiva).
+
+    "jacobi": inverso de la diagonal; una multiplicación por iteración.
+    "ic": Cholesky incompleta M = L·D·Lᵀ, con L y D tomados de un spilu
+        de A (orden NATURAL, sin pivoteo). Se usa solo L, no L·U: el ILU
+        con umbral de descarte no es simétrico y CG lo necesita. Reduce
+        las iteraciones a costa de dos sustituciones por iteración; si el
+        ILU falla, tiene pivotes no positivos o no hay scipy, se usa
+        "jacobi".
+    "none": identidad.
+    """
+    def __init__(self, A, kind: str = "ic", drop_tol: float = 1e-3, fill_factor: float = 3.0):
+        if kind not in PRECONDITIONERS:
+            raise ValueError(f"Precondicionador inválido: {kind}")
+        if kind == "ic" and (spla is None or not sp.issparse(A)):
+            kind = "jacobi"
+        self.kind = kind
+        self._L = None
+        self._d = None
+        self._dinv = None
+        if kind == "ic" and not self._incomplete_cholesky(A, drop_tol, fill_factor):
+            self.kind = kind = "jacobi"
+        if kind == "jacobi":
+            diag = A.diagonal() if sp is not None and sp.issparse(A) else np.diag(A)
+            self._dinv = 1.0 / diag
+
+    def _incomplete_cholesky(self, A, drop_tol, fill_factor) -> bool:
+        n = A.shape[0]
+        try:
+            ilu = spla.spilu(A.tocsc(), drop_tol=drop_tol, fill_factor=fill_factor,
+                             permc_spec="NATURAL", diag_pivot_thresh=0.0)
+            d = ilu.U.diagonal()
+            if np.any(ilu.perm_r != np.arange(n)) or not np.all(d > 0):
+                return False
+            # L triangular unitaria: su "LU" sin pivoteo es ella misma y
+            # deja resolver L·y = r y Lᵀ·z = y en C (solve y solve trans)
+            self._L = spla.splu(ilu.L.tocsc(), permc_spec="NATURAL", diag_pivot_thresh=0.0,
+                                options=dict(SymmetricMode=True))
+        except RuntimeError:
+            return False
+        if np.any(self._L.perm_r != np.arange(n)):
+            self._L = None
+            return False
+        self._d = d
+        return True
+
+    def apply(self, r: np.ndarray) -> np.ndarray:
+        if self._L is not None:
+            return self._L.solve(self._L.solve(r) / self._d, trans="T")
+        if self._dinv is not None:
+            return self._dinv * r
+        return r.copy()
+
+
+def conjugate_gradient(A, b, M: Optional[Preconditioner] = None, x0=None,
+                       tol: float = CG_TOL, max_iter: Optional[int] = None):
+    """
+    Gradiente conjugado precondicionado para A simétrica definida positiva.
+
+    Una multiplicación A·p y una aplicación de M⁻¹ por iteración; no forma
+    ni factoriza A (basta con que A @ v funcione). Se detiene cuando
+    ‖r‖ <= tol·‖b‖ o tras max_iter iteraciones (por defecto, n).
+
+    Returns:
+        (x, info) con info = {"iterations", "residual_history" (‖r_k‖/‖b‖,
+        k = 0..iterations), "converged", "preconditioner"}
+    """
+    b = np.asarray(b, dtype=float)
+    n = b.shape[0]
+    max_iter = n if max_iter is None else max_iter
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float)
+    r = b - A @ x if x0 is not None else b.copy()
+    bnorm = np.linalg.norm(b)
+    info = {"iterations": 0, "residual_history": [], "converged": False,
+            "preconditioner": M.kind if M is not None else "none"}
+    if bnorm == 0.0:
+        info["residual_history"].append(0.0)
+        info["converged"] = True
+        return np.zeros(n), info
+
+    history = info["residual_history"]
+    rel = np.linalg.norm(r) / bnorm
+    history.append(rel)
+    z = M.apply(r) if M is not None else r.copy()
+    p = z.copy()
+    rz = r @ z
+    k = 0
+    while rel > tol and k < max_iter:
+        Ap = A @ p
+        pAp = p @ Ap
+        if pAp <= 0.0:
+            raise np.linalg.LinAlgError(
+                "CG: la matriz no es definida positiva (pᵀ·A·p <= 0)"
+            )
+        alpha = rz / pAp
+        x += alpha * p
+        r -= alpha * Ap
+        k += 1
+        rel = np.linalg.norm(r) / bnorm
+        history.append(rel)
+        if rel <= tol:
+            break
+        z = M.apply(r) if M is not None else r
+        rz_new = r @ z
+        p *= rz_new / rz
+        p += z
+        rz = rz_new
+    info["iterations"] = k
+    info["converged"] = rel <= tol
+    return x, info
+
+
 class LinearSolver:
-    def solve(self, A, b):
+    """
+    Solucionador de A·x = b.
+
+    method="direct" (por defecto) usa LU con respaldos de mínimos
+    cuadrados. method="cg" usa gradiente conjugado precondicionado
+    (preconditioner "jacobi", "ic" o "none") para sistemas simétricos
+    definidos positivos enormes, p. ej. mallas de resistores con 10⁵–10⁶
+    nodos donde un LU no cabe en memoria; si A no es simétrica con
+    diagonal positiva (MNA con filas de fuentes) se usa el método directo.
+    Tras cada solve con CG, cg_info tiene iteraciones, historia del
+    residuo relativo y si convergió.
+
+    Cada solve deja en method_used el método que dio la solución
+    ("solve", "lstsq", "svd", "splu", "lsqr" o "cg") y en condition una
+    estimación de κ₁(A). estimate_condition: None la calcula solo en el
+    caso denso (gecon, O(n²) sobre el LU ya hecho), True también en el
+    disperso (unas pocas sustituciones más) y False nunca.
+    """
+    def __init__(self, method: str = "direct", tol: float = CG_TOL,
+                 max_iter: Optional[int] = None, preconditioner: str = "jacobi",
+                 estimate_condition: Optional[bool] = None):
+        if method not in SOLVER_METHODS:
+            raise ValueError(f"Método de solución inválido: {method}")
+        if preconditioner not in PRECONDITIONERS:
+            raise ValueError(f"Precondicionador inválido: {preconditioner}")
+        self.method = method
+        self.tol = tol
+        self.max_iter = max_iter
+        self.preconditioner = preconditioner
+        # Información del último pivote nulo detectado (o None)
+        self.pivot_info = None
+        # Estadísticas del último solve con CG (o None)
+        self.cg_info = None
+        self.estimate_condition = estimate_condition
+        # Método que resolvió el último sistema y κ₁(A) estimado (o None)
+        self.method_used = None
+        self.condition = None
+
+    def solve(self, A, b, labels=None):
         """
         Resuelve el sistema lineal A·x = b
         
@@ -9,28 +318,58 @@ class LinearSolver:
         1. numpy.linalg.solve (método directo)
         2. numpy.linalg.lstsq (mínimos cuadrados, más robusto)
         3. SVD para sistemas mal condicionados
+
+        Si A es una matriz dispersa de scipy se usa LU disperso (splu)
+        y, como respaldo, mínimos cuadrados iterativo (lsqr).
+
+        La factorización LU del método 1 es la única que se calcula: sus
+        pivotes sirven para diagnosticar la singularidad. labels (opcional)
+        nombra cada incógnita para los mensajes, p. ej. Meta.unknown_labels().
         """
+        self.pivot_info = None
+        self.cg_info = None
+        self.method_used = None
+        self.condition = None
+        if self.method == "cg":
+            if is_spd_candidate(A):
+                return self.solve_cg(A, b)
+            logger.warning("La matriz no es simétrica con diagonal positiva, "
+                           "se usa el método directo en lugar de CG")
+        if sp is not None and sp.issparse(A):
+            return self._solve_sparse(A, b, labels)
+
         try:
-            # Método 1: Resolver directamente
-            x = np.linalg.solve(A, b)
+            # Método 1: Resolver directamente (LU con pivoteo parcial)
+            factor = Factorization(A, labels=labels)
+            x = factor.solve(b)
             
             # Verificar que la solución sea válida
             residual = np.linalg.norm(A @ x - b)
             if residual > 1e-6:
-                print(f"Advertencia: residual alto ({residual}), intentando método alternativo")
+                logger.warning("Residual alto (%g), intentando método alternativo", residual)
                 raise np.linalg.LinAlgError("Residual alto")
-                
+
+            self.method_used = "solve"
+            if self.estimate_condition is not False:
+                self.condition = factor.condition(A)
             return x
             
-        except np.linalg.LinAlgError:
+        except np.linalg.LinAlgError as e:
             # Método 2: Mínimos cuadrados (más robusto)
+            self.pivot_info = getattr(e, "pivot_info", None)
+            if self.pivot_info is not None:
+                logger.warning("Pivote nulo en %s, se usa mínimos cuadrados",
+                               self.pivot_info["label"])
             try:
                 x, residuals, rank, s = np.linalg.lstsq(A, b, rcond=None)
                 
                 # Verificar el rango de la matriz
                 if rank < min(A.shape):
-                    print(f"Advertencia: matriz con rango deficiente ({rank}/{min(A.shape)})")
-                
+                    logger.warning("Matriz con rango deficiente (%d/%d)", rank, min(A.shape))
+
+                self.method_used = "lstsq"
+                # Los valores singulares ya están calculados: κ₂ exacto
+                self.condition = float(s[0] / s[-1]) if s.size and s[-1] > 0 else float("inf")
                 return x
                 
             except Exception as e:
@@ -44,11 +383,70 @@ class LinearSolver:
                     
                     # Resolver usando SVD
                     x = Vt.T @ np.diag(s_inv) @ U.T @ b
-                    
+
+                    self.method_used = "svd"
+                    self.condition = float(s[0] / s[-1]) if s.size and s[-1] > 0 else float("inf")
                     return x
                     
                 except Exception as e2:
                     raise ValueError(
                         f"No se pudo resolver el sistema de ecuaciones. "
                         f"El circuito puede tener un error de diseño: {e2}"
-                    )
\ No newline at end of file
+                    )
+
+    def solve_cg(self, A, b, x0=None):
+        """
+        CG precondicionado sobre A (SPD, sin comprobarlo). Lanza ValueError
+        si no converge en max_iter iteraciones.
+        """
+        if sp is not None and sp.issparse(A):
+            A = A.tocsr()
+        M = None if self.preconditioner == "none" else Preconditioner(A, self.preconditioner)
+        try:
+            x, self.cg_info = conjugate_gradient(A, b, M=M, x0=x0, tol=self.tol,
+                                                 max_iter=self.max_iter)
+        except np.linalg.LinAlgError as e:
+            raise ValueError(f"No se pudo resolver el sistema con CG: {e}")
+        if not self.cg_info["converged"]:
+            raise ValueError(
+                f"CG no convergió en {self.cg_info['iterations']} iteraciones "
+                f"(residuo relativo {self.cg_info['residual_history'][-1]:.3e}, "
+                f"tolerancia {self.tol:.1e})"
+            )
+        self.method_used = "cg"
+        return x
+
+    def factorize(self, A, labels=None, column_order=None):
+        """Devuelve una Factorization reutilizable de A."""
+        return Factorization(A, labels=labels, column_order=column_order)
+
+    def _solve_sparse(self, A, b, labels=None):
+        """Resuelve A·x = b con A dispersa sin convertirla a densa."""
+        A = A.tocsc()
+        try:
+            factor = Factorization(A, labels=labels)
+            x = factor.solve(b)
+            residual = np.linalg.norm(A @ x - b)
+            if not np.all(np.isfinite(x)) or residual > 1e-6:
+                logger.warning("Residual alto (%g), intentando método alternativo", residual)
+                raise np.linalg.LinAlgError("Residual alto")
+            self.method_used = "splu"
+            if self.estimate_condition:
+                self.condition = factor.condition(A)
+            return x
+        except np.linalg.LinAlgError as e:
+            # Respaldo: mínimos cuadrados iterativo, no requiere factorizar
+            self.pivot_info = getattr(e, "pivot_info", None)
+            if self.pivot_info is not None:
+                logger.warning("Pivote nulo en %s, se usa mínimos cuadrados",
+                               self.pivot_info["label"])
+            try:
+                out = spla.lsqr(A, b, atol=1e-14, btol=1e-14)
+                self.method_used = "lsqr"
+                self.condition = float(out[6])  # acond: estimación de κ₂
+                return out[0]
+            except Exception as e2:
+                raise ValueError(
+                    f"No se pudo resolver el sistema de ecuaciones. "
+                    f"El circuito puede tener un error de diseño: {e2}"
+                )
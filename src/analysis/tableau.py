@@ -1,50 +1,482 @@
 import numpy as np
-from typing import Tuple
+from typing import Optional, Tuple
 from ..domain.netlist import Netlist
-from ..domain.components.resistor import Resistor
-from ..domain.components.vsource import VSource
+from ..domain.compact import CompactNetlist, R as _R, V as _V, D as _D, L as _L
+from .ordering import NodeOrdering, order_nodes
+from .topology import Diagnosis, diagnose
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy es opcional: solo se usa en el modo disperso
+    sp = None
+
+# A partir de este número de incógnitas se ensambla en formato disperso (CSR)
+# si scipy está disponible y no se pidió explícitamente un modo.
+SPARSE_MIN_SIZE = 500
+
+# Regularización que se suma a la diagonal de los nodos flotantes
+EPSILON = 1e-10
+
+# Conductancia de fuga de un diodo ideal en OFF (como GMIN en SPICE): mantiene
+# definidos los nodos a los que solo se llega a través de diodos
+GMIN = 1e-12
 
 
 class Meta:
     """
     Guarda metadatos de simulación: índices de nodos, componentes, etc.
     """
-    def __init__(self, node_index, components, vsource_indices):
+    def __init__(self, node_index, components, vsource_indices, regularized=None, pattern=None,
+                 diode_indices=None, inductor_indices=None, ordering=None, compact=None):
         self.node_index = node_index
         self.components = components
         self.vsource_indices = vsource_indices
+        # Corriente ánodo→cátodo de cada diodo ideal (después de las fuentes)
+        self.diode_indices = dict(diode_indices or {})
+        # Corriente n1→n2 de cada inductor (después de los diodos)
+        self.inductor_indices = dict(inductor_indices or {})
+        # Nodos flotantes a los que se sumó EPSILON en la diagonal
+        self.regularized = list(regularized or [])
+        # Posiciones de estampado (StampPattern) para re-ensamblar sin reconstruir
+        self.pattern = pattern
+        # Ordenamiento de nodos aplicado antes de estampar (NodeOrdering o
+        # None = orden del netlist). node_index ya está en el orden nuevo.
+        self.ordering: Optional[NodeOrdering] = ordering
+        # CompactNetlist de origen (o None): la reconstrucción usa sus arreglos
+        self.compact: Optional[CompactNetlist] = compact
+        # Diodos Shockley: parte no lineal que resuelve analysis.newton
+        if compact is not None:
+            self.shockley = [components[k] for k in sorted(compact.shockley)]
+        else:
+            self.shockley = [c for c in components if c.kind == "DS"]
+        # Índices de reconstrucción (ver _solution_layout), al primer uso
+        self._layout = None
+        # Diagnóstico topológico del netlist (topology.Diagnosis), si se hizo
+        self.diagnosis = None
+
+    def unknown_labels(self):
+        """Nombre de cada incógnita del sistema, en orden de columna."""
+        labels = [""] * (len(self.node_index) + len(self.vsource_indices)
+                         + len(self.diode_indices) + len(self.inductor_indices))
+        for nid, i in self.node_index.items():
+            labels[i] = f"V({nid})"
+        for cid, i in self.vsource_indices.items():
+            labels[i] = f"I({cid})"
+        for cid, i in self.diode_indices.items():
+            labels[i] = f"I({cid})"
+        for cid, i in self.inductor_indices.items():
+            labels[i] = f"I({cid})"
+        return labels
+
+    def _solution_layout(self):
+        """
+        Índices fijos para reconstruir soluciones: dependen solo de la
+        topología, así que se calculan una vez por sistema.
+        """
+        if self._layout is None and self.compact is not None:
+            self._layout = self._compact_layout()
+        if self._layout is None:
+            from .results import branch_terminals
+
+            # Voltajes en el orden del netlist aunque la matriz esté reordenada
+            order = self.ordering.original if self.ordering is not None else self.node_index
+            node_ids = list(order)
+            node_pos = {nid: i for i, nid in enumerate(node_ids)}
+            cols = {**self.vsource_indices, **self.diode_indices, **self.inductor_indices}
+            res_pos, col_pos, col_idx, shockley_pos = [], [], [], []
+            res_values = []
+            for k, c in enumerate(self.components):
+                if c.kind == "R":
+                    res_pos.append(k)
+                    res_values.append(c.R)
+                elif c.id in cols:
+                    # Fuentes, diodos ideales e inductores: su variable de corriente
+                    col_pos.append(k)
+                    col_idx.append(cols[c.id])
+                elif c.kind == "DS":
+                    shockley_pos.append(k)
+                # Capacitores (y fuentes sin columna): 0, circuito abierto en DC
+            self._layout = {
+                "node_ids": node_ids,
+                "node_pos": node_pos,
+                "node_rows": np.array([self.node_index[nid] for nid in node_ids], dtype=np.int64),
+                "branch_ids": [c.id for c in self.components],
+                "terminals": branch_terminals(self.components, node_pos),
+                "res_pos": np.array(res_pos, dtype=np.int64),
+                "res_values": np.array(res_values, dtype=float),
+                "col_pos": np.array(col_pos, dtype=np.int64),
+                "col_idx": np.array(col_idx, dtype=np.int64),
+                "shockley_pos": shockley_pos,
+            }
+        return self._layout
 
-    def reconstruct_solution(self, x):
+    def _compact_layout(self):
+        """_solution_layout a partir de los arreglos de un CompactNetlist."""
+        cn = self.compact
+        order = self.ordering.original if self.ordering is not None else self.node_index
+        node_ids = list(order)
+        # Nodo entero -> posición en voltages (-1 = GND)
+        pos_of = np.full(len(cn.node_names) + 1, -1, dtype=np.int64)
+        node_num = np.fromiter((cn.node_index[nid] for nid in node_ids), dtype=np.int64,
+                               count=len(node_ids))
+        pos_of[node_num] = np.arange(len(node_ids))
+        # Columnas asignadas en el orden de los componentes (ver build_system)
+        cols = np.full(len(cn), -1, dtype=np.int64)
+        for code, indices in ((_V, self.vsource_indices), (_D, self.diode_indices),
+                              (_L, self.inductor_indices)):
+            cols[cn.kind == code] = list(indices.values())
+        res_pos = np.flatnonzero(cn.kind == _R)
+        col_pos = np.flatnonzero(cols >= 0)
+        return {
+            "node_ids": node_ids,
+            "node_pos": None,
+            "node_rows": np.fromiter((self.node_index[nid] for nid in node_ids), dtype=np.int64,
+                                     count=len(node_ids)),
+            "branch_ids": cn.ids,
+            "terminals": pos_of[cn.terminals()],
+            "res_pos": res_pos,
+            "res_values": cn.value[res_pos],
+            "col_pos": col_pos,
+            "col_idx": cols[col_pos],
+            "shockley_pos": sorted(cn.shockley),
+        }
+
+    def set_resistances(self, values) -> None:
+        """
+        Actualiza los R que usa reconstruct_solution ({id: ohmios}) cuando
+        CompiledCircuit cambia valores sin reconstruir el Meta.
+        """
+        if self._layout is None:
+            return  # el layout se arma con los valores vigentes al primer uso
+        lay = self._layout
+        if "res_of" not in lay:
+            ids = lay["branch_ids"]
+            lay["res_of"] = {ids[k]: j for j, k in enumerate(lay["res_pos"].tolist())}
+        for cid, R in values.items():
+            lay["res_values"][lay["res_of"][cid]] = R
+
+    def reconstruct_solution(self, x, diode_states=None):
         """
         Reconstruye un objeto Solution con voltajes e intensidades.
+
+        Todo se calcula sobre arreglos: los dicts de la Solution son vistas.
+        diode_states: {"D1": "ON"/"OFF"} del motor de diodos, si lo hay.
+        """
+        from .results import ArrayMap, Solution
+
+        lay = self._solution_layout()
+        x = np.asarray(x, dtype=float)
+        V = x[lay["node_rows"]]
+        T = lay["terminals"]
+        Vz = np.append(V, 0.0)  # GND = 0
+        dv = Vz[T[:, 0]] - Vz[T[:, 1]]
+
+        I = np.zeros(len(T))
+        res_pos = lay["res_pos"]
+        if len(res_pos):
+            # Ley de Ohm con los R del layout (ver set_resistances)
+            I[res_pos] = dv[res_pos] / lay["res_values"]
+        I[lay["col_pos"]] = x[lay["col_idx"]]
+        for k in lay["shockley_pos"]:
+            I[k] = self.components[k].current(dv[k])
+
+        return Solution(node_voltages=ArrayMap(lay["node_ids"], V, lay["node_pos"]),
+                        branch_currents=ArrayMap(lay["branch_ids"], I),
+                        diode_states=dict(diode_states or {}), checks={},
+                        x=x, terminals=T)
+
+
+class StampPattern:
+    """
+    Posiciones de estampado MNA de un netlist, independientes de los valores.
+
+    Cada entrada k de la matriz vale coef[k]·p[slot[k]] (o coef[k] si
+    slot[k] == -1), donde p es el vector de parámetros de los componentes:
+    conductancia 1/R para resistores y voltaje V para fuentes. Las entradas
+    repetidas (mismo fila/col) se suman al ensamblar. Así, cambiar valores
+    solo reescribe números; la estructura se calcula una vez.
+    """
+    def __init__(self, nl: Netlist, node_index, vsource_indices, diode_indices=None,
+                 inductor_indices=None):
+        diode_indices = diode_indices or {}
+        inductor_indices = inductor_indices or {}
+        self.n = len(node_index) + len(vsource_indices) + len(diode_indices) + len(inductor_indices)
+        self._structure = None
+        if isinstance(nl, CompactNetlist):
+            self._stamp_compact(nl, node_index, vsource_indices, diode_indices, inductor_indices)
+            return
+        self.comp_ids = []        # id del componente de cada slot
+        self.kinds = []           # "R" o "V" por slot
+        self.slot_of = {}         # id -> slot
+        # Terminales de cada slot como índice en x (-1 = GND) y columna de
+        # la corriente de las fuentes (-1 para resistores)
+        self.n1_idx, self.n2_idx, self.branch_col = [], [], []
+        params = []
+        rows, cols, coef, slot = [], [], [], []
+        b_rows, b_slots = [], []
+
+        def add(i, j, c, k):
+            rows.append(i)
+            cols.append(j)
+            coef.append(c)
+            slot.append(k)
+
+        for c in nl.components:
+            if c.kind == "R":
+                if c.R <= 0:
+                    raise ValueError(f"Resistor {c.id} tiene valor inválido: {c.R}")
+                # GND no tiene fila ni columna (node_index no lo incluye)
+                i = node_index.get(c.n1)
+                j = node_index.get(c.n2)
+                k = self._new_slot(c, params, 1.0 / c.R, i, j, -1)  # conductancia
+                if i is not None:
+                    add(i, i, 1.0, k)
+                if j is not None:
+                    add(j, j, 1.0, k)
+                if i is not None and j is not None:
+                    add(i, j, -1.0, k)
+                    add(j, i, -1.0, k)
+
+            elif c.kind == "V":
+                # Corriente de la fuente: sale por n1, entra por n2
+                # Ecuación de la fuente: V_n1 - V_n2 = V_source
+                row = vsource_indices[c.id]
+                i = node_index.get(c.n1)
+                j = node_index.get(c.n2)
+                k = self._new_slot(c, params, c.V, i, j, row)
+                if i is not None:
+                    add(i, row, 1.0, -1)
+                    add(row, i, 1.0, -1)
+                if j is not None:
+                    add(j, row, -1.0, -1)
+                    add(row, j, -1.0, -1)
+                b_rows.append(row)
+                b_slots.append(k)
+
+            elif c.kind == "D":
+                # Estado base OFF: i_d - GMIN·(V_a - V_k) = 0. La corriente
+                # i_d sale del ánodo y entra al cátodo. El motor de diodos
+                # cambia esta fila por V_a - V_k = 0 cuando el diodo conduce.
+                row = diode_indices[c.id]
+                i = node_index.get(c.anode)
+                j = node_index.get(c.cathode)
+                add(row, row, 1.0, -1)
+                if i is not None:
+                    add(i, row, 1.0, -1)
+                    add(row, i, -GMIN, -1)
+                if j is not None:
+                    add(j, row, -1.0, -1)
+                    add(row, j, GMIN, -1)
+
+            elif c.kind == "L":
+                # En DC es un cortocircuito: fuente de 0 V con su corriente
+                # n1→n2 como incógnita (V_n1 - V_n2 = 0). El transitorio
+                # agrega -L/h·i_L en la diagonal de esta fila.
+                row = inductor_indices[c.id]
+                i = node_index.get(c.n1)
+                j = node_index.get(c.n2)
+                if i is not None:
+                    add(i, row, 1.0, -1)
+                    add(row, i, 1.0, -1)
+                if j is not None:
+                    add(j, row, -1.0, -1)
+                    add(row, j, -1.0, -1)
+
+        self.values = np.asarray(params, dtype=float)
+        self.rows = np.asarray(rows, dtype=np.int64)
+        self.cols = np.asarray(cols, dtype=np.int64)
+        self.coef = np.asarray(coef, dtype=float)
+        self.slot = np.asarray(slot, dtype=np.int64)
+        self.b_rows = np.asarray(b_rows, dtype=np.int64)
+        self.b_slots = np.asarray(b_slots, dtype=np.int64)
+        self.n1_idx = np.asarray(self.n1_idx, dtype=np.int64)
+        self.n2_idx = np.asarray(self.n2_idx, dtype=np.int64)
+        self.branch_col = np.asarray(self.branch_col, dtype=np.int64)
+        self.is_resistor = np.array([k == "R" for k in self.kinds], dtype=bool)
+        self._structure = None
+
+    def _stamp_compact(self, cn: CompactNetlist, node_index, vsource_indices, diode_indices,
+                       inductor_indices):
+        """Las mismas entradas que el recorrido por componentes, vectorizadas."""
+        # Nodo entero -> fila (-1 = GND)
+        row_of = np.full(len(cn.node_names), -1, dtype=np.int64)
+        for nid, i in node_index.items():
+            row_of[cn.node_index[nid]] = i
+        T = cn.terminals()
+        a, b = row_of[T[:, 0]], row_of[T[:, 1]]
+        # Columna de la corriente de fuentes, diodos e inductores (en orden
+        # de componentes, como las asigna build_system)
+        col = np.full(len(cn), -1, dtype=np.int64)
+        for code, indices in ((_V, vsource_indices), (_D, diode_indices), (_L, inductor_indices)):
+            col[cn.kind == code] = list(indices.values())
+
+        is_r = cn.kind == _R
+        bad = np.flatnonzero(is_r & ~(cn.value > 0))
+        if len(bad):
+            k = bad[0]
+            raise ValueError(f"Resistor {cn.ids[k]} tiene valor inválido: {cn.value[k]}")
+
+        # Un slot por resistor y fuente, en orden de componentes
+        slots = np.flatnonzero(is_r | (cn.kind == _V))
+        slot_no = np.full(len(cn), -1, dtype=np.int64)
+        slot_no[slots] = np.arange(len(slots))
+        self.comp_ids = [cn.ids[k] for k in slots.tolist()]
+        self.kinds = ["R" if r else "V" for r in is_r[slots].tolist()]
+        self.slot_of = {cid: k for k, cid in enumerate(self.comp_ids)}
+        self.n1_idx, self.n2_idx, self.branch_col = a[slots], b[slots], col[slots]
+        self.is_resistor = is_r[slots]
+        self.values = np.where(self.is_resistor, 1.0 / np.where(self.is_resistor, cn.value[slots], 1.0),
+                               cn.value[slots])
+
+        parts = []
+
+        def add(mask, i, j, c, k):
+            parts.append((i[mask], j[mask], np.full(mask.sum(), c), k[mask]))
+
+        none = np.full(len(cn), -1, dtype=np.int64)
+        ga, gb = a >= 0, b >= 0
+        # Resistores: conductancia del slot en las cuatro posiciones
+        add(is_r & ga, a, a, 1.0, slot_no)
+        add(is_r & gb, b, b, 1.0, slot_no)
+        add(is_r & ga & gb, a, b, -1.0, slot_no)
+        add(is_r & ga & gb, b, a, -1.0, slot_no)
+        # Fuentes e inductores: ±1 entre nodos y fila de rama
+        vl = (cn.kind == _V) | (cn.kind == _L)
+        add(vl & ga, a, col, 1.0, none)
+        add(vl & ga, col, a, 1.0, none)
+        add(vl & gb, b, col, -1.0, none)
+        add(vl & gb, col, b, -1.0, none)
+        # Diodos ideales en OFF (ver el recorrido por componentes)
+        d = cn.kind == _D
+        add(d, col, col, 1.0, none)
+        add(d & ga, a, col, 1.0, none)
+        add(d & ga, col, a, -GMIN, none)
+        add(d & gb, b, col, -1.0, none)
+        add(d & gb, col, b, GMIN, none)
+
+        self.rows = np.concatenate([p[0] for p in parts])
+        self.cols = np.concatenate([p[1] for p in parts])
+        self.coef = np.concatenate([p[2] for p in parts])
+        self.slot = np.concatenate([p[3] for p in parts])
+        is_v = ~self.is_resistor
+        self.b_rows = self.branch_col[is_v]
+        self.b_slots = np.flatnonzero(is_v)
+
+    def _new_slot(self, c, params, value, i, j, col):
+        self.slot_of[c.id] = len(self.comp_ids)
+        self.comp_ids.append(c.id)
+        self.kinds.append(c.kind)
+        self.n1_idx.append(-1 if i is None else i)
+        self.n2_idx.append(-1 if j is None else j)
+        self.branch_col.append(col)
+        params.append(value)
+        return self.slot_of[c.id]
+
+    def add_constant(self, rows, cols, value):
+        """Agrega entradas que no dependen de ningún parámetro."""
+        rows = np.asarray(rows, dtype=np.int64)
+        self.rows = np.concatenate([self.rows, rows])
+        self.cols = np.concatenate([self.cols, np.asarray(cols, dtype=np.int64)])
+        self.coef = np.concatenate([self.coef, np.full(len(rows), float(value))])
+        self.slot = np.concatenate([self.slot, np.full(len(rows), -1, dtype=np.int64)])
+        self._structure = None
+
+    def param_value(self, cid, value):
         """
-        from .results import Solution
+        Convierte el valor de usuario (R o V) al parámetro del slot.
+        Acepta escalares o arreglos (para lotes).
+        """
+        k = self.slot_of[cid]
+        value = np.asarray(value, dtype=float)
+        if self.kinds[k] == "R":
+            if not np.all(value > 0):
+                raise ValueError(f"Resistor {cid} tiene valor inválido: {value[~(value > 0)].ravel()[0]}")
+            value = 1.0 / value
+        return value if value.ndim else float(value)
+
+    def entry_values(self, p):
+        """Valores de las entradas COO; p puede ser (m,) o un lote (K, m)."""
+        p = np.asarray(p, dtype=float)
+        scale = p[..., np.maximum(self.slot, 0)]
+        return self.coef * np.where(self.slot >= 0, scale, 1.0)
 
-        # Los primeros valores son voltajes de nodos
-        n = len(self.node_index)
-        V = {nid: float(x[idx]) for nid, idx in self.node_index.items()}
-        
-        # Los siguientes valores son corrientes de fuentes de voltaje
-        I = {}
+    def rhs(self, p):
+        """Vector b (o lote de vectores b) para los parámetros p."""
+        p = np.asarray(p, dtype=float)
+        b = np.zeros(p.shape[:-1] + (self.n,), dtype=float)
+        b[..., self.b_rows] = p[..., self.b_slots]
+        return b
 
-        def v(nid):
-            return V.get(nid, 0.0)  # GND = 0
+    def branch_currents(self, x, p):
+        """
+        Corriente de cada slot (mismo orden que comp_ids) a partir de la
+        solución x; admite lotes x (K, n) con parámetros p (K, m).
+        Resistores: g·(V_n1 - V_n2). Fuentes: su variable de corriente.
+        """
+        # Columna extra en cero: el índice -1 (GND) apunta a ella
+        xz = np.concatenate([x, np.zeros(x.shape[:-1] + (1,))], axis=-1)
+        dv = xz[..., self.n1_idx] - xz[..., self.n2_idx]
+        return np.where(self.is_resistor, np.asarray(p) * dv, xz[..., self.branch_col])
+
+    def structure(self):
+        """
+        Estructura CSR (posiciones únicas fila-major) y el mapa de cada
+        entrada COO a su posición; se calcula una sola vez.
+        """
+        if self._structure is None:
+            n = self.n
+            keys = self.rows * n + self.cols
+            uniq, inv = np.unique(keys, return_inverse=True)
+            indptr = np.searchsorted(uniq // n, np.arange(n + 1))
+            self._structure = (uniq, inv.ravel(), uniq % n, indptr)
+        return self._structure
 
-        # Corrientes en resistores (Ley de Ohm)
-        for c in self.components:
-            if isinstance(c, Resistor):
-                I[c.id] = (v(c.n1) - v(c.n2)) / c.R
-            elif isinstance(c, VSource):
-                # La corriente de la fuente está en las variables extra
-                if c.id in self.vsource_indices:
-                    I[c.id] = float(x[self.vsource_indices[c.id]])
-                else:
-                    I[c.id] = 0.0
+    def assemble(self, vals, sparse: bool):
+        """Suma las entradas COO en una matriz CSR o densa."""
+        uniq, inv, indices, indptr = self.structure()
+        data = np.bincount(inv, weights=vals, minlength=len(uniq))
+        if sparse:
+            return sp.csr_matrix((data, indices, indptr), shape=(self.n, self.n))
+        A = np.zeros(self.n * self.n, dtype=float)
+        A[uniq] = data
+        return A.reshape(self.n, self.n)
 
-        return Solution(node_voltages=V, branch_currents=I, diode_states={}, checks={})
+    def assemble_batch(self, vals) -> np.ndarray:
+        """Apila K matrices densas (K, n, n) a partir de vals (K, nnz)."""
+        uniq, inv, _, _ = self.structure()
+        K = vals.shape[0]
+        A = np.zeros((K, self.n * self.n), dtype=vals.dtype)
+        if len(inv):
+            # Suma por grupos de entradas repetidas, vectorizada sobre K
+            order = np.argsort(inv, kind="stable")
+            starts = np.flatnonzero(np.r_[True, np.diff(inv[order]) != 0])
+            A[:, uniq] = np.add.reduceat(vals[:, order], starts, axis=1)
+        return A.reshape(K, self.n, self.n)
 
 
-def build_system(nl: Netlist) -> Tuple[np.ndarray, np.ndarray, Meta]:
+def reactive_connected(nl: Netlist, meta: Meta):
+    """
+    Índices de los nodos regularizados en DC que sí tienen camino a GND a
+    través de capacitores o inductores: en el transitorio y en AC ya no
+    están flotantes y su EPSILON de la diagonal debe quitarse.
+    """
+    if not meta.regularized:
+        return []
+    diag = meta.diagnosis if meta.diagnosis is not None else diagnose(nl)
+    # Sin camino a GND ni por capacitores: siguen flotantes
+    loose = set(diag.disconnected)
+    return [meta.node_index[nid] for nid in meta.regularized if nid not in loose]
+
+
+def _ids_of(nl, kind: str) -> list:
+    """Ids de los componentes de tipo kind, en orden del netlist."""
+    if isinstance(nl, CompactNetlist):
+        return [nl.ids[k] for k in np.flatnonzero(nl.mask(kind)).tolist()]
+    return [c.id for c in nl.components if c.kind == kind]
+
+
+def build_system(nl: Netlist, sparse: Optional[bool] = None, ordering: Optional[str] = None,
+                 diagnosis: Optional[Diagnosis] = None) -> Tuple[np.ndarray, np.ndarray, Meta]:
     """
     Construye la matriz de ecuaciones A·x = b usando Modified Nodal Analysis (MNA).
     
@@ -55,122 +487,122 @@ def build_system(nl: Netlist) -> Tuple[np.ndarray, np.ndarray, Meta]:
     Variables:
     - Voltajes de nodos (excepto GND)
     - Corrientes de fuentes de voltaje
+    - Corrientes de diodos ideales (estampados en estado OFF; ver
+      analysis.diodes para resolver sus estados)
+    - Corrientes de inductores (cortocircuitos en DC); los capacitores son
+      circuitos abiertos y no se estampan (ver analysis.transient)
+
+    Los diodos Shockley no se estampan: son la parte no lineal que
+    analysis.newton agrega en cada iteración sobre esta matriz lineal.
+
+    Args:
+        nl: Netlist del circuito o CompactNetlist (se estampa vectorizado
+            sobre sus arreglos)
+        sparse: True devuelve A como matriz CSR de scipy, False como arreglo
+            denso. None elige CSR para sistemas de SPARSE_MIN_SIZE incógnitas
+            o más (si scipy está instalado).
+        ordering: numeración de los nodos antes de estampar: "natural"
+            (orden del netlist) o "rcm" (Cuthill–McKee inverso, ver
+            analysis.ordering). None usa "rcm" en el modo disperso, donde el
+            relleno de la factorización depende del orden, y "natural" en
+            el denso. La permutación queda en meta.ordering.
+        diagnosis: Diagnosis de este mismo netlist (p. ej. el que devuelve
+            validate) para no recorrer el grafo otra vez. Queda en
+            meta.diagnosis.
     """
 
+    compact = nl if isinstance(nl, CompactNetlist) else None
+
     # Identificar GND
-    gnd_node = None
-    for nid, n in nl.nodes.items():
-        if n.is_ground:
-            gnd_node = nid
-            break
+    if compact is not None:
+        gnd_node = compact.ground_id() if compact.is_ground.any() else None
+    else:
+        gnd_node = next((nid for nid, n in nl.nodes.items() if n.is_ground), None)
     
     if gnd_node is None:
         raise ValueError("No se encontró nodo de tierra (GND)")
 
     # Nodos (sin GND)
-    nodes = [nid for nid, n in nl.nodes.items() if not n.is_ground]
-    node_index = {nid: i for i, nid in enumerate(nodes)}
+    if compact is not None:
+        nodes = [compact.node_names[i] for i in np.flatnonzero(~compact.is_ground).tolist()]
+    else:
+        nodes = [nid for nid, n in nl.nodes.items() if not n.is_ground]
     
     # Identificar fuentes de voltaje
-    vsources = [c for c in nl.components if isinstance(c, VSource)]
-    
-    # Verificar que no haya lazos de fuentes de voltaje
-    # (esto causaría matriz singular)
-    if len(vsources) > 1:
-        # Verificación básica: detectar fuentes en serie
-        vsource_nodes = set()
-        for vs in vsources:
-            if vs.n1 in vsource_nodes or vs.n2 in vsource_nodes:
-                # Posible problema, pero lo permitimos con advertencia
-                pass
-            vsource_nodes.add(vs.n1)
-            vsource_nodes.add(vs.n2)
+    vsources = _ids_of(nl, "V")
     
     # Crear índices para las corrientes de las fuentes
     vsource_indices = {}
-    for i, vs in enumerate(vsources):
-        vsource_indices[vs.id] = len(nodes) + i
+    for i, vid in enumerate(vsources):
+        vsource_indices[vid] = len(nodes) + i
+
+    # Corrientes de los diodos ideales, después de las de las fuentes
+    diodes = _ids_of(nl, "D")
+    diode_indices = {d: len(nodes) + len(vsources) + i for i, d in enumerate(diodes)}
+
+    # Corrientes de los inductores, al final
+    inductors = _ids_of(nl, "L")
+    first = len(nodes) + len(vsources) + len(diodes)
+    inductor_indices = {cid: first + i for i, cid in enumerate(inductors)}
 
     # Dimensiones del sistema
     n_nodes = len(nodes)
     n_vsources = len(vsources)
-    n = n_nodes + n_vsources  # Total de variables
+    n = n_nodes + n_vsources + len(diodes) + len(inductors)  # Total de variables
 
     if n == 0:
         raise ValueError("El circuito no tiene nodos flotantes ni fuentes de voltaje")
 
-    # Inicializar matrices
-    A = np.zeros((n, n), dtype=float)
-    b = np.zeros(n, dtype=float)
+    if sparse is None:
+        sparse = sp is not None and n >= SPARSE_MIN_SIZE
+    elif sparse and sp is None:
+        raise ImportError("El ensamblado disperso requiere scipy (pip install scipy)")
 
-    # --- PARTE 1: KCL para cada nodo ---
-    for nid in nodes:
-        i = node_index[nid]
-        
-        # Contribuciones de resistores
-        for c in nl.components:
-            if isinstance(c, Resistor):
-                if c.R <= 0:
-                    raise ValueError(f"Resistor {c.id} tiene valor inválido: {c.R}")
-                    
-                g = 1.0 / c.R  # conductancia
-                
-                # Si el resistor conecta a este nodo
-                if c.n1 == nid:
-                    # Corriente sale del nodo: i = (V_nid - V_n2) / R
-                    A[i, node_index[c.n1]] += g
-                    if c.n2 != gnd_node:
-                        A[i, node_index[c.n2]] -= g
-                        
-                elif c.n2 == nid:
-                    # Corriente entra al nodo: i = (V_n1 - V_nid) / R
-                    if c.n1 != gnd_node:
-                        A[i, node_index[c.n1]] -= g
-                    A[i, node_index[c.n2]] += g
-        
-        # Contribuciones de fuentes de voltaje
-        for vs in vsources:
-            # La corriente de la fuente afecta los nodos que conecta
-            if vs.n1 == nid:
-                # Corriente sale por n1
-                A[i, vsource_indices[vs.id]] += 1.0
-            elif vs.n2 == nid:
-                # Corriente entra por n2
-                A[i, vsource_indices[vs.id]] -= 1.0
-
-    # --- PARTE 2: Ecuaciones de voltaje para fuentes ---
-    for vs in vsources:
-        # Ecuación: V_n1 - V_n2 = V_source
-        row = vsource_indices[vs.id]
-        
-        if vs.n1 != gnd_node:
-            A[row, node_index[vs.n1]] = 1.0
-        if vs.n2 != gnd_node:
-            A[row, node_index[vs.n2]] = -1.0
-            
-        b[row] = vs.V
-
-    # Verificar condición de la matriz
-    det = np.linalg.det(A)
-    rank = np.linalg.matrix_rank(A)
-    
-    if rank < n:
-        # Matriz singular - problema en el circuito
-        # Agregar pequeña regularización para intentar resolver
-        epsilon = 1e-10
-        A += np.eye(n) * epsilon
-        
-        # Verificar de nuevo
-        new_rank = np.linalg.matrix_rank(A)
-        if new_rank < n:
-            raise ValueError(
-                f"El sistema de ecuaciones es singular (rango {rank}/{n}). "
-                "Posibles causas: nodos flotantes, fuentes en cortocircuito, "
-                "o componentes desconectados."
-            )
-
-    return A, b, Meta(
+    # Numeración de nodos: el diccionario se arma en el orden nuevo, así
+    # que list(node_index)[k] sigue siendo el nodo de la fila k
+    if ordering is None:
+        ordering = "rcm" if sparse else "natural"
+    node_ordering = None
+    if ordering != "natural":
+        node_ordering = order_nodes(nl, nodes, ordering)
+        node_index = {nodes[p]: k for k, p in enumerate(node_ordering.perm.tolist())}
+    else:
+        node_index = {nid: i for i, nid in enumerate(nodes)}
+
+    # Estampar todos los componentes en una sola pasada
+    pattern = StampPattern(nl, node_index, vsource_indices, diode_indices, inductor_indices)
+
+    # Diagnóstico topológico en lugar de det/rank: O(V+E), sin factorizar.
+    # El de validate() sirve tal cual si se pasa como diagnosis.
+    diag = diagnosis if diagnosis is not None else diagnose(nl)
+    if diag.vsource_loops:
+        loops = "; ".join(", ".join(loop) for loop in diag.vsource_loops)
+        raise ValueError(
+            f"El sistema de ecuaciones es singular: lazo de fuentes de voltaje o inductores ({loops}). "
+            "Posibles causas: nodos flotantes, fuentes en cortocircuito, "
+            "o componentes desconectados."
+        )
+
+    # Los nodos flotantes dejan filas nulas: se regularizan solo esas
+    # entradas de la diagonal para poder factorizar
+    regularized = [nid for nid in diag.floating if nid in node_index]
+    if regularized:
+        idx = [node_index[nid] for nid in regularized]
+        pattern.add_constant(idx, idx, EPSILON)
+
+    meta = Meta(
         node_index=node_index,
-        components=list(nl.components),
-        vsource_indices=vsource_indices
-    )
\ No newline at end of file
+        components=nl.components if compact is not None else list(nl.components),
+        vsource_indices=vsource_indices,
+        regularized=regularized,
+        pattern=pattern,
+        diode_indices=diode_indices,
+        inductor_indices=inductor_indices,
+        ordering=node_ordering,
+        compact=compact,
+    )
+    meta.diagnosis = diag
+
+    A = pattern.assemble(pattern.entry_values(pattern.values), sparse)
+    b = pattern.rhs(pattern.values)
+    return A, b, meta
@@ -0,0 +1,246 @@
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+import numpy as np
+
+from ..domain.netlist import Netlist
+from ..domain.compact import CompactNetlist, KIND_CODE
+
+try:
+    from scipy.sparse import coo_matrix
+    from scipy.sparse.csgraph import connected_components
+except ImportError:  # scipy es opcional: sin él, ArrayUnionFind
+    coo_matrix = None
+    connected_components = None
+
+
+class UnionFind:
+    """
+    Unión–búsqueda sobre ids de nodo con compresión de caminos iterativa.
+    """
+    def __init__(self):
+        self.p, self.r = {}, {}
+
+    def find(self, x):
+        if x not in self.p:
+            self.p[x] = x
+            self.r[x] = 0
+            return x
+        root = x
+        while self.p[root] != root:
+            root = self.p[root]
+        while self.p[x] != root:
+            self.p[x], x = root, self.p[x]
+        return root
+
+    def union(self, a, b) -> bool:
+        """Une los conjuntos de a y b; devuelve False si ya estaban unidos."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.r[ra] < self.r[rb]:
+            ra, rb = rb, ra
+        self.p[rb] = ra
+        if self.r[ra] == self.r[rb]:
+            self.r[ra] += 1
+        return True
+
+
+class ArrayUnionFind:
+    """
+    Unión–búsqueda sobre los enteros 0..n-1 con arreglos de padre y rango
+    (sin diccionarios ni hashing) y find iterativo con compresión de caminos.
+    """
+    __slots__ = ("p", "r")
+
+    def __init__(self, n: int):
+        self.p = list(range(n))
+        self.r = [0] * n
+
+    def find(self, x: int) -> int:
+        p = self.p
+        root = x
+        while p[root] != root:
+            root = p[root]
+        while p[x] != root:
+            p[x], x = root, p[x]
+        return root
+
+    def union(self, a: int, b: int) -> bool:
+        """Une los conjuntos de a y b; devuelve False si ya estaban unidos."""
+        ra, rb = self.find(a), self.find(b)
+        if ra == rb:
+            return False
+        if self.r[ra] < self.r[rb]:
+            ra, rb = rb, ra
+        self.p[rb] = ra
+        if self.r[ra] == self.r[rb]:
+            self.r[ra] += 1
+        return True
+
+    def labels(self) -> np.ndarray:
+        return np.fromiter((self.find(i) for i in range(len(self.p))), dtype=np.int64,
+                           count=len(self.p))
+
+
+def component_labels(n: int, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Etiqueta de componente conexa de cada nodo 0..n-1 del grafo de aristas (a, b)."""
+    if connected_components is not None:
+        G = coo_matrix((np.ones(len(a), dtype=np.int8), (a, b)), shape=(n, n))
+        return connected_components(G, directed=False)[1]
+    uf = ArrayUnionFind(n)
+    for i, j in zip(a.tolist(), b.tolist()):
+        uf.union(i, j)
+    return uf.labels()
+
+
+@dataclass
+class Graph:
+    """
+    Netlist como grafo de enteros: node_names[i] es el nodo i, ground su
+    índice y la arista k une a[k] con b[k] (-1 = nodo inexistente).
+    """
+    node_names: List[str]
+    ground: int
+    ids: List[str]
+    kind: np.ndarray
+    a: np.ndarray
+    b: np.ndarray
+
+    @classmethod
+    def from_netlist(cls, nl) -> "Graph":
+        gnd = nl.ground_id()
+        if isinstance(nl, CompactNetlist):
+            return cls(nl.node_names, nl.node_index[gnd], nl.ids, nl.kind,
+                       nl.n1.astype(np.int64), nl.n2.astype(np.int64))
+        names = list(nl.nodes)
+        index = {nid: i for i, nid in enumerate(names)}
+        comps = nl.components
+        m = len(comps)
+        return cls(
+            names, index[gnd], [c.id for c in comps],
+            np.fromiter((KIND_CODE.get(getattr(c, "kind", ""), -1) for c in comps),
+                        dtype=np.int8, count=m),
+            np.fromiter((index.get(c.n1, -1) for c in comps), dtype=np.int64, count=m),
+            np.fromiter((index.get(c.n2, -1) for c in comps), dtype=np.int64, count=m),
+        )
+
+    def mask(self, kinds) -> np.ndarray:
+        return np.isin(self.kind, [KIND_CODE[k] for k in kinds]) & (self.a >= 0) & (self.b >= 0)
+
+    def unreachable(self, mask) -> np.ndarray:
+        """Nodos sin camino a GND usando solo las aristas de mask."""
+        labels = component_labels(len(self.node_names), self.a[mask], self.b[mask])
+        return labels != labels[self.ground]
+
+
+@dataclass
+class Diagnosis:
+    """
+    Resultado del diagnóstico topológico de un netlist.
+
+    floating: nodos sin camino a GND a través de componentes que aparecen
+        en la matriz MNA.
+    vsource_loops: cada lazo de fuentes de voltaje (o inductores) como lista de ids.
+    disconnected: nodos sin camino a GND por ningún componente (ni
+        capacitores): subredes realmente sueltas.
+    diode_fed: nodos que llegan a GND solo a través de diodos ideales
+        (en OFF quedan definidos únicamente por la fuga GMIN).
+    dangling: nodo con una sola conexión -> id de ese componente.
+    graph: el grafo de enteros del netlist, para reutilizarlo.
+    """
+    floating: List[str] = field(default_factory=list)
+    vsource_loops: List[List[str]] = field(default_factory=list)
+    disconnected: List[str] = field(default_factory=list)
+    diode_fed: List[str] = field(default_factory=list)
+    dangling: Dict[str, str] = field(default_factory=dict)
+    graph: "Graph" = field(default=None, repr=False, compare=False)
+
+    @property
+    def ok(self) -> bool:
+        return not self.floating and not self.vsource_loops
+
+    @property
+    def warnings(self) -> List[str]:
+        """Situaciones legales pero sospechosas, para mostrar al usuario."""
+        out = []
+        loose = set(self.disconnected)
+        dc = [nid for nid in self.floating if nid not in loose]
+        if dc:
+            out.append("Nodos conectados a GND solo por capacitores (se regularizan en DC): "
+                       + ", ".join(dc))
+        if self.diode_fed:
+            out.append("Nodos alimentados solo a través de diodos: " + ", ".join(self.diode_fed))
+        if self.dangling:
+            out.append("Nodos con una sola conexión: "
+                       + ", ".join(f"{nid} ({cid})" for nid, cid in self.dangling.items()))
+        return out
+
+
+def _forest_path(adj, a, b) -> List[str]:
+    """Ids de las fuentes en el camino a→b dentro del bosque de fuentes."""
+    prev = {a: None}
+    stack = [a]
+    while stack:
+        u = stack.pop()
+        if u == b:
+            break
+        for v, cid in adj[u]:
+            if v not in prev:
+                prev[v] = (u, cid)
+                stack.append(v)
+    path = []
+    u = b
+    while prev.get(u) is not None:
+        u, cid = prev[u]
+        path.append(cid)
+    return path
+
+
+def diagnose(nl: Netlist, stamped_kinds=("R", "V", "D", "DS", "L")) -> Diagnosis:
+    """
+    Detecta por teoría de grafos las causas típicas de una matriz MNA singular.
+
+    Es O(V+E) y no requiere factorizar la matriz; el netlist se pasa una
+    vez a un grafo de enteros y todo lo demás son recorridos de arreglos:
+    - Lazos de fuentes de voltaje: una fuente cuyos terminales ya están
+      unidos por otras fuentes fija dos veces la misma diferencia de potencial.
+      Los inductores cuentan como fuentes de 0 V (cortocircuitos en DC).
+    - Subredes flotantes: nodos que no llegan a GND por ningún componente
+      estampado (los diodos se estampan al menos con su fuga GMIN).
+    - Nodos sueltos, alimentados solo por diodos o con una sola conexión
+      (ver Diagnosis).
+    """
+    g = Graph.from_netlist(nl)
+    names = g.node_names
+    diag = Diagnosis(graph=g)
+
+    # Lazos: unión–búsqueda solo sobre fuentes e inductores, en orden
+    vs = np.flatnonzero(g.mask(("V", "L")))
+    if len(vs):
+        uf = ArrayUnionFind(len(names))
+        vs_adj: Dict[int, list] = defaultdict(list)
+        for k, i, j in zip(vs.tolist(), g.a[vs].tolist(), g.b[vs].tolist()):
+            if not uf.union(i, j):
+                diag.vsource_loops.append([g.ids[k]] + _forest_path(vs_adj, i, j))
+            vs_adj[i].append((j, g.ids[k]))
+            vs_adj[j].append((i, g.ids[k]))
+
+    stamped = g.mask(stamped_kinds)
+    floating = g.unreachable(stamped)
+    diag.floating = [names[i] for i in np.flatnonzero(floating).tolist()]
+    every = g.mask(KIND_CODE)
+    diag.disconnected = [names[i] for i in np.flatnonzero(g.unreachable(every)).tolist()]
+    if KIND_CODE["D"] in g.kind:
+        no_diode = stamped & (g.kind != KIND_CODE["D"])
+        fed = g.unreachable(no_diode) & ~floating
+        diag.diode_fed = [names[i] for i in np.flatnonzero(fed).tolist()]
+
+    # Grado de cada nodo (GND aparte): una sola conexión
+    ends = np.concatenate([g.a[every], g.b[every]])
+    owner = np.concatenate([np.flatnonzero(every)] * 2)
+    degree = np.bincount(ends, minlength=len(names))
+    lone = (degree[ends] == 1) & (ends != g.ground)
+    diag.dangling = {names[i]: g.ids[k] for i, k in zip(ends[lone].tolist(), owner[lone].tolist())}
+    return diag
@@ -0,0 +1,228 @@
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from ..domain.netlist import Netlist
+from .results import TransientResult
+from .solver import LinearSolver
+from .tableau import EPSILON, build_system, reactive_connected
+
+try:
+    import scipy.sparse as sp
+except ImportError:  # scipy es opcional: solo se usa en el modo disperso
+    sp = None
+
+# "be": Euler hacia atrás (orden 1, amortigua); "trap": trapecios (orden 2)
+TRANSIENT_METHODS = ("be", "trap")
+
+# Filas que se acumulan en memoria antes de copiarlas a la salida (evita
+# escribir el memmap fila por fila)
+BLOCK_ROWS = 4096
+
+# Condición inicial: punto de operación DC o estado nulo (capacitores
+# descargados, inductores sin corriente)
+INITIAL_CONDITIONS = ("op", "zero")
+
+
+class TransientSolver:
+    """
+    Análisis transitorio de paso fijo con modelos compañeros.
+
+    Cada capacitor se reemplaza por una conductancia G = k·C/h en paralelo
+    con una fuente de corriente de historia, y cada inductor agrega -k·L/h
+    en la diagonal de su fila (k = 1 en Euler, 2 en trapecios). Con h fijo
+    la matriz no cambia: se factoriza una vez y cada paso es
+
+        b_k = b(t_k) + H·s_{k-1},   x_k = A⁻¹·b_k  (sustitución triangular)
+
+    donde s = [x, i_C] es el estado del paso anterior. H se arma una sola
+    vez con las mismas posiciones de estampado, así que un paso cuesta dos
+    productos matriz-vector y una sustitución, sin listas de Python.
+
+    Parte del sistema DC de build_system (mismos índices de Meta: los
+    inductores ya tienen su corriente como incógnita).
+    """
+    def __init__(self, nl: Netlist, dt: float, method: str = "trap", sparse: Optional[bool] = None):
+        if method not in TRANSIENT_METHODS:
+            raise ValueError(f"Método de integración inválido: {method}")
+        if not (dt > 0):
+            raise ValueError(f"El paso de tiempo debe ser > 0 (actual: {dt})")
+        A, b, meta = build_system(nl, sparse=sparse)
+        if meta.diode_indices or meta.shockley:
+            raise ValueError("El análisis transitorio no admite diodos.")
+        self.meta = meta
+        self.dt = float(dt)
+        self.method = method
+        self.sparse = not isinstance(A, np.ndarray)
+        self.A_dc = A
+        self.b_dc = b
+        self.n = A.shape[0]
+        self.labels = meta.unknown_labels()
+
+        node = meta.node_index
+        n = self.n
+        k = 2.0 if method == "trap" else 1.0
+        trap = method == "trap"
+
+        caps = [c for c in nl.components if c.kind == "C"]
+        self.cap_ids = [c.id for c in caps]
+        m = len(caps)
+
+        # Triplets de: entradas extra de A, H (n × (n+m)) y Q (m × n), con
+        # i_eq = Q·x_prev (+ i_C,prev en trapecios) e i_C = Q·x - i_eq
+        a_t, h_t, q_t = ([], [], []), ([], [], []), ([], [], [])
+
+        def put(t, i, j, v):
+            t[0].append(i)
+            t[1].append(j)
+            t[2].append(v)
+
+        for j, c in enumerate(caps):
+            g = k * c.C / self.dt
+            a, bb = node.get(c.n1), node.get(c.n2)
+            for r, s in ((a, 1.0), (bb, -1.0)):
+                if r is None:
+                    continue
+                put(q_t, j, r, s * g)
+                for cc, s2 in ((a, 1.0), (bb, -1.0)):
+                    if cc is not None:
+                        put(a_t, r, cc, s * s2 * g)
+                        put(h_t, r, cc, s * s2 * g)
+                if trap:
+                    put(h_t, r, n + j, s)
+
+        for c in nl.components:
+            if c.kind != "L":
+                continue
+            row = meta.inductor_indices[c.id]
+            rl = k * c.L / self.dt
+            put(a_t, row, row, -rl)
+            put(h_t, row, row, -rl)
+            if trap:
+                # v_n + v_{n-1} = 2L/h·(i_n - i_{n-1}): la historia incluye -v_{n-1}
+                for r, s in ((node.get(c.n1), -1.0), (node.get(c.n2), 1.0)):
+                    if r is not None:
+                        put(h_t, row, r, s)
+
+        # Los nodos que en DC solo cuelgan de capacitores se regularizaron;
+        # en el transitorio ya tienen camino a GND y la regularización sobra
+        for i in reactive_connected(nl, meta):
+            put(a_t, i, i, -EPSILON)
+
+        self.A = self._add(A, a_t)
+        self.H = self._matrix(h_t, (n, n + m))
+        self.Q = self._matrix(q_t, (m, n))
+        self.trap = trap
+        self.m = m
+        self._factor = None
+
+    def _matrix(self, t, shape):
+        rows = np.asarray(t[0], dtype=np.int64)
+        cols = np.asarray(t[1], dtype=np.int64)
+        vals = np.asarray(t[2], dtype=float)
+        if self.sparse:
+            return sp.csr_matrix((vals, (rows, cols)), shape=shape)
+        M = np.zeros(shape)
+        np.add.at(M, (rows, cols), vals)
+        return M
+
+    def _add(self, A, t):
+        if self.sparse:
+            return (A + self._matrix(t, A.shape)).tocsr()
+        return A + self._matrix(t, A.shape)
+
+    def factorization(self):
+        """Factorización de la matriz del transitorio (una sola vez)."""
+        if self._factor is None:
+            self._factor = LinearSolver().factorize(self.A, labels=self.labels)
+        return self._factor
+
+    def _source_values(self, sources, time):
+        """Filas de b y valores (N, s) de las fuentes que varían en el tiempo."""
+        rows, cols = [], []
+        for vid, wave in (sources or {}).items():
+            if vid not in self.meta.vsource_indices:
+                raise KeyError(f"{vid}: no es una fuente de voltaje del circuito")
+            vals = wave(time) if callable(wave) else wave
+            vals = np.broadcast_to(np.asarray(vals, dtype=float), time.shape)
+            rows.append(self.meta.vsource_indices[vid])
+            cols.append(vals)
+        W = np.column_stack(cols) if cols else np.empty((len(time), 0))
+        return np.asarray(rows, dtype=np.int64), W
+
+    def run(
+        self,
+        t_stop: float,
+        initial: str = "op",
+        sources: Optional[Dict[str, Union[Callable, np.ndarray]]] = None,
+        out: Optional[str] = None,
+    ) -> TransientResult:
+        """
+        Integra de t = 0 a t_stop con paso dt.
+
+        Args:
+            t_stop: tiempo final (s)
+            initial: "op" (punto de operación DC en t = 0) o "zero"
+            sources: {"V1": f(t) vectorizada o arreglo de N valores}; las
+                demás fuentes quedan constantes
+            out: ruta .npy para volcar las formas de onda a un memmap en
+                lugar de memoria
+
+        Returns:
+            TransientResult con data de forma (N, n + n_capacitores)
+        """
+        if initial not in INITIAL_CONDITIONS:
+            raise ValueError(f"Condición inicial inválida: {initial}")
+        N = int(round(t_stop / self.dt)) + 1
+        if N < 2:
+            raise ValueError("t_stop debe ser al menos un paso de tiempo")
+        time = self.dt * np.arange(N)
+        rows, W = self._source_values(sources, time)
+
+        n, m = self.n, self.m
+        shape = (N, n + m)
+        if out is not None:
+            data = np.lib.format.open_memmap(out, mode="w+", dtype=np.float64, shape=shape)
+        else:
+            data = np.empty(shape)
+
+        s = np.zeros(n + m)  # estado [x, i_C]
+        if initial == "op":
+            b0 = self.b_dc.copy()
+            b0[rows] = W[0]
+            s[:n] = LinearSolver().solve(self.A_dc, b0, labels=self.labels)
+        data[0] = s
+
+        factor = self.factorization()
+        H, Q, b_dc, trap = self.H, self.Q, self.b_dc, self.trap
+        block = np.empty((min(BLOCK_ROWS, N), n + m))
+        start = 1
+        for k in range(1, N):
+            ieq = Q @ s[:n]
+            if trap:
+                ieq += s[n:]
+            rhs = H @ s
+            rhs += b_dc
+            rhs[rows] = W[k]
+            x = factor.solve(rhs)
+            s[:n] = x
+            s[n:] = Q @ x - ieq
+            block[k - start] = s
+            if k - start + 1 == len(block) or k == N - 1:
+                data[start:k + 1] = block[:k - start + 1]
+                start = k + 1
+
+        if out is not None:
+            data.flush()
+
+        columns = {label: i for i, label in enumerate(self.labels)}
+        columns.update({f"I({cid})": n + j for j, cid in enumerate(self.cap_ids)})
+        resistors = {c.id: (c.n1, c.n2, c.R) for c in self.meta.components if c.kind == "R"}
+        return TransientResult(
+            time=time,
+            node_ids=list(self.meta.node_index),
+            data=data,
+            columns=columns,
+            resistors=resistors,
+            method=self.method,
+        )
@@ -0,0 +1,48 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..analysis.ac import ACAnalysis
+from ..analysis.results import ACResult
+from .validation import validate
+
+
+def ac_sweep(
+    nl,
+    f_start: float,
+    f_stop: float,
+    points: int,
+    sources: Optional[Dict[str, complex]] = None,
+    chunk_size: Optional[int] = None,
+) -> ACResult:
+    """
+    Barrido AC de pequeña señal sobre una grilla logarítmica.
+
+    Las matrices G y B se arman una vez; las frecuencias se resuelven en
+    lotes complejos (K, n, n) de chunk_size puntos (por defecto, los que
+    caben en analysis.ac.AC_CHUNK_BYTES).
+
+    Args:
+        nl: Netlist del circuito
+        f_start, f_stop: frecuencias extremas (Hz, > 0)
+        points: número de frecuencias (espaciadas logarítmicamente)
+        sources: {"V1": amplitud compleja}; None usa el valor DC de cada fuente
+        chunk_size: frecuencias por lote
+
+    Returns:
+        ACResult con fasores, magnitud y fase por nodo
+
+    Raises:
+        ValidationError: Si el circuito tiene errores de diseño
+        ValueError: Si el sistema no se puede resolver
+    """
+    if not (0 < f_start <= f_stop):
+        raise ValueError(f"Rango de frecuencias inválido: {f_start} a {f_stop} Hz")
+    if points < 1:
+        raise ValueError("El barrido necesita al menos una frecuencia")
+    validate(nl)
+    try:
+        analysis = ACAnalysis(nl, sources=sources)
+    except ValueError as e:
+        raise ValueError(f"Error al construir el sistema: {e}")
+    return analysis.run(np.geomspace(f_start, f_stop, int(points)), chunk_size=chunk_size)
@@ -0,0 +1,240 @@
+"""
+Caché de resultados de simulación direccionada por contenido.
+
+La clave es un hash SHA-256 de la forma canónica del netlist (nodos y
+componentes ordenados por id, valores exactos, nodo de tierra) más las
+opciones de simulate(); dos circuitos idénticos comparten clave aunque
+se hayan armado en otro orden o en otra sesión.
+
+Dos niveles:
+  - memoria: LRU con a lo sumo max_entries soluciones;
+  - disco (opcional): un pickle por clave bajo cache_dir, para que los
+    circuitos repetidos sean instantáneos entre ejecuciones.
+"""
+import copy
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+from typing import Optional
+
+from ..analysis.results import Solution
+from ..domain.netlist import Netlist
+from .simulate import simulate
+
+# Se incluye en la clave: cambiarla invalida los resultados ya guardados
+# en disco cuando cambia el formato de Solution o el solver.
+# 2: Solution respaldada por arreglos (ArrayMap), con stats y checks como
+#    KirchhoffChecks
+CACHE_VERSION = 2
+
+# Directorio por defecto del nivel en disco que usan las interfaces
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "sim-elec")
+
+# Opciones de simulate() que no cambian el resultado
+_IGNORED_OPTIONS = ("workers", "stats_hook")
+
+# Parámetros numéricos de cada tipo de componente, en orden fijo
+_PARAMS = {
+    "R": ("R",),
+    "V": ("V",),
+    "D": (),
+    "DS": ("Is", "n", "Vt"),
+    "C": ("C",),
+    "L": ("L",),
+}
+
+
+def _num(value) -> str:
+    """Representación exacta e independiente de int/float (1000 == 1000.0)."""
+    return float(value).hex()
+
+
+def canonical_netlist(nl: Netlist, values: bool = True) -> dict:
+    """
+    Forma canónica del netlist: independiente del orden de nodos y
+    componentes. Con values=False solo queda la topología.
+    """
+    comps = []
+    for c in sorted(nl.components, key=lambda c: c.id):
+        item = [c.kind, c.id, c.n1, c.n2]
+        if values:
+            item.extend(_num(getattr(c, p)) for p in _PARAMS.get(c.kind, ()))
+        if c.kind in ("D", "DS"):
+            item.append(c.polarity)
+        comps.append(item)
+    return {
+        "nodes": sorted(nl.nodes),
+        "ground": sorted(nid for nid, n in nl.nodes.items() if n.is_ground),
+        "components": comps,
+    }
+
+
+def netlist_key(nl: Netlist, **options) -> str:
+    """Hash SHA-256 (hex) del netlist canónico y de las opciones de simulación."""
+    payload = {
+        "version": CACHE_VERSION,
+        "netlist": canonical_netlist(nl),
+        "options": {k: v for k, v in sorted(options.items())
+                    if v is not None and k not in _IGNORED_OPTIONS},
+    }
+    data = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=repr)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def topology_key(nl: Netlist) -> str:
+    """Hash de la topología (sin valores): no cambia al editar valores."""
+    data = json.dumps(canonical_netlist(nl, values=False), sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+class SimulationCache:
+    """
+    Caché LRU de soluciones, con nivel opcional en disco.
+
+    Las soluciones se devuelven como copias: modificar una no altera la
+    guardada. Los errores de simulación no se guardan.
+
+    Uso:
+        cache = SimulationCache(max_entries=64, cache_dir=DEFAULT_CACHE_DIR)
+        sol = cache.simulate(nl)           # miss: simula y guarda
+        sol = cache.simulate(nl)           # hit en memoria
+        cache.invalidate(nl)               # olvida ese circuito
+        cache.stats()                      # {"hits", "misses", ...}
+    """
+    def __init__(self, max_entries: int = 128, cache_dir: Optional[str] = None):
+        if max_entries < 1:
+            raise ValueError("max_entries debe ser >= 1")
+        self.max_entries = max_entries
+        self.cache_dir = cache_dir
+        self._memory: "OrderedDict[str, Solution]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._memory)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._memory or (self.cache_dir is not None and os.path.exists(self._path(key)))
+
+    # --------------- niveles ---------------
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.pkl")
+
+    def _remember(self, key: str, sol: Solution) -> None:
+        self._memory[key] = sol
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def _load(self, key: str) -> Optional[Solution]:
+        if self.cache_dir is None:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Archivo truncado o de otra versión: se descarta
+            self._remove(path)
+            return None
+
+    def _store(self, key: str, sol: Solution) -> None:
+        if self.cache_dir is None:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Escritura atómica: otro proceso nunca ve un archivo a medias
+            fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(sol, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except OSError:
+            # El disco es solo una optimización: sin permisos se sigue en memoria
+            pass
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # --------------- API ---------------
+    def get(self, key: str) -> Optional[Solution]:
+        """Solución guardada con esa clave (copia) o None; cuenta hits y misses."""
+        sol = self._memory.get(key)
+        if sol is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(sol)
+        sol = self._load(key)
+        if sol is not None:
+            self._remember(key, sol)
+            self.hits += 1
+            self.disk_hits += 1
+            return copy.deepcopy(sol)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, sol: Solution) -> None:
+        """Guarda una copia de sol en memoria y, si hay cache_dir, en disco."""
+        sol = copy.deepcopy(sol)
+        self._remember(key, sol)
+        self._store(key, sol)
+
+    def simulate(self, nl: Netlist, **options) -> Solution:
+        """simulate(nl, **options) con caché: solo simula en un miss."""
+        key = netlist_key(nl, **options)
+        sol = self.get(key)
+        if sol is None:
+            sol = simulate(nl, **options)
+            self.put(key, sol)
+        return sol
+
+    def invalidate(self, nl: Optional[Netlist] = None, key: Optional[str] = None, **options) -> bool:
+        """
+        Olvida un resultado (por netlist + opciones o por clave) en ambos
+        niveles. Devuelve True si estaba guardado.
+        """
+        if key is None:
+            if nl is None:
+                raise ValueError("invalidate requiere un netlist o una clave")
+            key = netlist_key(nl, **options)
+        found = self._memory.pop(key, None) is not None
+        if self.cache_dir is not None:
+            path = self._path(key)
+            if os.path.exists(path):
+                found = True
+                self._remove(path)
+        return found
+
+    def clear(self, disk: bool = True) -> None:
+        """Vacía la memoria y, con disk=True, los archivos de cache_dir."""
+        self._memory.clear()
+        if disk and self.cache_dir is not None and os.path.isdir(self.cache_dir):
+            for root, _, files in os.walk(self.cache_dir):
+                for name in files:
+                    if name.endswith(".pkl"):
+                        self._remove(os.path.join(root, name))
+
+    def reset_stats(self) -> None:
+        self.hits = self.disk_hits = self.misses = 0
+
+    def stats(self) -> dict:
+        """Contadores de aciertos y fallos y tamaño del nivel en memoria."""
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+        }
@@ -0,0 +1,148 @@
+"""
+Simulación por lotes sin interfaz gráfica.
+
+Uso (desde la raíz del repositorio):
+    python -m src.app.cli simulate examples/
+    python -m src.app.cli simulate a.json b.json dir/ --workers 8 --chunksize 32 -o res.jsonl
+
+Cada netlist produce un registro JSON Lines apenas termina (en el orden
+en que terminan, no en el de entrada), con voltajes, corrientes, estados
+de diodos, verificaciones y tiempos por archivo. Al final se imprime un
+resumen por stderr; el código de salida es 1 si algún archivo falló.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from collections.abc import Mapping
+from multiprocessing import Pool
+from typing import Iterable, Iterator
+
+import numpy as np
+
+from .serialization import load_json
+from .simulate import simulate
+
+
+def iter_netlists(paths: Iterable[str], pattern: str = ".json") -> Iterator[str]:
+    """Archivos de entrada: los indicados y, en directorios, los *.json (recursivo)."""
+    for path in paths:
+        if os.path.isdir(path):
+            for root, dirs, files in os.walk(path):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.endswith(pattern):
+                        yield os.path.join(root, name)
+        else:
+            yield path
+
+
+def _to_json(value):
+    """Tipos de NumPy que json no serializa."""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, Mapping):
+        return dict(value)  # p. ej. KirchhoffChecks
+    raise TypeError(f"{type(value).__name__} no es serializable")
+
+
+def simulate_file(path: str, diode_method: str = "auto") -> dict:
+    """Carga y simula un netlist; nunca lanza: los errores van en el registro."""
+    record = {"file": path, "ok": False}
+    t0 = time.perf_counter()
+    try:
+        nl = load_json(path)
+        t1 = time.perf_counter()
+        sol = simulate(nl, diode_method=diode_method)
+        t2 = time.perf_counter()
+    except Exception as e:
+        record["error"] = f"{type(e).__name__}: {e}"
+        record["time_s"] = {"total": time.perf_counter() - t0}
+        return record
+    record.update(
+        ok=True,
+        node_voltages=sol.node_voltages,
+        branch_currents=sol.branch_currents,
+        diode_states=sol.diode_states,
+        checks=sol.checks,
+        time_s={"load": t1 - t0, "simulate": t2 - t1, "total": t2 - t0},
+    )
+    if sol.newton:
+        record["newton"] = {k: v for k, v in sol.newton.items() if k != "iteration_times"}
+    return record
+
+
+def _simulate_task(args):
+    return simulate_file(*args)
+
+
+def run_batch(paths: Iterable[str], out, workers: int = 1, chunksize: int = 16,
+              diode_method: str = "auto") -> dict:
+    """
+    Simula cada archivo y escribe su registro en out apenas termina.
+
+    Con workers > 1 usa un Pool de procesos con imap_unordered: los
+    resultados no se acumulan en memoria, cada uno se escribe y se suelta.
+
+    Returns:
+        Resumen: {"files", "failed", "elapsed_s", "files_per_s"}
+    """
+    tasks = ((p, diode_method) for p in paths)
+    n = failed = 0
+    t0 = time.perf_counter()
+
+    def emit(record):
+        nonlocal n, failed
+        n += 1
+        failed += not record["ok"]
+        out.write(json.dumps(record, default=_to_json, ensure_ascii=False) + "\n")
+        out.flush()
+
+    if workers <= 1:
+        for task in tasks:
+            emit(_simulate_task(task))
+    else:
+        with Pool(processes=workers) as pool:
+            for record in pool.imap_unordered(_simulate_task, tasks, chunksize=chunksize):
+                emit(record)
+
+    elapsed = time.perf_counter() - t0
+    return {"files": n, "failed": failed, "elapsed_s": elapsed,
+            "files_per_s": n / elapsed if elapsed > 0 else 0.0}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(prog="python -m src.app.cli", description=__doc__,
+                                 formatter_class=argparse.RawDescriptionHelpFormatter)
+    sub = ap.add_subparsers(dest="command", required=True)
+    sim = sub.add_parser("simulate", help="simula netlists JSON y escribe JSON Lines")
+    sim.add_argument("paths", nargs="+", help="archivos .json o directorios")
+    sim.add_argument("-o", "--output", default="-", help="archivo .jsonl de salida (- = stdout)")
+    sim.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                     help="procesos del pool (1 = sin pool)")
+    sim.add_argument("--chunksize", type=int, default=16,
+                     help="archivos por tarea enviada a cada proceso")
+    sim.add_argument("--diode-method", default="auto", choices=["auto", "pwl", "lcp", "pgs"])
+    args = ap.parse_args(argv)
+
+    if args.workers < 1 or args.chunksize < 1:
+        ap.error("--workers y --chunksize deben ser >= 1")
+
+    paths = iter_netlists(args.paths)
+    if args.output == "-":
+        summary = run_batch(paths, sys.stdout, args.workers, args.chunksize, args.diode_method)
+    else:
+        with open(args.output, "w", encoding="utf-8") as out:
+            summary = run_batch(paths, out, args.workers, args.chunksize, args.diode_method)
+
+    print(f"{summary['files']} archivos, {summary['failed']} con error, "
+          f"{summary['elapsed_s']:.2f} s ({summary['files_per_s']:.1f} archivos/s)",
+          file=sys.stderr)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
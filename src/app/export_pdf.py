@@ -49,6 +49,12 @@ def _format_netlist(nl: Dict[str, Any]) -> list[str]:
             out.append(f"{name} (V) {a} - {b}, V={el.get('value', 0)} V")
         elif t == "D":
             out.append(f"{name} (D) {a} - {b}")
+        elif t == "DS":
+            out.append(f"{name} (D Shockley) {a} - {b}, Is={el.get('Is', 0)} A, n={el.get('n', 1)}")
+        elif t == "C":
+            out.append(f"{name} (C) {a} - {b}, C={el.get('value', 0)} F")
+        elif t == "L":
+            out.append(f"{name} (L) {a} - {b}, L={el.get('value', 0)} H")
     return out
 
 
@@ -0,0 +1,207 @@
+from typing import Dict, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from ..analysis.compiled import CompiledCircuit
+from ..analysis.results import MonteCarloResult
+from .validation import validate, ParameterError
+
+# Una tolerancia es una fracción (0.05 = ±5 %, uniforme) o (fracción, "uniform"|"gaussian")
+ToleranceSpec = Union[float, Tuple[float, str]]
+
+DISTRIBUTIONS = ("uniform", "gaussian")
+
+
+def _parse_tolerance(cid: str, spec: ToleranceSpec) -> Tuple[float, str]:
+    tol, dist = (spec, "uniform") if np.isscalar(spec) else spec
+    if dist not in DISTRIBUTIONS:
+        raise ParameterError(f"{cid}: distribución inválida: {dist}.")
+    if not 0 <= float(tol) < 1:
+        raise ParameterError(f"{cid}: la tolerancia debe estar en [0, 1) (actual: {tol}).")
+    return float(tol), dist
+
+
+class _RunningStats:
+    """
+    Media, varianza, mínimo y máximo por columna, acumulados por bloques
+    (fórmula de combinación de Chan) sin guardar las muestras.
+    """
+    def __init__(self, width: int):
+        self.count = 0
+        self.mean = np.zeros(width)
+        self.m2 = np.zeros(width)
+        self.min = np.full(width, np.inf)
+        self.max = np.full(width, -np.inf)
+
+    def update(self, block: np.ndarray) -> None:
+        nb = block.shape[0]
+        mean_b = block.mean(axis=0)
+        m2_b = ((block - mean_b) ** 2).sum(axis=0)
+        total = self.count + nb
+        delta = mean_b - self.mean
+        self.mean = self.mean + delta * (nb / total)
+        self.m2 = self.m2 + m2_b + delta ** 2 * (self.count * nb / total)
+        self.count = total
+        np.minimum(self.min, block.min(axis=0), out=self.min)
+        np.maximum(self.max, block.max(axis=0), out=self.max)
+
+    @property
+    def std(self) -> np.ndarray:
+        if self.count < 2:
+            return np.zeros_like(self.mean)
+        return np.sqrt(self.m2 / (self.count - 1))
+
+
+class _Reservoir:
+    """
+    Muestreo de reservorio (algoritmo R) de tamaño fijo: los percentiles son
+    exactos mientras n_samples <= size y aproximados después.
+    """
+    def __init__(self, size: int, width: int, rng: np.random.Generator):
+        self.data = np.empty((size, width))
+        self.size = size
+        self.seen = 0
+        self.rng = rng
+
+    def update(self, block: np.ndarray) -> None:
+        nb = block.shape[0]
+        free = max(0, min(self.size - self.seen, nb))
+        self.data[self.seen:self.seen + free] = block[:free]
+        if free < nb:
+            # La muestra t (0-based) entra con probabilidad size/(t+1)
+            t = self.seen + np.arange(free, nb)
+            j = self.rng.integers(0, t + 1)
+            keep = j < self.size
+            self.data[j[keep]] = block[free:][keep]
+        self.seen += nb
+
+    def percentiles(self, qs: Sequence[float]) -> np.ndarray:
+        return np.percentile(self.data[:min(self.seen, self.size)], qs, axis=0)
+
+
+def monte_carlo(
+    nl,
+    tolerances: Dict[str, ToleranceSpec],
+    n_samples: int,
+    seed: Optional[int] = None,
+    limits: Optional[Dict[str, Tuple[Optional[float], Optional[float]]]] = None,
+    block_size: Optional[int] = None,
+    percentiles: Sequence[float] = (1, 5, 50, 95, 99),
+    reservoir_size: int = 10_000,
+) -> MonteCarloResult:
+    """
+    Análisis Monte Carlo de tolerancias.
+
+    Sortea los valores de R y V en bloques vectorizados, resuelve cada
+    bloque como un lote (CompiledCircuit.solve_batch) y acumula las
+    estadísticas en flujo: la memoria depende de block_size y
+    reservoir_size, no de n_samples.
+
+    Args:
+        nl: Netlist del circuito
+        tolerances: {"R1": 0.05, "R2": (0.01, "gaussian"), "V1": (0.02, "uniform")}.
+            uniform sortea en nominal·(1 ± tol); gaussian usa σ = tol/3
+            truncada en ±tol (tol es el límite a 3σ), así que un resistor
+            nunca sale ≤ 0.
+        n_samples: número total de muestras
+        seed: semilla del generador (resultados reproducibles)
+        limits: {"N2": (2.4, 2.6), "R1": (None, 3e-3)}; un id de nodo limita
+            su voltaje y un id de componente su corriente. None = sin límite.
+        block_size: muestras por bloque resuelto; None = las que entran
+            en BATCH_CHUNK_BYTES de matrices (CompiledCircuit.batch_size)
+        percentiles: percentiles a reportar (0–100)
+        reservoir_size: muestras guardadas para estimar percentiles
+
+    Returns:
+        MonteCarloResult con estadísticas por voltaje y corriente y el yield
+    """
+    validate(nl)
+    if n_samples <= 0:
+        raise ParameterError(f"n_samples debe ser > 0 (actual: {n_samples}).")
+    try:
+        cc = CompiledCircuit(nl, sparse=False)
+    except ValueError as e:
+        raise ValueError(f"Error al construir el sistema: {e}")
+
+    specs = {}
+    for cid, spec in tolerances.items():
+        if cid not in cc.pattern.slot_of:
+            raise ParameterError(f"{cid}: solo se admiten tolerancias en resistores y fuentes.")
+        c = cc.component(cid)
+        nominal = c.R if c.kind == "R" else c.V
+        specs[cid] = (nominal,) + _parse_tolerance(cid, spec)
+
+    node_ids = list(cc.meta.node_index)
+    branch_ids = list(cc.pattern.comp_ids)
+    n_nodes = len(node_ids)
+
+    # Límites como columnas del bloque [voltajes | corrientes]
+    limits = dict(limits or {})
+    lim_cols, lim_lo, lim_hi = [], [], []
+    for name, (lo, hi) in limits.items():
+        if name in node_ids:
+            lim_cols.append(node_ids.index(name))
+        elif name in branch_ids:
+            lim_cols.append(n_nodes + branch_ids.index(name))
+        else:
+            raise ParameterError(f"Límite sobre '{name}': no es un nodo ni un componente.")
+        lim_lo.append(-np.inf if lo is None else lo)
+        lim_hi.append(np.inf if hi is None else hi)
+    lim_cols = np.asarray(lim_cols, dtype=np.int64)
+    lim_lo, lim_hi = np.asarray(lim_lo, dtype=float), np.asarray(lim_hi, dtype=float)
+
+    if block_size is None:
+        block_size = cc.batch_size()
+    elif block_size <= 0:
+        raise ParameterError(f"block_size debe ser > 0 (actual: {block_size}).")
+
+    rng = np.random.default_rng(seed)
+    width = n_nodes + len(branch_ids)
+    stats = _RunningStats(width)
+    reservoir = _Reservoir(min(reservoir_size, n_samples), width, rng)
+    passes = np.zeros(len(lim_cols), dtype=np.int64)
+    all_pass = 0
+
+    done = 0
+    while done < n_samples:
+        nb = min(block_size, n_samples - done)
+        draws = {}
+        for cid, (nominal, tol, dist) in specs.items():
+            if dist == "uniform":
+                dev = rng.uniform(-tol, tol, nb)
+            else:
+                # Truncada en ±3σ: con tol cerca de 1 la cola daría valores <= 0
+                dev = np.clip(rng.normal(0.0, tol / 3.0, nb), -tol, tol)
+            draws[cid] = nominal * (1.0 + dev)
+
+        P = cc.batch_parameters(draws) if draws else np.tile(cc.values, (nb, 1))
+        X = cc.solve_batch(P)
+        block = np.concatenate([X[:, :n_nodes], cc.pattern.branch_currents(X, P)], axis=1)
+
+        stats.update(block)
+        reservoir.update(block)
+        if len(lim_cols):
+            vals = block[:, lim_cols]
+            ok = (vals >= lim_lo) & (vals <= lim_hi)
+            passes += ok.sum(axis=0)
+            all_pass += int(ok.all(axis=1).sum())
+        else:
+            all_pass += nb
+        done += nb
+
+    pct = reservoir.percentiles(percentiles)
+    columns = {"mean": stats.mean, "std": stats.std, "min": stats.min, "max": stats.max}
+    for q, row in zip(percentiles, pct):
+        columns[f"p{q:g}"] = row
+
+    return MonteCarloResult(
+        n_samples=n_samples,
+        seed=seed,
+        node_ids=node_ids,
+        branch_ids=branch_ids,
+        voltage_stats={k: v[:n_nodes] for k, v in columns.items()},
+        current_stats={k: v[n_nodes:] for k, v in columns.items()},
+        limits=limits,
+        pass_counts={name: int(c) for name, c in zip(limits, passes)},
+        yield_fraction=all_pass / n_samples,
+    )
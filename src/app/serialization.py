@@ -1,25 +1,281 @@
+import gzip
+import io
 import json
-from typing import Any
+import os
+import re
+from array import array
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional, Tuple
+
+import numpy as np
+
 from ..domain.netlist import Netlist
+from ..domain.compact import (CompactNetlist, KIND_CODE, VALUE_ATTR, POLARITIES,
+                              SHOCKLEY_DEFAULTS, D as _D, DS as _DS)
 from ..domain.components.resistor import Resistor
 from ..domain.components.vsource import VSource
-from ..domain.components.diode import IdealDiode
+from ..domain.components.diode import IdealDiode, ShockleyDiode
+from ..domain.components.capacitor import Capacitor
+from ..domain.components.inductor import Inductor
+from .validation import ParameterError
+
+# Caracteres que se leen del archivo por bloque al parsear en streaming
+CHUNK_SIZE = 1 << 20
+# Primeros bytes de un archivo gzip
+GZIP_MAGIC = b"\x1f\x8b"
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+@contextmanager
+def _open_text(path: str):
+    """
+    Abre path como texto UTF-8, descomprimiendo si empieza con GZIP_MAGIC
+    (sin mirar la extensión). Devuelve también el archivo crudo, cuya
+    posición (en bytes comprimidos si es gzip) sirve para el progreso.
+    """
+    raw = open(path, "rb")
+    try:
+        stream = gzip.GzipFile(fileobj=raw, mode="rb") if raw.peek(2)[:2] == GZIP_MAGIC else raw
+        with io.TextIOWrapper(stream, encoding="utf-8") as f:
+            yield f, raw
+    finally:
+        raw.close()
+
+
+class _JSONStream:
+    """
+    Lector incremental de un documento JSON: recorre la estructura de a un
+    token y decodifica cada valor completo con JSONDecoder.raw_decode sobre
+    un buffer que se rellena por bloques. En memoria queda solo el bloque
+    actual, no el documento.
+    """
+    def __init__(self, f, chunk_size: int = CHUNK_SIZE, on_read: Optional[Callable[[], None]] = None):
+        self._f = f
+        self._chunk = chunk_size
+        self._on_read = on_read
+        self._buf = ""
+        self._pos = 0
+        self._eof = False
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: Optional[int] = None) -> bool:
+        """Agrega un bloque al buffer (descartando lo ya consumido); False al final."""
+        if self._eof:
+            return False
+        chunk = self._f.read(size or self._chunk)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        if self._on_read is not None:
+            self._on_read()
+        return True
+
+    def peek(self) -> str:
+        """Próximo carácter que no es espacio ("" al final del documento)."""
+        while True:
+            self._pos = _WS.match(self._buf, self._pos).end()
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, ch: str) -> None:
+        found = self.peek()
+        if found != ch:
+            raise ValueError(f"JSON inválido: se esperaba {ch!r} y se encontró {found or 'el final'!r}.")
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decodifica el próximo valor JSON completo."""
+        self.peek()
+        while True:
+            try:
+                obj, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # Valor cortado por el borde del bloque: se lee más (al
+                # menos lo que ya hay, para no re-decodificar demasiadas veces)
+                if not self._fill(max(self._chunk, len(self._buf) - self._pos)):
+                    raise
+                continue
+            # Un número al final del buffer puede seguir en el próximo bloque
+            if end == len(self._buf) and isinstance(obj, (int, float)) and self._fill():
+                continue
+            self._pos = end
+            return obj
+
+    def items(self) -> Iterator[Any]:
+        """Elementos del arreglo JSON que empieza en el cursor, de a uno."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        # scan_once es el escáner en C detrás de raw_decode, sin su envoltorio
+        scan, ws = self._decoder.scan_once, _WS.match
+        while True:
+            # Camino rápido: elemento y separador enteros dentro del buffer
+            buf, pos = self._buf, self._pos
+            try:
+                obj, end = scan(buf, pos)
+                sep = ws(buf, end).end()
+                ch = buf[sep]
+            except (StopIteration, json.JSONDecodeError, IndexError):
+                self._pos = pos
+                obj = self.value()
+                ch = self.peek()
+                sep = self._pos
+            if ch == ",":
+                self._pos = ws(self._buf, sep + 1).end()
+                yield obj
+            elif ch == "]":
+                self._pos = sep + 1
+                yield obj
+                return
+            else:
+                raise ValueError(f"JSON inválido: se esperaba ',' o ']' y se encontró {ch or 'el final'!r}.")
 
-def load_json(path: str) -> Netlist:
-    data = json.load(open(path, "r", encoding="utf-8"))
+
+def iter_netlist(path: str, progress: Optional[Callable[[int, int], None]] = None,
+                 chunk_size: int = CHUNK_SIZE) -> Iterator[Tuple[str, dict]]:
+    """
+    Recorre un netlist JSON (o JSON comprimido con gzip) sin cargarlo
+    entero: produce ("node", {...}) por cada elemento de "nodes" y
+    ("component", {...}) por cada uno de "components", en el orden del
+    archivo. Las demás claves se leen y descartan.
+
+    progress(leídos, total) recibe los bytes del archivo procesados tras
+    cada bloque y (total, total) al terminar.
+    """
+    total = os.path.getsize(path)
+    with _open_text(path) as (f, raw):
+        on_read = (lambda: progress(raw.tell(), total)) if progress is not None else None
+        js = _JSONStream(f, chunk_size, on_read)
+        js.expect("{")
+        more = js.peek() != "}"
+        while more:
+            key = js.value()
+            js.expect(":")
+            if key in ("nodes", "components") and js.peek() == "[":
+                event = key[:-1]
+                for item in js.items():
+                    yield event, item
+            else:
+                js.value()
+            more = js.peek() == ","
+            if more:
+                js.expect(",")
+        js.expect("}")
+    if progress is not None:
+        progress(total, total)
+
+
+def _component(c: dict):
+    """Component de un elemento de "components" (None si el tipo no se conoce)."""
+    if c["kind"] == "R":
+        return Resistor(c["id"], c["n1"], c["n2"], c["R"])
+    elif c["kind"] == "V":
+        return VSource(c["id"], c["n1"], c["n2"], c["V"])
+    elif c["kind"] == "D":
+        return IdealDiode(c["id"], c["n1"], c["n2"], c.get("polarity","A_to_K"))
+    elif c["kind"] == "DS":
+        return ShockleyDiode(c["id"], c["n1"], c["n2"], c.get("Is", 1e-14),
+                             c.get("n", 1.0), c.get("Vt", 0.025852),
+                             c.get("polarity", "A_to_K"))
+    elif c["kind"] == "C":
+        return Capacitor(c["id"], c["n1"], c["n2"], c["C"])
+    elif c["kind"] == "L":
+        return Inductor(c["id"], c["n1"], c["n2"], c["L"])
+    return None
+
+
+def load_json(path: str, compact: bool = False, progress: Optional[Callable[[int, int], None]] = None,
+              chunk_size: int = CHUNK_SIZE):
+    """
+    Carga un netlist JSON (o JSON.gz, detectado por su contenido) leyéndolo
+    en streaming con iter_netlist.
+
+    Con compact=True devuelve un CompactNetlist armado directamente desde
+    los elementos, sin objetos Component ni el documento en memoria: el
+    pico de memoria queda cerca del de los arreglos finales. progress
+    como en iter_netlist.
+    """
+    events = iter_netlist(path, progress, chunk_size)
+    if compact:
+        return _load_compact(events)
     nl = Netlist()
-    for n in data["nodes"]:
-        nl.add_node(n["id"], n.get("is_ground", False))
-    for c in data["components"]:
-        if c["kind"] == "R":
-            nl.add_component(Resistor(c["id"], c["n1"], c["n2"], c["R"]))
-        elif c["kind"] == "V":
-            nl.add_component(VSource(c["id"], c["n1"], c["n2"], c["V"]))
-        elif c["kind"] == "D":
-            nl.add_component(IdealDiode(c["id"], c["n1"], c["n2"], c.get("polarity","A_to_K")))
+    for event, item in events:
+        if event == "node":
+            nl.add_node(item["id"], item.get("is_ground", False))
+        else:
+            c = _component(item)
+            if c is not None:
+                nl.add_component(c)
     return nl
 
+
+def _load_compact(events) -> CompactNetlist:
+    names, index, ground = [], {}, array("b")
+    ids, kind, n1, n2 = [], array("b"), array("i"), array("i")
+    value, polarity, shockley = array("d"), array("b"), {}
+    # Nodos usados por un componente antes de declararse: código provisorio
+    # -2, -3... que se resuelve al final (ver CompactNetlist.undeclared si
+    # nunca se declaran)
+    pending = {}
+
+    def late(nid) -> int:
+        return pending.setdefault(nid, -2 - len(pending))
+
+    for event, item in events:
+        if event == "node":
+            nid, g = item["id"], bool(item.get("is_ground", False))
+            i = index.get(nid)
+            if i is None:
+                index[nid] = len(names)
+                names.append(nid)
+                ground.append(g)
+            elif g:
+                ground[i] = 1
+            continue
+        code = KIND_CODE.get(item["kind"])
+        if code is None:
+            continue
+        k = len(ids)
+        ids.append(item["id"])
+        kind.append(code)
+        i, j = index.get(item["n1"]), index.get(item["n2"])
+        n1.append(i if i is not None else late(item["n1"]))
+        n2.append(j if j is not None else late(item["n2"]))
+        attr = VALUE_ATTR.get(item["kind"])
+        value.append(float(item[attr]) if attr else 0.0)
+        pol = 0
+        if code in (_D, _DS):
+            name = item.get("polarity", "A_to_K")
+            if name not in POLARITIES:
+                raise ParameterError(f"{item['id']}: polarity inválida: {name}.", components=[item["id"]])
+            pol = POLARITIES.index(name)
+            if code == _DS:
+                shockley[k] = tuple(float(item.get(p, d)) for p, d in zip(("Is", "n", "Vt"), SHOCKLEY_DEFAULTS))
+        polarity.append(pol)
+
+    # Vistas sin copia sobre los array de la biblioteca estándar
+    a1, a2 = np.asarray(n1), np.asarray(n2)
+    undeclared = [nid for nid in pending if nid not in index]
+    if pending:
+        # Los que nunca se declaran quedan como -1 - j con su nombre en undeclared[j]
+        where = {nid: j for j, nid in enumerate(undeclared)}
+        lut = np.array([index[nid] if nid in index else -1 - where[nid] for nid in pending],
+                       dtype=np.int32)
+        for a in (a1, a2):
+            late = a <= -2
+            a[late] = lut[-2 - a[late]]
+    return CompactNetlist(names, np.asarray(ground), ids, np.asarray(kind), a1, a2,
+                          np.asarray(value), np.asarray(polarity), shockley, undeclared)
+
+
 def save_json(nl: Netlist, path: str) -> None:
+    """Guarda el netlist (Netlist o CompactNetlist) como JSON; comprimido si path termina en .gz."""
     out: dict[str, Any] = {
         "nodes": [{"id": n.id, "is_ground": n.is_ground} for n in nl.nodes.values()],
         "components": []
@@ -29,5 +285,11 @@ def save_json(nl: Netlist, path: str) -> None:
         if c.kind == "R": item["R"] = c.R
         if c.kind == "V": item["V"] = c.V
         if c.kind == "D": item["polarity"] = c.polarity
+        if c.kind == "DS":
+            item.update(Is=c.Is, n=c.n, Vt=c.Vt, polarity=c.polarity)
+        if c.kind == "C": item["C"] = c.C
+        if c.kind == "L": item["L"] = c.L
         out["components"].append(item)
-    json.dump(out, open(path, "w", encoding="utf-8"), indent=2)
+    opener = gzip.open if path.endswith(".gz") else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(out, f, indent=2)
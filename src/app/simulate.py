@@ -1,15 +1,173 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import numpy as np
+
 from ..analysis.tableau import build_system
-from ..analysis.solver import LinearSolver
+from ..analysis.solver import Factorization, LinearSolver
 from ..analysis.checks import run_checks
-from ..analysis.results import Solution
+from ..analysis.results import Solution, SolveStats
+from ..analysis.compiled import CompiledCircuit
+from ..analysis.diodes import DiodeStateSolver, solve_ideal_diodes
+from ..analysis.newton import NewtonSolver
+from ..analysis.blocks import decompose, merge_solutions
+from ..analysis.elimination import eliminate_sources
+from ..analysis.reduction import reduce_netlist
 from .validation import validate
 
-def simulate(nl) -> Solution:
+logger = logging.getLogger(__name__)
+
+
+def _condition(M) -> Optional[float]:
+    """
+    κ₁ de la matriz final de los caminos no lineales. Como en LinearSolver,
+    solo se estima sin pedirlo en el modo denso (un LU más, n pequeño).
+    """
+    if hasattr(M, "nnz"):
+        return None
+    try:
+        return Factorization(M).condition(M)
+    except (np.linalg.LinAlgError, ValueError):
+        return None
+
+
+def _solve_netlist(nl, diode_method: str = "auto", newton_options=None,
+                   eliminate: bool = True, linear_method: str = "direct",
+                   diagnosis=None) -> Solution:
+    """
+    Pasos 2 a 4 de simulate() sobre un netlist ya validado (sin checks).
+    diagnosis: el que devolvió validate(nl), para no recorrer el grafo otra vez.
+    """
+    stats = SolveStats()
+    # Paso 2: Construir el sistema de ecuaciones
+    t0 = time.perf_counter()
+    try:
+        A, b, meta = build_system(nl, diagnosis=diagnosis)
+    except ValueError as e:
+        raise ValueError(f"Error al construir el sistema: {e}")
+    t1 = time.perf_counter()
+    stats.stages["build"] = t1 - t0
+    stats.regularized = list(meta.regularized)
+    K = A
+
+    # Paso 3: Resolver el sistema
+    diode_states = {}
+    newton_info = {}
+    if meta.diode_indices and meta.shockley:
+        raise ValueError(
+            "No se pueden combinar diodos ideales y diodos Shockley en el mismo circuito."
+        )
+    try:
+        if meta.shockley:
+            # Diodos Shockley: Newton–Raphson sobre la parte lineal ya ensamblada
+            newton = NewtonSolver(A, b, meta, **(newton_options or {}))
+            x = newton.solve()
+            newton_info = newton.info
+            # Residuo no lineal y κ del jacobiano en la solución
+            K = newton.jacobian_at(x)
+            stats.method = "newton"
+            stats.residual, stats.condition = newton.residual(x), _condition(K)
+        elif meta.diode_indices:
+            # Diodos ideales: iteración de estados ON/OFF sobre una
+            # única factorización
+            engine = DiodeStateSolver(A, b, meta)
+            x, diode_states, used = solve_ideal_diodes(A, b, meta, method=diode_method,
+                                                       engine=engine)
+            # Matriz con los diodos en su estado final: la que x resuelve
+            K = engine.state_matrix(diode_states)
+            stats.method = f"diodes-{used}"
+            stats.residual = float(np.linalg.norm(K @ x - b))
+            stats.condition = _condition(K)
+        else:
+            solver = LinearSolver(method=linear_method)
+            elim = eliminate_sources(A, b, meta) if eliminate else None
+            if elim is not None:
+                # Sistema nodal reducido, simétrico: Cholesky o CG
+                x = elim.solve(solver)
+                K = elim.K
+                stats.method, stats.condition = elim.method_used, elim.condition
+            else:
+                x = solver.solve(A, b, labels=meta.unknown_labels())
+                stats.method, stats.condition = solver.method_used, solver.condition
+            # Un producto matriz-vector: barato frente al solve
+            stats.residual = float(np.linalg.norm(A @ x - b))
+    except Exception as e:
+        raise ValueError(
+            f"Error al resolver el sistema de ecuaciones: {e}\n\n"
+            "Posibles causas:\n"
+            "• Nodos flotantes (sin conexión a GND)\n"
+            "• Fuentes de voltaje en cortocircuito\n"
+            "• Componentes con valores inválidos\n"
+            "• Circuito mal conectado"
+        )
+
+    t2 = time.perf_counter()
+    stats.stages["solve"] = t2 - t1
+    stats.n = int(K.shape[0])
+    stats.nnz = int(K.nnz) if hasattr(K, "nnz") else int(np.count_nonzero(K))
+    stats.sparse = hasattr(K, "nnz")
+
+    # Paso 4: Reconstruir la solución
+    sol = meta.reconstruct_solution(x, diode_states)
+    sol.newton = newton_info
+    stats.stages["reconstruct"] = time.perf_counter() - t2
+    sol.stats = stats
+    return sol
+
+
+def _solve_blocks(nl, dec, diode_method, newton_options, workers,
+                  eliminate=True, linear_method="direct") -> Solution:
+    """Resuelve cada bloque en un pool de hilos y une los resultados."""
+    def solve_block(block):
+        return _solve_netlist(block.netlist, diode_method, newton_options,
+                              eliminate, linear_method)
+
+    workers = workers or min(len(dec.blocks), os.cpu_count() or 1)
+    if workers <= 1:
+        solutions = [solve_block(block) for block in dec.blocks]
+    else:
+        # LAPACK libera el GIL: las factorizaciones corren en paralelo
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            solutions = list(pool.map(solve_block, dec.blocks))
+    sol = merge_solutions(nl, dec, solutions)
+    sol.stats = SolveStats.combine(s.stats for s in solutions)
+    return sol
+
+
+def simulate(nl, diode_method: str = "auto", newton_options=None,
+             blocks: bool = True, workers: Optional[int] = None,
+             eliminate: bool = True, linear_method: str = "direct",
+             reduce: bool = False, stats_hook=None) -> Solution:
     """
     Simula el circuito y devuelve la solución con voltajes y corrientes.
     
     Args:
         nl: Netlist del circuito
+        diode_method: motor de diodos ideales: "pwl", "lcp", "pgs" o
+            "auto" (ver analysis.diodes)
+        newton_options: opciones de NewtonSolver para diodos Shockley
+            (max_iter, reltol, vntol, abstol, jacobian_reuse)
+        blocks: si el circuito se separa en bloques que solo comparten GND
+            o nodos fijados por fuentes a tierra (ver analysis.blocks), se
+            resuelve un sistema chico por bloque en lugar del completo
+        workers: hilos para resolver los bloques (por defecto, uno por
+            bloque hasta el número de CPUs)
+        eliminate: en circuitos lineales, eliminar fuentes de voltaje e
+            inductores por sustitución (ver analysis.elimination) y
+            resolver el sistema nodal reducido, simétrico
+        linear_method: "direct" (LU/Cholesky) o "cg" (gradiente conjugado
+            precondicionado, para mallas de resistores enormes)
+        reduce: antes de resolver, unir resistores en serie y en paralelo
+            y quitar nodos internos de grado 1 y 2 (ver analysis.reduction);
+            los voltajes y corrientes originales se recuperan después y
+            sol.reduction reporta lo quitado y los tiempos
+        stats_hook: destino de sol.stats (ver SolveStats) al terminar: un
+            callable que la recibe o un logging.Logger (nivel INFO). Las
+            estadísticas se registran siempre; el logger del módulo las
+            emite además en DEBUG
         
     Returns:
         Solution con voltajes nodales, corrientes y verificaciones
@@ -19,40 +177,51 @@ def simulate(nl) -> Solution:
         ValueError: Si el sistema no se puede resolver
     """
     try:
-        # Paso 1: Validar el circuito
-        validate(nl)
-        
-        # Paso 2: Construir el sistema de ecuaciones
-        try:
-            A, b, meta = build_system(nl)
-        except ValueError as e:
-            raise ValueError(f"Error al construir el sistema: {e}")
-        
-        # Paso 3: Resolver el sistema
-        try:
-            solver = LinearSolver()
-            x = solver.solve(A, b)
-        except Exception as e:
-            raise ValueError(
-                f"Error al resolver el sistema de ecuaciones: {e}\n\n"
-                "Posibles causas:\n"
-                "• Nodos flotantes (sin conexión a GND)\n"
-                "• Fuentes de voltaje en cortocircuito\n"
-                "• Componentes con valores inválidos\n"
-                "• Circuito mal conectado"
-            )
-        
-        # Paso 4: Reconstruir la solución
-        sol = meta.reconstruct_solution(x)
+        stages = {}
+        start = time.perf_counter()
+        # Paso 1: Validar el circuito (su diagnóstico topológico se reutiliza)
+        diagnosis = validate(nl)
+        t0 = time.perf_counter()
+        stages["validate"] = t0 - start
+
+        red = reduce_netlist(nl) if reduce else None
+        target = red.netlist if red is not None else nl
+        if reduce:
+            t1 = time.perf_counter()
+            stages["reduce"], t0 = t1 - t0, t1
+
+        dec = decompose(target) if blocks else None
+        if blocks:
+            stages["decompose"] = time.perf_counter() - t0
+        if dec is not None:
+            sol = _solve_blocks(target, dec, diode_method, newton_options, workers,
+                                eliminate, linear_method)
+        else:
+            sol = _solve_netlist(target, diode_method, newton_options, eliminate, linear_method,
+                                 diagnosis=diagnosis if target is nl else None)
+        stats = sol.stats or SolveStats()
+        stats.stages = {**stages, **stats.stages}
+
+        if red is not None:
+            t1 = time.perf_counter()
+            red.timings["solve"] = t1 - t0
+            sol = red.expand(sol)
+            sol.reduction = red.report()
+            stats.stages["expand"] = time.perf_counter() - t1
         
         # Paso 5: Verificar las leyes de Kirchhoff
+        t1 = time.perf_counter()
         try:
             sol.checks = run_checks(nl, sol)
         except Exception as e:
             # Si falla la verificación, continuar sin checks
-            print(f"Advertencia: no se pudieron verificar las leyes: {e}")
+            logger.warning("No se pudieron verificar las leyes: %s", e)
             sol.checks = {}
-        
+        end = time.perf_counter()
+        stats.stages["checks"] = end - t1
+        stats.stages["total"] = end - start
+        sol.stats = stats
+        _emit_stats(stats, stats_hook)
         return sol
         
     except Exception as e:
@@ -63,6 +232,36 @@ def simulate(nl) -> Solution:
                 "1. Hay nodos flotantes (sin conexión eléctrica a tierra)\n"
                 "2. Fuentes de voltaje conectadas directamente (cortocircuito)\n"
                 "3. Circuito mal formado o desconectado\n\n"
-                "Revisa las conexiones del circuito."
+                "Revisa las conexiones del circuito.\n\n"
+                f"Detalle: {e}"
             )
-        raise
\ No newline at end of file
+        raise
+
+
+def _emit_stats(stats: SolveStats, hook) -> None:
+    """Envía las estadísticas al hook de simulate() y al logger del módulo."""
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("simulate: %s", stats.summary())
+    if hook is None:
+        return
+    if isinstance(hook, logging.Logger):
+        if hook.isEnabledFor(logging.INFO):
+            hook.info("simulate: %s", stats.summary())
+    else:
+        hook(stats)
+
+
+def compile_circuit(nl, sparse=None, incremental: bool = False) -> CompiledCircuit:
+    """
+    Valida el circuito y lo compila para re-simular solo con cambios de valores.
+
+    Útil para edición interactiva y barridos: la topología se analiza una
+    vez y cada cc.update_values({...}); cc.solve() solo reescribe números.
+    Con incremental=True los cambios de resistores se aplican como
+    correcciones de rango bajo sobre la última factorización.
+    """
+    diagnosis = validate(nl)
+    try:
+        return CompiledCircuit(nl, sparse=sparse, incremental=incremental, diagnosis=diagnosis)
+    except ValueError as e:
+        raise ValueError(f"Error al construir el sistema: {e}")
@@ -0,0 +1,58 @@
+from typing import Dict, Optional
+
+import numpy as np
+
+from ..analysis.compiled import CompiledCircuit
+from ..analysis.results import SweepResult
+from .validation import validate
+
+
+def sweep(nl, values: Dict[str, np.ndarray], batch_size: Optional[int] = None) -> SweepResult:
+    """
+    Barrido de parámetros vectorizado.
+
+    En lugar de K llamadas a simulate(), valida y compila el circuito una
+    vez, ensambla las K variantes como una pila (K, n, n) y las resuelve
+    con un único np.linalg.solve por lote.
+
+    Args:
+        nl: Netlist del circuito
+        values: {"R1": arreglo de ohmios, "V1": arreglo de voltios, ...};
+            todos con la misma longitud K (los escalares se repiten)
+        batch_size: variantes por lote (K·n² flotantes por lote); None =
+            las que entran en BATCH_CHUNK_BYTES (CompiledCircuit.batch_size)
+
+    Returns:
+        SweepResult con voltajes (K, n_nodos) y corrientes (K, n_ramas)
+
+    Raises:
+        ValidationError: Si el circuito tiene errores de diseño
+        ValueError: Si alguna variante no se puede resolver
+    """
+    validate(nl)
+    try:
+        cc = CompiledCircuit(nl, sparse=False)
+    except ValueError as e:
+        raise ValueError(f"Error al construir el sistema: {e}")
+
+    P = cc.batch_parameters(values)
+    K = P.shape[0]
+    step = int(batch_size) if batch_size else cc.batch_size()
+
+    pattern = cc.pattern
+    n_nodes = len(cc.meta.node_index)
+    V = np.empty((K, n_nodes))
+    I = np.empty((K, len(pattern.comp_ids)))
+    for start in range(0, K, step):
+        sl = slice(start, start + step)
+        X = cc.solve_batch(P[sl])
+        V[sl] = X[:, :n_nodes]
+        I[sl] = pattern.branch_currents(X, P[sl])
+
+    return SweepResult(
+        parameters={cid: np.broadcast_to(np.asarray(v, dtype=float), (K,)) for cid, v in values.items()},
+        node_ids=list(cc.meta.node_index),
+        branch_ids=list(pattern.comp_ids),
+        node_voltages=V,
+        branch_currents=I,
+    )
@@ -0,0 +1,47 @@
+from typing import Callable, Dict, Optional, Union
+
+import numpy as np
+
+from ..analysis.results import TransientResult
+from ..analysis.transient import TransientSolver
+from .validation import validate
+
+
+def transient(
+    nl,
+    t_stop: float,
+    dt: float,
+    method: str = "trap",
+    initial: str = "op",
+    sources: Optional[Dict[str, Union[Callable, np.ndarray]]] = None,
+    out: Optional[str] = None,
+) -> TransientResult:
+    """
+    Análisis transitorio de paso fijo.
+
+    La matriz se factoriza una sola vez; cada paso solo actualiza b y hace
+    una sustitución triangular. Las formas de onda se escriben en un
+    arreglo preasignado (o en un memmap .npy si se indica out).
+
+    Args:
+        nl: Netlist del circuito (R, V, C, L)
+        t_stop: tiempo final (s)
+        dt: paso de tiempo (s)
+        method: "trap" (trapecios) o "be" (Euler hacia atrás)
+        initial: "op" (punto de operación DC) o "zero" (estado nulo)
+        sources: formas de onda de fuentes, {"V1": f(t) o arreglo}
+        out: ruta .npy para guardar las formas de onda en disco
+
+    Returns:
+        TransientResult con el tiempo y las formas de onda
+
+    Raises:
+        ValidationError: Si el circuito tiene errores de diseño
+        ValueError: Si el sistema no se puede resolver
+    """
+    validate(nl)
+    try:
+        engine = TransientSolver(nl, dt, method=method)
+    except ValueError as e:
+        raise ValueError(f"Error al construir el sistema: {e}")
+    return engine.run(t_stop, initial=initial, sources=sources, out=out)
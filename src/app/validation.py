@@ -1,59 +1,174 @@
 # src/app/validation.py
-from collections import defaultdict
-from typing import Iterable
+import logging
+
+import numpy as np
+
+from ..domain.compact import CompactNetlist
+from ..analysis.topology import Diagnosis, diagnose
+
+logger = logging.getLogger(__name__)
+
+
+class ValidationError(Exception):
+    """
+    Error de diseño del circuito. components y nodes son los ids
+    involucrados; problems, todos los errores encontrados cuando validate
+    los reúne en una sola excepción (si no, solo este).
+    """
+    def __init__(self, message: str = "", components=(), nodes=(), problems=None):
+        super().__init__(message)
+        self.components = list(components)
+        self.nodes = list(nodes)
+        self.problems = list(problems) if problems is not None else [self]
 
-class ValidationError(Exception): ...
 class ConnectivityError(ValidationError): ...
 class GroundError(ValidationError): ...
 class ParameterError(ValidationError): ...
 class TopologyError(ValidationError): ...
 
-def validate(nl):
+def validate(nl) -> Diagnosis:
+    """
+    Valida el netlist (Netlist o CompactNetlist) y devuelve su Diagnosis
+    topológico, que build_system puede reutilizar.
+
+    No se detiene en el primer error: reúne los problemas de tierra, de
+    cada componente, de conectividad y los lazos de fuentes de voltaje o
+    inductores, y los lanza juntos (ver _raise). Las situaciones legales
+    pero sospechosas (nodos con una sola conexión, alimentados solo por
+    diodos o por capacitores) quedan en diagnosis.warnings.
+    """
+    compact = isinstance(nl, CompactNetlist)
+    problems = []
+
     # 1) Un único GND
-    gnds = [nid for nid, n in nl.nodes.items() if n.is_ground]
+    if compact:
+        gnds = [nl.node_names[i] for i in np.flatnonzero(nl.is_ground).tolist()]
+    else:
+        gnds = [nid for nid, n in nl.nodes.items() if n.is_ground]
     if len(gnds) == 0:
-        raise GroundError("Falta definir un nodo de tierra (GND).")
+        problems.append(GroundError("Falta definir un nodo de tierra (GND)."))
     if len(gnds) > 1:
-        raise GroundError(f"Hay {len(gnds)} nodos marcados como tierra; debe ser exactamente 1.")
+        problems.append(GroundError(
+            f"Hay {len(gnds)} nodos marcados como tierra; debe ser exactamente 1.", nodes=gnds))
 
     # 2) Componentes presentes
-    if not nl.components:
-        raise ValidationError("No hay componentes en el circuito.")
+    if not len(nl.components):
+        problems.append(ValidationError("No hay componentes en el circuito."))
 
     # 3) Nodos válidos, extremos distintos y parámetros sanos
-    for c in nl.components:
-        if c.n1 not in nl.nodes or c.n2 not in nl.nodes:
-            raise TopologyError(f"{c.id}: terminal conectado a nodo inexistente ({c.n1}/{c.n2}).")
-        if c.n1 == c.n2:
-            raise TopologyError(f"{c.id}: ambos terminales al mismo nodo ({c.n1}).")
-        if getattr(c, "kind", "") == "R":
-            R = float(getattr(c, "R", 0))
-            if not (R > 0):
-                raise ParameterError(f"{c.id}: la resistencia R debe ser > 0 (actual: {R}).")
-        if getattr(c, "kind", "") == "V":
-            # Fuente ideal puede ser cualquier valor real (incluye 0)
-            pass
-        if getattr(c, "kind", "") == "D":
-            pol = getattr(c, "polarity", "A_to_K")
-            if pol not in ("A_to_K", "K_to_A"):
-                raise ParameterError(f"{c.id}: polarity inválida: {pol}.")
-
-    # 4) Conectividad (desde GND alcanzamos todos los nodos?)
-    _assert_connected(nl, start=gnds[0])
-
-    # 5) Sin ramas colgantes (terminales de componentes no conectan a nada más?) — opcional suave
-    #    Permitimos resistencias/fuentes/diodos directos a GND o entre nodos si el grafo general es conexo.
-
-def _assert_connected(nl, start: str):
-    adj = defaultdict(set)
-    for c in nl.components:
-        adj[c.n1].add(c.n2); adj[c.n2].add(c.n1)
-    seen = set([start]); stack = [start]
-    while stack:
-        u = stack.pop()
-        for v in adj[u]:
-            if v not in seen:
-                seen.add(v); stack.append(v)
-    missing = set(nl.nodes.keys()) - seen
-    if missing:
-        raise ConnectivityError("Nodos desconectados del GND: " + ", ".join(sorted(missing)))
+    problems += _compact_problems(nl) if compact else _component_problems(nl.components, nl.nodes)
+
+    # 4) Grafo: conectividad con GND y lazos de fuentes, en una pasada
+    diag = None
+    if len(gnds) == 1 and len(nl.components):
+        diag = diagnose(nl)
+        problems += _graph_problems(diag)
+
+    _raise(problems)
+    for w in diag.warnings:
+        logger.debug(w)
+    return diag
+
+def _check_component(c, nodes):
+    """Nodos, extremos y parámetros de un componente (lanza ValidationError)."""
+    if c.n1 not in nodes or c.n2 not in nodes:
+        raise TopologyError(f"{c.id}: terminal conectado a nodo inexistente ({c.n1}/{c.n2}).",
+                            nodes=[nid for nid in (c.n1, c.n2) if nid not in nodes])
+    if c.n1 == c.n2:
+        raise TopologyError(f"{c.id}: ambos terminales al mismo nodo ({c.n1}).")
+    if getattr(c, "kind", "") == "R":
+        R = float(getattr(c, "R", 0))
+        if not (R > 0):
+            raise ParameterError(f"{c.id}: la resistencia R debe ser > 0 (actual: {R}).")
+    if getattr(c, "kind", "") in ("C", "L"):
+        name = c.kind
+        val = float(getattr(c, name, 0))
+        if not (val > 0):
+            raise ParameterError(f"{c.id}: el valor {name} debe ser > 0 (actual: {val}).")
+    if getattr(c, "kind", "") == "V":
+        # Fuente ideal puede ser cualquier valor real (incluye 0)
+        pass
+    if getattr(c, "kind", "") in ("D", "DS"):
+        pol = getattr(c, "polarity", "A_to_K")
+        if pol not in ("A_to_K", "K_to_A"):
+            raise ParameterError(f"{c.id}: polarity inválida: {pol}.")
+    if getattr(c, "kind", "") == "DS":
+        for name in ("Is", "n", "Vt"):
+            val = float(getattr(c, name, 0))
+            if not (val > 0):
+                raise ParameterError(f"{c.id}: el parámetro {name} debe ser > 0 (actual: {val}).")
+
+def _component_problems(components, nodes) -> list:
+    """Un ValidationError por cada componente con algún problema."""
+    out = []
+    for c in components:
+        try:
+            _check_component(c, nodes)
+        except ValidationError as e:
+            e.components = [c.id]
+            out.append(e)
+    return out
+
+def _compact_problems(cn: CompactNetlist) -> list:
+    """_component_problems sobre los arreglos: solo revisa uno por uno los sospechosos."""
+    bad = (cn.n1 < 0) | (cn.n2 < 0) | (cn.n1 == cn.n2)
+    bad |= cn.mask("R", "C", "L") & ~(cn.value > 0)
+    for k, (Is, n, Vt) in cn.shockley.items():
+        if not (Is > 0 and n > 0 and Vt > 0):
+            bad[k] = True
+    out = []
+    for k in np.flatnonzero(bad).tolist():
+        c = cn.components[k]
+        if cn.n1[k] < 0 or cn.n2[k] < 0:
+            n1, n2 = _node_name(cn, cn.n1[k]), _node_name(cn, cn.n2[k])
+            missing = [nid for i, nid in ((cn.n1[k], n1), (cn.n2[k], n2)) if i < 0]
+            out.append(TopologyError(f"{c.id}: terminal conectado a nodo inexistente ({n1}/{n2}).",
+                                     components=[c.id], nodes=missing))
+        else:
+            out += _component_problems([c], cn.node_index)
+    return out
+
+def _node_name(cn: CompactNetlist, i) -> str:
+    """Nombre del nodo i, o "?" si es un nodo no declarado sin nombre."""
+    try:
+        return cn.node_name(i)
+    except ValueError:
+        return "?"
+
+def _graph_problems(diag: Diagnosis) -> list:
+    """Nodos sin camino a GND y lazos de fuentes, con los componentes involucrados."""
+    out = []
+    g = diag.graph
+    if diag.disconnected:
+        index = {nid: i for i, nid in enumerate(g.node_names)}
+        loose = np.zeros(len(g.node_names), dtype=bool)
+        loose[[index[nid] for nid in diag.disconnected]] = True
+        touch = ((g.a >= 0) & loose[g.a]) | ((g.b >= 0) & loose[g.b])
+        out.append(ConnectivityError(
+            "Nodos desconectados del GND: " + ", ".join(sorted(diag.disconnected)),
+            components=[g.ids[k] for k in np.flatnonzero(touch).tolist()],
+            nodes=diag.disconnected))
+    for loop in diag.vsource_loops:
+        out.append(TopologyError(
+            "Lazo de fuentes de voltaje o inductores: " + ", ".join(loop)
+            + " (fijan dos veces la misma diferencia de potencial).", components=loop))
+    return out
+
+def _raise(problems: list):
+    """
+    Lanza los problemas encontrados: uno solo tal cual; varios como una
+    excepción con todos los mensajes y .problems, de su clase común (o
+    ValidationError si son de clases distintas).
+    """
+    if not problems:
+        return
+    if len(problems) == 1:
+        raise problems[0]
+    classes = {type(p) for p in problems}
+    cls = classes.pop() if len(classes) == 1 else ValidationError
+    raise cls(
+        f"{len(problems)} problemas en el circuito:\n" + "\n".join(f"- {p}" for p in problems),
+        components=list(dict.fromkeys(cid for p in problems for cid in p.components)),
+        nodes=list(dict.fromkeys(nid for p in problems for nid in p.nodes)),
+        problems=problems,
+    )
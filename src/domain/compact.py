@@ -0,0 +1,325 @@
+import math
+from collections.abc import Mapping, Sequence
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .netlist import Netlist
+from .node import Node
+from .components.resistor import Resistor
+from .components.vsource import VSource
+from .components.diode import IdealDiode, ShockleyDiode
+from .components.capacitor import Capacitor
+from .components.inductor import Inductor
+
+# Código entero de cada tipo de componente (índice en KINDS)
+KINDS = ("R", "V", "D", "DS", "C", "L")
+KIND_CODE = {k: i for i, k in enumerate(KINDS)}
+R, V, D, DS, C, L = range(len(KINDS))
+# Atributo de value según el tipo (los diodos no tienen valor)
+VALUE_ATTR = {"R": "R", "V": "V", "C": "C", "L": "L"}
+# polarity: 0 = "A_to_K", 1 = "K_to_A"
+POLARITIES = ("A_to_K", "K_to_A")
+# Parámetros de los diodos Shockley por defecto (ver ShockleyDiode)
+SHOCKLEY_DEFAULTS = (1e-14, 1.0, 0.025852)
+
+
+class CompactComponent:
+    """
+    Vista de solo lectura del componente k de un CompactNetlist.
+
+    Tiene los mismos atributos que el Component equivalente (id, n1, n2,
+    kind, R/V/C/L, polarity...), leídos de los arreglos en cada acceso.
+    """
+    __slots__ = ("_nl", "_k")
+    kind = ""
+
+    def __init__(self, nl: "CompactNetlist", k: int):
+        self._nl = nl
+        self._k = k
+
+    @property
+    def id(self) -> str:
+        return self._nl.ids[self._k]
+
+    @property
+    def n1(self) -> str:
+        return self._nl.node_name(self._nl.n1[self._k])
+
+    @property
+    def n2(self) -> str:
+        return self._nl.node_name(self._nl.n2[self._k])
+
+    def _value(self) -> float:
+        return float(self._nl.value[self._k])
+
+    def to_component(self):
+        """Component equivalente (objeto independiente de los arreglos)."""
+        raise NotImplementedError
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.id!r}, {self.n1!r}, {self.n2!r})"
+
+
+class CompactResistor(CompactComponent):
+    __slots__ = ()
+    kind = "R"
+    R = property(CompactComponent._value)
+
+    def to_component(self):
+        return Resistor(self.id, self.n1, self.n2, self.R)
+
+
+class CompactVSource(CompactComponent):
+    __slots__ = ()
+    kind = "V"
+    V = property(CompactComponent._value)
+
+    def to_component(self):
+        return VSource(self.id, self.n1, self.n2, self.V)
+
+
+class CompactCapacitor(CompactComponent):
+    __slots__ = ()
+    kind = "C"
+    C = property(CompactComponent._value)
+
+    def to_component(self):
+        return Capacitor(self.id, self.n1, self.n2, self.C)
+
+
+class CompactInductor(CompactComponent):
+    __slots__ = ()
+    kind = "L"
+    L = property(CompactComponent._value)
+
+    def to_component(self):
+        return Inductor(self.id, self.n1, self.n2, self.L)
+
+
+class CompactIdealDiode(CompactComponent):
+    __slots__ = ()
+    kind = "D"
+
+    @property
+    def polarity(self) -> str:
+        return POLARITIES[self._nl.polarity[self._k]]
+
+    @property
+    def anode(self) -> str:
+        return self.n2 if self._nl.polarity[self._k] else self.n1
+
+    @property
+    def cathode(self) -> str:
+        return self.n1 if self._nl.polarity[self._k] else self.n2
+
+    def to_component(self):
+        return IdealDiode(self.id, self.n1, self.n2, self.polarity)
+
+
+class CompactShockleyDiode(CompactIdealDiode):
+    __slots__ = ()
+    kind = "DS"
+
+    @property
+    def Is(self) -> float:
+        return self._nl.shockley[self._k][0]
+
+    @property
+    def n(self) -> float:
+        return self._nl.shockley[self._k][1]
+
+    @property
+    def Vt(self) -> float:
+        return self._nl.shockley[self._k][2]
+
+    def current(self, vak: float) -> float:
+        Is, n, Vt = self._nl.shockley[self._k]
+        return Is * math.expm1(min(vak / (n * Vt), 700.0))
+
+    def to_component(self):
+        Is, n, Vt = self._nl.shockley[self._k]
+        return ShockleyDiode(self.id, self.n1, self.n2, Is, n, Vt, self.polarity)
+
+
+_VIEW_CLASS = (CompactResistor, CompactVSource, CompactIdealDiode, CompactShockleyDiode,
+               CompactCapacitor, CompactInductor)
+
+
+class _NodeView(Mapping):
+    """nodes de un CompactNetlist: id -> Node, creados al pedirlos."""
+    __slots__ = ("_nl",)
+
+    def __init__(self, nl):
+        self._nl = nl
+
+    def __getitem__(self, nid):
+        i = self._nl.node_index[nid]
+        return Node(id=nid, is_ground=bool(self._nl.is_ground[i]))
+
+    def __contains__(self, nid):
+        return nid in self._nl.node_index
+
+    def __iter__(self):
+        return iter(self._nl.node_names)
+
+    def __len__(self) -> int:
+        return len(self._nl.node_names)
+
+
+class _ComponentView(Sequence):
+    """components de un CompactNetlist: vistas CompactComponent creadas al pedirlas."""
+    __slots__ = ("_nl",)
+
+    def __init__(self, nl):
+        self._nl = nl
+
+    def __getitem__(self, k):
+        if isinstance(k, slice):
+            return [self[i] for i in range(*k.indices(len(self)))]
+        if k < 0:
+            k += len(self)
+        if not 0 <= k < len(self):
+            raise IndexError(k)
+        return _VIEW_CLASS[self._nl.kind[k]](self._nl, k)
+
+    def __iter__(self):
+        nl = self._nl
+        for k, code in enumerate(nl.kind.tolist()):
+            yield _VIEW_CLASS[code](nl, k)
+
+    def __len__(self) -> int:
+        return len(self._nl.ids)
+
+
+class CompactNetlist:
+    """
+    Netlist como estructura de arreglos, con ids de nodo enteros.
+
+    node_names[i] es el nombre del nodo i e is_ground[i] si es tierra. Por
+    componente k: ids[k], kind[k] (código en KINDS), n1[k] y n2[k] (nodos
+    enteros), value[k] (R, V, C o L; 0 en los diodos) y polarity[k]
+    (0 = "A_to_K", 1 = "K_to_A"). shockley guarda (Is, n, Vt) de cada
+    diodo Shockley por posición.
+
+    Un terminal conectado a un nodo no declarado vale -1 - j, con su
+    nombre en undeclared[j]: no es un nodo del circuito (validate lo
+    reporta por nombre) pero las vistas y to_netlist() lo conservan.
+
+    Ocupa una fracción de la memoria de un Netlist (sin un objeto por
+    componente ni cadenas repetidas por terminal) y las etapas que lo
+    aceptan (validate, build_system, reconstruct_solution, run_checks)
+    trabajan sobre los arreglos. nodes y components son vistas con la
+    interfaz de Netlist para el resto del código.
+    """
+    def __init__(self, node_names: List[str], is_ground, ids: List[str], kind, n1, n2, value,
+                 polarity=None, shockley: Optional[Dict[int, tuple]] = None,
+                 undeclared: Optional[List[str]] = None):
+        self.node_names = list(node_names)
+        self.undeclared = list(undeclared or [])
+        self.node_index = {nid: i for i, nid in enumerate(self.node_names)}
+        self.is_ground = np.asarray(is_ground, dtype=bool)
+        self.ids = list(ids)
+        m = len(self.ids)
+        self.kind = np.asarray(kind, dtype=np.int8)
+        self.n1 = np.asarray(n1, dtype=np.int32)
+        self.n2 = np.asarray(n2, dtype=np.int32)
+        self.value = np.asarray(value, dtype=float)
+        self.polarity = (np.zeros(m, dtype=np.int8) if polarity is None
+                         else np.asarray(polarity, dtype=np.int8))
+        self.shockley = dict(shockley or {})
+        for k in np.flatnonzero(self.kind == DS).tolist():
+            self.shockley.setdefault(k, SHOCKLEY_DEFAULTS)
+        self._id_index = None
+
+    @classmethod
+    def from_netlist(cls, nl: Netlist) -> "CompactNetlist":
+        names = list(nl.nodes)
+        index = {nid: i for i, nid in enumerate(names)}
+        undeclared = {}
+
+        def node(nid) -> int:
+            i = index.get(nid)
+            return i if i is not None else -1 - undeclared.setdefault(nid, len(undeclared))
+
+        comps = nl.components
+        m = len(comps)
+        shockley = {k: (c.Is, c.n, c.Vt) for k, c in enumerate(comps) if c.kind == "DS"}
+        return cls(
+            node_names=names,
+            is_ground=[n.is_ground for n in nl.nodes.values()],
+            ids=[c.id for c in comps],
+            kind=np.fromiter((KIND_CODE[c.kind] for c in comps), dtype=np.int8, count=m),
+            # Negativos: nodos no declarados (ver undeclared; los reporta validate)
+            n1=np.fromiter((node(c.n1) for c in comps), dtype=np.int32, count=m),
+            n2=np.fromiter((node(c.n2) for c in comps), dtype=np.int32, count=m),
+            value=np.fromiter((getattr(c, VALUE_ATTR.get(c.kind, ""), 0.0) for c in comps),
+                              dtype=float, count=m),
+            polarity=np.fromiter((getattr(c, "polarity", "A_to_K") == "K_to_A" for c in comps),
+                                 dtype=np.int8, count=m),
+            shockley=shockley,
+            undeclared=list(undeclared),
+        )
+
+    def to_netlist(self) -> Netlist:
+        nl = Netlist()
+        for nid, g in zip(self.node_names, self.is_ground.tolist()):
+            nl.add_node(nid, is_ground=g)
+        for c in self.components:
+            nl.add_component(c.to_component())
+        return nl
+
+    def node_name(self, i: int) -> str:
+        """Nombre del nodo entero i (incluidos los no declarados, i < 0)."""
+        if i >= 0:
+            return self.node_names[i]
+        j = -1 - int(i)
+        if j >= len(self.undeclared):
+            raise ValueError(f"Nodo {i} fuera de rango (sin nombre en undeclared).")
+        return self.undeclared[j]
+
+    @property
+    def nodes(self) -> _NodeView:
+        return _NodeView(self)
+
+    @property
+    def components(self) -> _ComponentView:
+        return _ComponentView(self)
+
+    @property
+    def id_index(self) -> Dict[str, int]:
+        """id -> posición del componente (se arma al primer uso)."""
+        if self._id_index is None:
+            self._id_index = {cid: k for k, cid in enumerate(self.ids)}
+        return self._id_index
+
+    def component(self, cid: str) -> CompactComponent:
+        """Vista del componente con id cid."""
+        return self.components[self.id_index[cid]]
+
+    def ground_id(self) -> str:
+        g = np.flatnonzero(self.is_ground)
+        if not len(g):
+            raise ValueError("Falta nodo de tierra (GND).")
+        return self.node_names[g[0]]
+
+    def mask(self, *kinds: str) -> np.ndarray:
+        """Componentes de los tipos dados, como máscara booleana."""
+        return np.isin(self.kind, [KIND_CODE[k] for k in kinds])
+
+    def terminals(self) -> np.ndarray:
+        """(m, 2) nodos enteros en el sentido de la corriente (ánodo → cátodo en diodos)."""
+        swap = self.polarity.astype(bool) & self.mask("D", "DS")
+        return np.stack([np.where(swap, self.n2, self.n1), np.where(swap, self.n1, self.n2)], axis=1)
+
+    def to_dict(self):
+        return self.to_netlist().to_dict()
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria de los arreglos (sin contar las cadenas de ids y nombres)."""
+        return sum(a.nbytes for a in (self.is_ground, self.kind, self.n1, self.n2,
+                                      self.value, self.polarity))
+
+    def __len__(self) -> int:
+        return len(self.ids)
@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from typing import Literal
 
-ComponentKind = Literal["R", "V", "D"]  # Resistor, VSource, Diode
+ComponentKind = Literal["R", "V", "D", "DS", "C", "L"]  # Resistor, VSource, Diode, Diodo Shockley, Capacitor, Inductor
 
 @dataclass
 class Component:
@@ -1,3 +1,4 @@
+import math
 from dataclasses import dataclass
 from .base import Component
 
@@ -7,3 +8,40 @@ class IdealDiode(Component):
     def __init__(self, id: str, n1: str, n2: str, polarity: str = "A_to_K"):
         super().__init__(id, n1, n2, "D")
         self.polarity = polarity
+
+    @property
+    def anode(self) -> str:
+        return self.n1 if self.polarity == "A_to_K" else self.n2
+
+    @property
+    def cathode(self) -> str:
+        return self.n2 if self.polarity == "A_to_K" else self.n1
+
+
+@dataclass
+class ShockleyDiode(Component):
+    """
+    Diodo exponencial: I = Is·(exp(V_ak / (n·Vt)) - 1).
+    """
+    Is: float = 1e-14   # corriente de saturación (A)
+    n: float = 1.0      # factor de idealidad
+    Vt: float = 0.025852  # voltaje térmico a 300 K (V)
+    polarity: str = "A_to_K"
+    def __init__(self, id: str, n1: str, n2: str, Is: float = 1e-14, n: float = 1.0,
+                 Vt: float = 0.025852, polarity: str = "A_to_K"):
+        super().__init__(id, n1, n2, "DS")
+        self.Is = float(Is)
+        self.n = float(n)
+        self.Vt = float(Vt)
+        self.polarity = polarity
+
+    @property
+    def anode(self) -> str:
+        return self.n1 if self.polarity == "A_to_K" else self.n2
+
+    @property
+    def cathode(self) -> str:
+        return self.n2 if self.polarity == "A_to_K" else self.n1
+
+    def current(self, vak: float) -> float:
+        return self.Is * math.expm1(min(vak / (self.n * self.Vt), 700.0))
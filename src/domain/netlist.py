@@ -41,6 +41,14 @@ class Netlist:
                 elem["value"] = c.V
             elif c.kind == "D":
                 elem["polarity"] = getattr(c, "polarity", "A_to_K")
+            elif c.kind == "DS":
+                elem["polarity"] = getattr(c, "polarity", "A_to_K")
+                elem["Is"] = c.Is
+                elem["n"] = c.n
+            elif c.kind == "C":
+                elem["value"] = c.C
+            elif c.kind == "L":
+                elem["value"] = c.L
             elements.append(elem)
         
         return {
@@ -46,13 +46,18 @@ from tkinter import filedialog
 # -------------------------------------------------
 #  BACKEND
 # -------------------------------------------------
-from src.app.simulate import simulate
+from src.app.cache import SimulationCache, DEFAULT_CACHE_DIR, topology_key
+from src.app.simulate import compile_circuit
 from src.app.export_pdf import export_solution_pdf
 from src.domain.netlist import Netlist
 from src.domain.components.resistor import Resistor
 from src.domain.components.vsource import VSource
 from src.domain.components.diode import IdealDiode
 
+# Resultados por circuito (memoria + disco): re-simular o exportar el mismo
+# canvas no vuelve a resolver el sistema
+SIM_CACHE = SimulationCache(cache_dir=DEFAULT_CACHE_DIR)
+
 # -------------------------------------------------
 #  CONSTANTES UI
 # -------------------------------------------------
@@ -347,6 +352,11 @@ class CircuitCanvas(FloatLayout):
         self._wire_first: Optional[Tuple[str, str]] = None
         self._ghost: Optional[InstructionGroup] = None
         self._gnd: Optional[Tuple[str, str]] = None
+        # Re-simulación al editar propiedades: circuito compilado en modo
+        # incremental y la topología con la que se compiló
+        self._simulated = False
+        self._compiled = None
+        self._compiled_key: Optional[str] = None
 
     def _setup(self, *_):
         self.bind(size=self._grid, pos=self._grid)
@@ -897,15 +907,43 @@ class CircuitCanvas(FloatLayout):
                 return
             
             nl = self.build_netlist()
-            sol = simulate(nl)
+            sol = SIM_CACHE.simulate(nl)
             app.show_results(sol)
             app.set_status("✓ Simulación completada exitosamente.")
+            self._simulated = True
         except Exception as e:
             app = App.get_running_app()
             error_msg = f"❌ Error: {str(e)}"
             app.set_status(error_msg)
             app.info_popup("Error de simulación", str(e))
 
+    def resimulate_after_edit(self):
+        """
+        Tras editar un valor de un circuito ya simulado, actualiza los
+        resultados sin rearmar el sistema: mientras la topología no cambie,
+        los cambios de R se aplican como correcciones de rango bajo sobre
+        la factorización anterior (CompiledCircuit incremental).
+        """
+        if not self._simulated or not self._connectivity_ok()[0]:
+            return
+        app = App.get_running_app()
+        nl = self.build_netlist()
+        key = topology_key(nl)
+        if self._compiled is None or key != self._compiled_key:
+            self._compiled = compile_circuit(nl, incremental=True)
+            self._compiled_key = key
+        else:
+            changed = {}
+            for c in nl.components:
+                if c.kind in ("R", "V"):
+                    attr = c.kind
+                    if getattr(self._compiled.component(c.id), attr) != getattr(c, attr):
+                        changed[c.id] = getattr(c, attr)
+            self._compiled.update_values(changed)
+        sol = self._compiled.solve(checks=True)
+        app.show_results(sol)
+        app.set_status("✓ Resultados actualizados.")
+
     def export_pdf_from_canvas(self):
         """Exporta el circuito y resultados a PDF"""
         try:
@@ -917,7 +955,7 @@ class CircuitCanvas(FloatLayout):
                 return
 
             nl = self.build_netlist()
-            sol = simulate(nl)
+            sol = SIM_CACHE.simulate(nl)
 
             # Preparar datos de solución
             solution = {
@@ -1128,6 +1166,7 @@ class CircuitCanvas(FloatLayout):
                 p.dismiss()
                 App.get_running_app().update_inspector(cw)
                 cw._redraw()
+                self.resimulate_after_edit()
             except Exception as e:
                 App.get_running_app().set_status(f"❌ Error: {e}")
 
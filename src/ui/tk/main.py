@@ -2,7 +2,7 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 import os
 from src.app.serialization import load_json
-from src.app.simulate import simulate
+from src.app.cache import SimulationCache, DEFAULT_CACHE_DIR
 from src.app.export_pdf import export_solution_pdf
 from src.ui.tk.tutorials import open_tutorial
 from src.ui.tk.errors import guard
@@ -13,6 +13,9 @@ TEMPLATES = {
     "Diodo OFF": "examples/diode_off.json"
 }
 
+# Resultados por circuito: "Exportar PDF" después de "Simular" no re-simula
+SIM_CACHE = SimulationCache(cache_dir=DEFAULT_CACHE_DIR)
+
 class App(tk.Tk):
     def __init__(self):
         super().__init__()
@@ -77,7 +80,7 @@ class App(tk.Tk):
             messagebox.showwarning("Atención","Carga un netlist JSON primero.")
             return
         nl = load_json(self.netlist_path)
-        sol = simulate(nl)
+        sol = SIM_CACHE.simulate(nl)
         self.text_delete()
         self.text.insert("end", "=== RESULTADOS ===\n")
         for k,v in sol.node_voltages.items():
@@ -94,7 +97,7 @@ class App(tk.Tk):
             messagebox.showwarning("Atención","Simula o carga primero un netlist.")
             return
         nl = load_json(self.netlist_path)
-        sol = simulate(nl)
+        sol = SIM_CACHE.simulate(nl)
         path = filedialog.asksaveasfilename(defaultextension=".pdf")
         if not path: return
         export_solution_pdf(path, nl, sol)
@@ -0,0 +1,15 @@
+import pickle
+
+from src.analysis.results import ArrayMap, Solution
+
+
+def test_unpickle_pre_array_solution():
+    # Estado de una Solution guardada antes de ArrayMap/stats
+    old = Solution.__new__(Solution)
+    old.__dict__.update(node_voltages={"A": 1.0}, branch_currents={"R1": 0.5},
+                        diode_states={}, checks={}, newton={}, reduction={})
+    sol = pickle.loads(pickle.dumps(old))
+    assert isinstance(sol.node_voltages, ArrayMap)
+    assert sol.voltages.tolist() == [1.0]
+    assert sol.currents.tolist() == [0.5]
+    assert sol.stats is None and sol.terminals is None
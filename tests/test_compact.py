@@ -0,0 +1,31 @@
+import pytest
+
+from src.domain.netlist import Netlist
+from src.domain.compact import CompactNetlist
+from src.domain.components.resistor import Resistor
+from src.domain.components.vsource import VSource
+from src.app.validation import validate, TopologyError
+
+
+def _undeclared():
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    nl.add_node("A")
+    nl.add_component(VSource("V1", "A", "GND", 1.0))
+    nl.add_component(Resistor("R1", "A", "ZZ", 10.0))
+    return nl
+
+
+def test_undeclared_node_keeps_its_name():
+    nl = _undeclared()
+    cn = CompactNetlist.from_netlist(nl)
+    assert cn.n2[1] < 0
+    assert cn.components[1].n2 == "ZZ"
+    assert cn.to_netlist().to_dict() == nl.to_dict()
+
+
+def test_validate_names_undeclared_node():
+    with pytest.raises(TopologyError) as err:
+        validate(CompactNetlist.from_netlist(_undeclared()))
+    assert "ZZ" in str(err.value)
+    assert err.value.nodes == ["ZZ"]
@@ -0,0 +1,20 @@
+import pytest
+
+from src.app.serialization import load_json
+from src.app.simulate import simulate
+from src.analysis.compiled import CompiledCircuit
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_update_values_reconstructs_with_new_resistance(incremental):
+    nl = load_json("examples/vr_divisor.json")
+    cc = CompiledCircuit(nl, incremental=incremental)
+    cc.solve()  # el layout de reconstrucción ya existe
+    cc.update_values({"R1": 2200.0})
+    sol = cc.solve()
+    for c in nl.components:
+        if c.id == "R1":
+            c.R = 2200.0
+    ref = simulate(nl)
+    for cid, i in ref.branch_currents.items():
+        assert sol.branch_currents[cid] == pytest.approx(i, rel=1e-9, abs=1e-15)
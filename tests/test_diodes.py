@@ -0,0 +1,42 @@
+import pytest
+
+from src.domain.netlist import Netlist
+from src.domain.components.resistor import Resistor
+from src.domain.components.vsource import VSource
+from src.domain.components.diode import IdealDiode
+from src.analysis.compiled import CompiledCircuit
+from src.app.simulate import simulate
+
+
+def _parallel_diodes():
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    nl.add_node("A")
+    nl.add_node("B")
+    nl.add_component(VSource("V1", "A", "GND", 5.0))
+    nl.add_component(IdealDiode("D1", "A", "B"))
+    nl.add_component(IdealDiode("D2", "A", "B"))
+    nl.add_component(Resistor("R1", "B", "GND", 1000.0))
+    return nl
+
+
+@pytest.mark.parametrize("method", ["auto", "lcp"])
+def test_parallel_ideal_diodes(method):
+    sol = simulate(_parallel_diodes(), diode_method=method)
+    assert sol.node_voltages["B"] == pytest.approx(5.0)
+    assert sol.branch_currents["D1"] + sol.branch_currents["D2"] == pytest.approx(5e-3)
+    assert "ON" in sol.diode_states.values()
+    assert sol.checks.ok
+
+
+def test_parallel_ideal_diodes_compiled():
+    sol = CompiledCircuit(_parallel_diodes()).solve()
+    assert sol.node_voltages["B"] == pytest.approx(5.0)
+
+
+def test_stats_record_engine_that_solved():
+    sol = simulate(_parallel_diodes(), diode_method="auto")
+    # La iteración de estados choca con el conjunto ON singular: resolvió Lemke
+    assert sol.stats.method == "diodes-lcp"
+    assert sol.stats.residual == pytest.approx(0.0, abs=1e-12)
+    assert sol.stats.condition is not None
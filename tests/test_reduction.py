@@ -0,0 +1,26 @@
+from src.domain.netlist import Netlist
+from src.domain.components.resistor import Resistor
+from src.analysis.reduction import reduce_netlist
+from src.app.simulate import simulate
+
+
+def _sourceless():
+    nl = Netlist()
+    nl.add_node("GND", is_ground=True)
+    nl.add_node("A")
+    nl.add_node("B")
+    nl.add_component(Resistor("R1", "A", "B", 100.0))
+    nl.add_component(Resistor("R2", "B", "GND", 200.0))
+    return nl
+
+
+def test_reduce_without_unknowns_returns_none():
+    assert reduce_netlist(_sourceless()) is None
+
+
+def test_simulate_reduce_sourceless_circuit():
+    full = simulate(_sourceless())
+    red = simulate(_sourceless(), reduce=True)
+    assert dict(red.node_voltages) == dict(full.node_voltages) == {"A": 0.0, "B": 0.0}
+    assert dict(red.branch_currents) == dict(full.branch_currents)
+    assert red.checks.ok
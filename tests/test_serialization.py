@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+from src.app.serialization import load_json
+from src.app.validation import validate, TopologyError
+
+
+def test_compact_load_keeps_undeclared_node_names(tmp_path):
+    path = tmp_path / "nl.json"
+    path.write_text(json.dumps({
+        "components": [
+            {"id": "V1", "kind": "V", "n1": "A", "n2": "GND", "V": 1.0},
+            {"id": "R1", "kind": "R", "n1": "A", "n2": "ZZ", "R": 10.0},
+        ],
+        "nodes": [{"id": "GND", "is_ground": True}, {"id": "A"}],
+    }))
+    cn = load_json(str(path), compact=True, chunk_size=7)
+    assert cn.node_names == ["GND", "A"]
+    assert cn.components[1].n2 == "ZZ"
+    assert cn.to_dict() == load_json(str(path)).to_dict()
+    with pytest.raises(TopologyError) as err:
+        validate(cn)
+    assert err.value.nodes == ["ZZ"]